@@ -0,0 +1,177 @@
+"""Benchmark cases: level generation, collision, enemy AI at scale and recorded sessions."""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from harness import BenchResult, measure
+
+from sv.ai.chase_map import ChaseMaps
+from sv.ai.enemy_ai import decide_enemy_action
+from sv.ai.perception import PlayerPerception, max_notice_radius
+from sv.core.collision import can_move
+from sv.sim.actors import EnemyActor, PlayerActor
+from sv.sim.engine import SimulationEngine, pick_spawn_tiles
+from sv.sim.replay import read_log, replay
+from sv.world.level_generator import LevelGenerator
+from sv.world.level_grid import LevelGrid
+from sv.world.tiles import FLOOR
+
+GENERATION_SIZES = ((64, 48), (256, 256), (1024, 1024))
+COLLISION_ENTITY_COUNTS = (1, 10, 100, 1000, 10_000)
+ENEMY_COUNTS = (1, 10, 100, 1000)
+# Recorded input logs (python src/main.py --record ...) replayed as whole-session workloads
+REPLAY_DIR = ROOT / "benchmarks" / "replays"
+
+
+class _ScanScene:
+    """Scene without an occupancy index: collision falls back to scanning sprite lists."""
+
+    def __init__(self, entities):
+        self.sprite_lists = {"Entities": entities}
+
+
+def bench_generation(seed: int, quick: bool) -> list[BenchResult]:
+    results = []
+    for width, height in GENERATION_SIZES:
+        ops = 5 if width >= 1024 else 50
+        if quick:
+            ops = max(1, ops // 10)
+
+        def setup(width=width, height=height):
+            return LevelGenerator(width=width, height=height, seed=seed)
+
+        results.append(
+            measure(
+                "level_generate",
+                setup,
+                lambda generator: generator.generate(),
+                ops=ops,
+                params={"size": f"{width}x{height}"},
+            )
+        )
+    return results
+
+
+def _collision_state(count: int, seed: int, indexed: bool):
+    rng = random.Random(seed)
+    side = max(8, int((count * 2) ** 0.5) + 2)
+    level = LevelGrid.filled(side, side, FLOOR)
+    tiles = rng.sample([(x, y) for y in range(side) for x in range(side)], count + 1)
+    player = PlayerActor(*tiles[0])
+    enemies = [EnemyActor(x, y) for x, y in tiles[1:count]]
+    engine = SimulationEngine(level, player, enemies)
+    scene = engine.occupancy if indexed else _ScanScene([player, *enemies])
+    directions = [(rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1))) for _ in range(256)]
+    return {"level": level, "scene": scene, "movers": [player, *enemies], "directions": directions, "i": 0}
+
+
+def _collision_op(state) -> None:
+    i = state["i"]
+    state["i"] = i + 1
+    movers = state["movers"]
+    dx, dy = state["directions"][i % len(state["directions"])]
+    can_move(movers[i % len(movers)], dx, dy, state["level"], state["scene"])
+
+
+def bench_collision(seed: int, quick: bool) -> list[BenchResult]:
+    results = []
+    ops = 500 if quick else 5000
+    for count in COLLISION_ENTITY_COUNTS:
+        for indexed in (True, False):
+            # Linear scan at 10k entities is only there to show the slope; skip it
+            if not indexed and count > 1000:
+                continue
+            results.append(
+                measure(
+                    "can_move",
+                    lambda count=count, indexed=indexed: _collision_state(count, seed, indexed),
+                    _collision_op,
+                    ops=ops,
+                    params={"entities": count, "index": "occupancy" if indexed else "scan"},
+                )
+            )
+    return results
+
+
+def _enemy_state(count: int, seed: int):
+    rng = random.Random(seed)
+    level, spawn_xy, stairs_xy = LevelGenerator(width=128, height=96, rng=rng).generate()
+    tiles = pick_spawn_tiles(level, count, exclude=(spawn_xy, stairs_xy), rng=rng)
+    player = PlayerActor(*spawn_xy)
+    enemies = [EnemyActor(x, y) for x, y in tiles]
+    for enemy in enemies:
+        # Every enemy hunts the player's tile, so each call goes through movement
+        # selection (shared chase map or cached/bounded path), not just noticing
+        enemy.is_alerted = True
+        enemy.last_seen_player_tile = spawn_xy
+        enemy.search_turns_left = 10**9
+    engine = SimulationEngine(level, player, enemies)
+    return {"engine": engine, "i": 0, "chase_maps": None, "perception": PlayerPerception()}
+
+
+def _enemy_op(state) -> None:
+    engine = state["engine"]
+    enemies = engine.enemies
+    i = state["i"]
+    state["i"] = i + 1
+    if i % len(enemies) == 0:
+        # A new enemy phase: shared per-turn services are rebuilt like in SimulationEngine
+        state["chase_maps"] = ChaseMaps(engine.level)
+        state["perception"].update(engine.level, engine.player, max_notice_radius(enemies))
+    decide_enemy_action(
+        enemies[i % len(enemies)],
+        engine.player,
+        engine.level,
+        engine.occupancy,
+        chase_maps=state["chase_maps"],
+        perception=state["perception"],
+    )
+
+
+def bench_enemy_ai(seed: int, quick: bool) -> list[BenchResult]:
+    results = []
+    for count in ENEMY_COUNTS:
+        ops = max(count, 200 if quick else 2000)
+        results.append(
+            measure(
+                "decide_enemy_action",
+                lambda count=count: _enemy_state(count, seed),
+                _enemy_op,
+                ops=ops,
+                params={"enemies": count},
+            )
+        )
+    return results
+
+
+def bench_replay(seed: int, quick: bool) -> list[BenchResult]:
+    """One op = one full headless replay of a recorded session; the seed comes from the log."""
+    results = []
+    for path in sorted(REPLAY_DIR.glob("*.svr")):
+        log = read_log(path)
+        results.append(
+            measure(
+                "replay",
+                lambda log=log: log,
+                replay,
+                ops=1 if quick else 5,
+                params={"log": path.stem},
+            )
+        )
+    return results
+
+
+SUITES = {
+    "generation": bench_generation,
+    "collision": bench_collision,
+    "enemy_ai": bench_enemy_ai,
+    "replay": bench_replay,
+}
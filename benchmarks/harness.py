@@ -0,0 +1,99 @@
+"""Timing harness: throughput, latency percentiles and peak memory for one case."""
+
+from __future__ import annotations
+
+import gc
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class BenchResult:
+    name: str
+    params: dict = field(default_factory=dict)
+    ops: int = 0
+    total_s: float = 0.0
+    ops_per_s: float = 0.0
+    p50_us: float = 0.0
+    p99_us: float = 0.0
+    peak_kib: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to match results between runs."""
+        if not self.params:
+            return self.name
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["key"] = self.key
+        return data
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(
+    name: str,
+    setup: Callable[[], object],
+    op: Callable[[object], None],
+    *,
+    ops: int,
+    warmup: int = 1,
+    params: dict | None = None,
+) -> BenchResult:
+    """
+    Runs ``op(state)`` ``ops`` times on a state built once by ``setup``.
+
+    Latency is timed per call; peak memory is taken from a separate traced pass
+    so tracemalloc overhead does not leak into the timings. The traced pass builds
+    its state before tracing starts, so ``peak_kib`` covers ``op`` alone.
+    """
+    state = setup()
+    for _ in range(warmup):
+        op(state)
+
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    samples: list[float] = []
+    perf_counter_ns = time.perf_counter_ns
+    try:
+        started = perf_counter_ns()
+        for _ in range(ops):
+            before = perf_counter_ns()
+            op(state)
+            samples.append((perf_counter_ns() - before) / 1000.0)
+        total_s = (perf_counter_ns() - started) / 1e9
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    traced_state = setup()
+    tracemalloc.start()
+    try:
+        op(traced_state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        params=dict(params or {}),
+        ops=ops,
+        total_s=total_s,
+        ops_per_s=ops / total_s if total_s > 0 else float("inf"),
+        p50_us=statistics.median(samples) if samples else 0.0,
+        p99_us=_percentile(samples, 0.99),
+        peak_kib=peak / 1024.0,
+    )
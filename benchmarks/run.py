@@ -0,0 +1,108 @@
+"""
+Runs the benchmark suites and writes a JSON results file.
+
+    python benchmarks/run.py --output benchmarks/results.json
+    python benchmarks/run.py --baseline old.json --threshold 0.15 --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from cases import ROOT, SUITES
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _versions() -> dict:
+    versions = {"python": platform.python_version()}
+    for module in ("numpy", "tcod"):
+        try:
+            versions[module] = __import__(module).__version__
+        except Exception:
+            versions[module] = None
+    return versions
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """Returns a line per case whose throughput dropped by more than ``threshold``."""
+    previous = {item["key"]: item for item in baseline.get("results", [])}
+    regressions = []
+    for item in results:
+        old = previous.get(item["key"])
+        if old is None or not old.get("ops_per_s"):
+            continue
+        change = item["ops_per_s"] / old["ops_per_s"] - 1.0
+        if change < -threshold:
+            regressions.append(
+                f"{item['key']}: {old['ops_per_s']:.0f} -> {item['ops_per_s']:.0f} ops/s ({change:+.1%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Shardveil benchmark suite")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="run only these suites")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke runs")
+    parser.add_argument("--output", type=Path, default=ROOT / "benchmarks" / "results.json")
+    parser.add_argument("--baseline", type=Path, help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed throughput drop (fraction)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = []
+    for suite in args.suite or list(SUITES):
+        for result in SUITES[suite](args.seed, args.quick):
+            print(
+                f"{result.key:<55} {result.ops_per_s:>12.0f} ops/s"
+                f"  p50 {result.p50_us:>10.1f} us  p99 {result.p99_us:>10.1f} us"
+                f"  peak {result.peak_kib:>10.1f} KiB"
+            )
+            results.append(result.to_dict())
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "seed": args.seed,
+            "quick": args.quick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "platform": platform.platform(),
+            "versions": _versions(),
+        },
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"results written to {args.output}")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
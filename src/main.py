@@ -1,3 +1,4 @@
+import argparse
 import random
 import sys
 import time
@@ -9,19 +10,37 @@ from arcade import gl
 from arcade.future.light import Light, LightLayer
 from sv.core import (
     CameraController,
+    FrameTimings,
     GamePhase,
     MovementInputState,
     Settings,
     StateManager,
-    snap_world_point,
+    TweenManager,
 )
-from sv.world import LevelGenerator
+from sv.world.level_grid import LevelGrid
+from sv.world.terrain import bake_chunks, load_tile_atlas
+from sv.world.terrain_sprites import TerrainChunks
+from sv.world.tiles import STAIRS
 from sv.entities import Player, Skeleton
-from sv.ai import decide_enemy_action
+from sv.entities.entity import MOVE_DURATION
+from sv.core import profiling, trace
 from sv.core.collision import MoveResult
+from sv.sim import AutoTravel, MoveEvent, SimulationEngine
+from sv.sim.floors import FloorPrefetcher, PreparedFloor
+from sv.sim import replay
+from sv.sim.savegame import (
+    SaveWriter,
+    apply_entity_records,
+    enemy_tiles,
+    read_save,
+    snapshot,
+)
 from sv.ui import GameUI, HUDLayer, OverlayScreenId, ViewScreenId
 
 TILE_SIZE = Settings.TILE_SIZE
+FLOOR_WIDTH = 64
+FLOOR_HEIGHT = 48
+FLOOR_ENEMIES = 1
 PLAYER_INPUT_DIAGONAL_WINDOW = 0.02
 PLAYER_HORIZONTAL_KEYS = {
     arcade.key.A: -1,
@@ -39,6 +58,8 @@ PLAYER_DIRECTION_KEYS = tuple(PLAYER_HORIZONTAL_KEYS) + tuple(PLAYER_VERTICAL_KE
 
 # Путь к папке assets
 asset_dir = Path(sys.argv[0]).resolve().parents[1] / "assets"
+# Быстрое сохранение (F5/F9) и автосохранение при спуске
+SAVE_PATH = asset_dir.parent / "saves" / "quicksave.svs"
 # Регистрируем ресурс-хэндл для удобной загрузки ассетов
 arcade.resources.add_resource_handle("assets", asset_dir)
 
@@ -46,7 +67,7 @@ arcade.resources.add_resource_handle("assets", asset_dir)
 arcade.SpriteList.DEFAULT_TEXTURE_FILTER = gl.NEAREST, gl.NEAREST
 
 class Game(arcade.Window):
-    def __init__(self):
+    def __init__(self, record_path: Path | None = None):
         self.settings = Settings()
         super().__init__(
             width=self.settings.screen_width,
@@ -62,6 +83,8 @@ class Game(arcade.Window):
             on_main_menu=self._return_to_main_menu,
             on_new_game=self.start_new_game,
             on_exit_game=self.close,
+            settings=self.settings,
+            on_settings_changed=self._on_settings_changed,
         )
         
         self.level = None
@@ -71,10 +94,36 @@ class Game(arcade.Window):
         self.camera_controller = None
         self.light_layer = None
         self.player_light = None
+        self.terrain: TerrainChunks | None = None
+        self._terrain_atlas = None
+        # Следующий этаж готовится в фоновом потоке
+        self.prefetcher = FloorPrefetcher()
+        self._next_floor_seed: int | None = None
+        self._floor_seed: int | None = None
+        # Сохранения пишутся в фоновом потоке
+        self.save_writer = SaveWriter()
+        self._descend_pending = False
+        self.floor_number = 1
+        # Анимации перемещения всех сущностей, продвигаются одним шагом за кадр
+        self.tweens = TweenManager()
+        # Замеры фаз кадра для отладочного оверлея (F3); выключены, пока он скрыт
+        self.timings = FrameTimings()
         self.state = StateManager()
-        # Очередь врагов для последовательной обработки
+        # Источник зёрен забегов; этажи забега идут из floor_rng, заведённого зерном забега
+        self.rng = random.Random(self.settings.seed)
+        self.run_seed: int | None = None
+        self.floor_rng = random.Random()
+        # Запись ввода для воспроизведения (python -m sv.sim.replay)
+        self.recorder = replay.InputRecorder(record_path) if record_path is not None else None
+        # Пошаговая логика: уровень, сущности и очередность ходов
+        self.sim: SimulationEngine | None = None
+        # Автопереход к тайлу / автоисследование поверх движка
+        self.auto_travel: AutoTravel | None = None
+        # Очередь событий врагов для последовательной анимации
         self._enemy_queue: deque = deque()
         self._current_enemy = None
+        # Число ещё не завершённых параллельных анимаций врагов
+        self._enemy_moves_pending = 0
         self.movement_input = MovementInputState(
             PLAYER_HORIZONTAL_KEYS,
             PLAYER_VERTICAL_KEYS,
@@ -92,104 +141,190 @@ class Game(arcade.Window):
         self.movement_input.clear()
         self._enemy_queue.clear()
         self._current_enemy = None
+        self._enemy_moves_pending = 0
+        self._descend_pending = False
+        self.floor_number = 1
+
+        # Новый забег: новый игрок, зум по умолчанию и первый этаж
+        if self.player_sprite is not None:
+            self.player_sprite.remove_from_sprite_lists()
+        self.player_sprite = None
+        self.camera_controller = None
+        self.run_seed = self.rng.getrandbits(32)
+        self.floor_rng = random.Random(self.run_seed)
+        if self.recorder is not None:
+            self.recorder.begin(
+                time.time(),
+                self.run_seed,
+                FLOOR_WIDTH,
+                FLOOR_HEIGHT,
+                FLOOR_ENEMIES,
+                self.movement_input,
+                simultaneous=self.settings.simultaneous_enemy_turns,
+                fast_forward=self.settings.fast_forward,
+                move_duration=MOVE_DURATION,
+                fast_move_duration=self.settings.fast_forward_move_duration,
+            )
+        self._enter_floor(self.prefetcher.take(self.floor_rng.getrandbits(32), *self._floor_args()))
 
-        # Генерируем уровень (BSP: 0=void, 1=floor, 2=wall, 3=stairs)
-        gen = LevelGenerator(width=64, height=48)
-        level, spawn_xy, stairs_xy = gen.generate()
+        # Подключаем базовый световой слой через arcade.gl
+        self.light_layer = LightLayer(self.settings.screen_width, self.settings.screen_height)
+        self.light_layer.set_background_color((0, 0, 0, 255))
+        self.player_light = Light(
+            self.player_sprite.center_x,
+            self.player_sprite.center_y,
+            radius=180,
+            color=(255, 244, 216),
+            mode="soft",
+        )
+        self.light_layer.add(self.player_light)
 
-        # Создаём сцену
+        self.state.enter_game()
+
+    def _floor_args(self) -> tuple:
+        """Аргументы prepare_floor после зерна: размер карты, тайлы для запекания и число врагов."""
+        return (FLOOR_WIDTH, FLOOR_HEIGHT, self._tile_atlas(), FLOOR_ENEMIES)
+
+    def _enter_floor(self, floor: PreparedFloor, next_seed: int | None = None) -> None:
+        """
+        Строит сцену, камеру и движок для подготовленного этажа и сразу заказывает
+        в фоне следующий, чтобы спуск по лестнице не ждал генерации.
+        next_seed задаёт зерно следующего этажа (при загрузке), иначе оно берётся из floor_rng.
+        """
+        # Уровень BSP: 0=void, 1=floor, 2=wall, 3=stairs
+        level = floor.level
         self.level = level
-        world_width = len(level[0]) * TILE_SIZE
-        world_height = len(level) * TILE_SIZE
+        self._floor_seed = floor.seed
+        world_width = level.width * TILE_SIZE
+        world_height = level.height * TILE_SIZE
         self.scene = arcade.Scene()
-        self.scene.add_sprite_list("Ground")
-        self.scene.add_sprite_list("Walls")
+        # Рельеф запекается в текстуры по чанкам; в сцене только видимые камерой
+        self.terrain = TerrainChunks(floor.chunks, TILE_SIZE, name=str(floor.seed))
+        self.scene.add_sprite_list("Terrain", sprite_list=self.terrain.visible)
         self.scene.add_sprite_list("Player")
         self.scene.add_sprite_list("Skeleton")
 
-        # Загрузка спрайтшита с тайлами
-        tileset_image = ":assets:/sprites/tileset.png"
-
-        # Загрузка тайлов из спрайтшита
-        tiles = arcade.load_spritesheet(tileset_image)
-        textures = tiles.get_texture_grid((TILE_SIZE, TILE_SIZE), columns=3, count=3)
-
-        # Назначение текстур для пола и стен
-        floor_texture = textures[0]
-        wall_texture = textures[1]
-        stairs_texture = textures[2]
-
-        for y in range(len(level)):
-            for x in range(len(level[0])):
-                tile = level[y][x]
-                world_x = x * TILE_SIZE
-                world_y = y * TILE_SIZE
-
-                if tile == 0:
-                    # void — не рисуем
-                    continue
-                if tile == 1:
-                    # floor
-                    sprite = arcade.Sprite()
-                    sprite.texture = floor_texture
-                    sprite.center_x = world_x + TILE_SIZE / 2
-                    sprite.center_y = world_y + TILE_SIZE / 2
-                    self.scene["Ground"].append(sprite)
-                elif tile == 3:
-                    # stairs
-                    sprite = arcade.Sprite()
-                    sprite.texture = stairs_texture
-                    sprite.center_x = world_x + TILE_SIZE / 2
-                    sprite.center_y = world_y + TILE_SIZE / 2
-                    self.scene["Ground"].append(sprite)
-                elif tile == 2:
-                    sprite = arcade.Sprite()
-                    sprite.texture = wall_texture
-                    sprite.center_x = world_x + TILE_SIZE / 2
-                    sprite.center_y = world_y + TILE_SIZE / 2
-                    self.scene["Walls"].append(sprite)
-
-        # Создаём игрока в точке спавна с генератора
-        self.player_sprite = Player(tile_x=spawn_xy[0], tile_y=spawn_xy[1])
+        # Игрок создаётся в начале забега и переносится между этажами со здоровьем и светом
+        if self.player_sprite is None:
+            self.player_sprite = Player(tile_x=floor.spawn_xy[0], tile_y=floor.spawn_xy[1])
+        else:
+            self.player_sprite.remove_from_sprite_lists()
+            self.player_sprite.occupancy = None
+            self.player_sprite.moving = False
+            self.player_sprite.move_to(*floor.spawn_xy)
         self.scene.add_sprite("Player", self.player_sprite)
-        # Настраиваем камеру
-        self.camera = arcade.camera.Camera2D(position=self.player_sprite.position, zoom=2.0)
+        self.tweens.clear()
+        # Настраиваем камеру, сохраняя зум между этажами
+        zoom = self.camera_controller.zoom if self.camera_controller is not None else 2.0
+        self.camera = arcade.camera.Camera2D(position=self.player_sprite.position, zoom=zoom)
         self.camera_controller = CameraController(
             self.camera,
             world_width=world_width,
             world_height=world_height,
-            initial_zoom=2.0,
+            initial_zoom=zoom,
         )
 
-        # Скелет на случайном полу, не на спавне и не на лестнице
-        floor_tiles = [
-            (x, y)
-            for y in range(len(level))
-            for x in range(len(level[0]))
-            if level[y][x] in (1, 3)
-            and (x, y) != spawn_xy
-            and (x, y) != stairs_xy
-        ]
-        if floor_tiles:
-            sx, sy = random.choice(floor_tiles)
-            skeleton = Skeleton(tile_x=sx, tile_y=sy)
-        else:
-            skeleton = Skeleton(tile_x=spawn_xy[0] + 1, tile_y=spawn_xy[1])
-        self.scene.add_sprite("Skeleton", skeleton)
+        # Скелеты на случайном полу, не на спавне и не на лестнице
+        skeletons = [Skeleton(tile_x=x, tile_y=y) for x, y in floor.enemy_tiles]
+        for skeleton in skeletons:
+            self.scene.add_sprite("Skeleton", skeleton)
+
+        # Движок владеет индексом занятости; сцена ссылается на него для поиска сущностей
+        self.sim = SimulationEngine(
+            level,
+            self.player_sprite,
+            skeletons,
+            simultaneous=self.settings.simultaneous_enemy_turns,
+        )
+        self.scene.occupancy = self.sim.occupancy
+        self.auto_travel = AutoTravel(self.sim)
 
-        # Подключаем базовый световой слой через arcade.gl
-        self.light_layer = LightLayer(self.settings.screen_width, self.settings.screen_height)
-        self.light_layer.set_background_color((0, 0, 0, 255))
-        self.player_light = Light(
-            self.player_sprite.center_x,
-            self.player_sprite.center_y,
-            radius=180,
-            color=(255, 244, 216),
-            mode="soft",
+        self._next_floor_seed = next_seed if next_seed is not None else self.floor_rng.getrandbits(32)
+        self.prefetcher.submit(self._next_floor_seed, *self._floor_args())
+
+    def _descend(self) -> None:
+        """Спуск на следующий этаж: забирает этаж, подготовленный в фоне."""
+        self.floor_number += 1
+        self._enemy_queue.clear()
+        self._current_enemy = None
+        self._enemy_moves_pending = 0
+        if self.auto_travel is not None:
+            self.auto_travel.stop()
+        self._enter_floor(self.prefetcher.take(self._next_floor_seed, *self._floor_args()))
+        if self.settings.autosave:
+            self._save_game()
+
+    def _save_game(self) -> None:
+        """Снимает состояние забега и отдаёт запись фоновому потоку."""
+        if self.sim is None or self.sim.is_over:
+            return
+        state = snapshot(self.sim, self.floor_number, self._floor_seed, self._next_floor_seed)
+        self.save_writer.submit(SAVE_PATH, state)
+
+    def _load_game(self) -> bool:
+        """
+        Восстанавливает забег из SAVE_PATH: сетка читается в память, рельеф
+        запекается заново, сущности создаются по записям. False — сохранения нет.
+        """
+        try:
+            # Незаконченная запись должна лечь на диск раньше чтения; её ошибка уже
+            # выведена SaveWriter, а прежнее сохранение осталось целым
+            self.save_writer.wait()
+        except OSError:
+            pass
+        try:
+            # Сетка читается в память, а не отображается: файл не должен оставаться
+            # открытым, иначе следующее сохранение не сможет его заменить
+            state = read_save(SAVE_PATH, mmap=False)
+        except (OSError, ValueError) as exc:
+            print(f"Load failed: {exc}", file=sys.stderr)
+            return False
+        # Журнал ввода после загрузки уже не воспроизводит забег с начала
+        if self.recorder is not None:
+            self.recorder.abandon()
+
+        level = LevelGrid(state.tiles)
+        record = state.player_record
+        spawn_xy = (int(record["tile_x"]), int(record["tile_y"]))
+        stairs = level.positions_of((STAIRS,))
+        floor = PreparedFloor(
+            state.floor_seed,
+            level,
+            spawn_xy,
+            stairs[0] if stairs else spawn_xy,
+            enemy_tiles(state.entities),
+            bake_chunks(level, self._tile_atlas()),
         )
-        self.light_layer.add(self.player_light)
 
-        self.state.enter_game()
+        self.movement_input.clear()
+        self._enemy_queue.clear()
+        self._current_enemy = None
+        self._enemy_moves_pending = 0
+        self._descend_pending = False
+        self.floor_number = state.floor_number
+        self._enter_floor(floor, next_seed=state.next_floor_seed)
+        apply_entity_records(state.entities, self.player_sprite, self.sim.enemies)
+        if state.explored is not None:
+            self.sim.restore_explored(state.explored)
+        self.sim.turn = state.turn
+        self.state.set_phase(GamePhase.PLAYER_TURN)
+        return True
+
+    def on_close(self):
+        self.prefetcher.shutdown()
+        self.save_writer.shutdown()
+        if self.recorder is not None and self.sim is not None:
+            self.recorder.finish(time.time(), replay.summarize(self.sim, self.floor_number))
+        trace.stop()
+        profiling.stop()
+        super().on_close()
+
+    def _tile_atlas(self):
+        """Пиксели тайлов из tileset.png; загружаются один раз."""
+        if self._terrain_atlas is None:
+            tileset_path = arcade.resources.resolve(":assets:/sprites/tileset.png")
+            self._terrain_atlas = load_tile_atlas(tileset_path, TILE_SIZE)
+        return self._terrain_atlas
 
     def on_resize(self, width, height):
         super().on_resize(width, height)
@@ -201,50 +336,105 @@ class Game(arcade.Window):
             self.light_layer.resize(width, height)
 
     def on_draw(self):
-        self.clear()
-        if self.state.is_in_game() and self.light_layer is not None and self.camera is not None and self.scene is not None:
-            with self.light_layer:
-                self.camera.use()
-                self.scene.draw()
-            self.light_layer.draw(ambient_color=(28, 24, 34, 255))
-        self.ui.draw()
+        timings = self.timings
+        with timings.span("draw"):
+            self.clear()
+            if self.state.is_in_game() and self.light_layer is not None and self.camera is not None and self.scene is not None:
+                with timings.span("terrain"):
+                    if self.terrain is not None and self.camera_controller is not None:
+                        self.terrain.update_visible(self.camera_controller.visible_world_rect(margin=TILE_SIZE))
+                with timings.span("scene"):
+                    with self.light_layer:
+                        self.camera.use()
+                        self.scene.draw()
+                with timings.span("lights"):
+                    self.light_layer.draw(ambient_color=(28, 24, 34, 255))
+            with timings.span("ui"):
+                self.ui.draw()
 
     def on_update(self, delta_time):
+        self.timings.record("frame", delta_time)
+        self.ui.update_debug_overlay(delta_time, self.timings.stats, self._debug_counts)
+        with self.timings.span("update"):
+            self._update_game(delta_time)
+        profiling.step("frame")
+
+    def _update_game(self, delta_time) -> None:
+        timings = self.timings
         if self.state.is_in_game() and self.player_sprite is not None:
-            self.ui.update_hud(
-                self.player_sprite.hp / self.player_sprite.max_hp,
-                self._player_light_ratio(),
-            )
+            with timings.span("hud"):
+                self.ui.update_hud(
+                    self.player_sprite.hp / self.player_sprite.max_hp,
+                    self._player_light_ratio(),
+                )
 
         if not self.state.is_in_game() or self.state.is_paused():
             return
 
-        # Обновляем сцену, чтобы вызвать Sprite.update на всех спрайтах (анимация движения)
-        if self.scene:
-            self.scene.update(delta_time)
+        now = time.time()
+        if self.recorder is not None and not self._frame_is_idle():
+            self.recorder.record_frame(now, delta_time)
 
-        if self.camera_controller is not None and self.player_sprite is not None:
-            self.camera_controller.update(self.player_sprite.position, delta_time)
+        # Продвигаем и привязываем к пиксельной сетке только движущиеся сущности
+        with timings.span("tweens"):
+            self.tweens.update(delta_time, self._render_zoom())
 
-        self._snap_moving_sprites()
+        with timings.span("camera"):
+            if self.camera_controller is not None and self.player_sprite is not None:
+                self.camera_controller.update(self.player_sprite.position, delta_time)
 
         # После снапа спрайтов обновляем свет, чтобы он оставался привязанным к рендеру игрока.
-        if self.player_light is not None and self.player_sprite is not None:
-            self.player_light.position = self.player_sprite.position
-            ratio = self._player_light_ratio()
-            self.player_light.radius = 160 + 35 * ratio
-
-        now = time.time()
-
-        # Если игрок завершил свою анимацию — запускаем очередь врагов
+        with timings.span("light"):
+            if self.player_light is not None and self.player_sprite is not None:
+                self.player_light.position = self.player_sprite.position
+                ratio = self._player_light_ratio()
+                self.player_light.radius = 160 + 35 * ratio
+
+        with timings.span("turns"):
+            self._update_turns(now)
+
+    def _update_turns(self, now: float) -> None:
+        """Смена фаз хода после анимаций и ход игрока (ввод, автоперемещение, ИИ врагов)."""
+        # Если игрок завершил свою анимацию — спуск по лестнице или очередь врагов
         if self.state.is_player_anim():
             if not getattr(self.player_sprite, "moving", False):
+                if self._descend_pending:
+                    self._descend_pending = False
+                    self._descend()
+                    self.state.set_phase(GamePhase.PLAYER_TURN)
+                    return
                 self.state.set_phase(GamePhase.ENEMY_TURN)
                 self.process_enemy_turns()
                 return
 
         self._process_player_movement(now)
 
+    def _debug_counts(self) -> dict[str, int]:
+        """Счётчики для отладочного оверлея."""
+        counts = {}
+        if self.sim is not None:
+            counts["entities"] = 1 + len(self.sim.living_enemies())
+        if self.scene is not None:
+            counts["sprites"] = sum(len(self.scene.get_sprite_list(name)) for name in ("Terrain", "Player", "Skeleton"))
+        if self.terrain is not None:
+            counts["chunks"] = len(self.terrain.visible)
+        counts["tweens"] = len(self.tweens)
+        return counts
+
+    def _toggle_debug_overlay(self) -> None:
+        """F3: оверлей и замеры включаются вместе, чтобы выключенные ничего не стоили."""
+        self.timings.enabled = self.ui.toggle_debug_overlay()
+        self.timings.clear()
+
+    def _frame_is_idle(self) -> bool:
+        """Кадр ничего не меняет в игровой логике: ход игрока, ничего не анимируется и не нажато."""
+        return (
+            self.state.is_player_turn()
+            and len(self.tweens) == 0
+            and not self.movement_input.has_pressed_keys
+            and not (self.auto_travel is not None and self.auto_travel.active)
+        )
+
     def _player_light_ratio(self) -> float:
         if not self.player_sprite:
             return 0.0
@@ -253,22 +443,6 @@ class Game(arcade.Window):
         except Exception:
             return 0.0
 
-    def _recover_player_light(self, amount: int) -> int:
-        if not self.player_sprite:
-            return 0
-        try:
-            return self.player_sprite.recover_light(amount)
-        except Exception:
-            return 0
-
-    def _consume_player_light(self, amount: int = 1) -> int:
-        if not self.player_sprite:
-            return 0
-        try:
-            return self.player_sprite.spend_light(amount)
-        except Exception:
-            return 0
-
     def get_entity_at(self, tile_x: int, tile_y: int, list_name: str | None = None):
         """Возвращает сущность в списке по координатам тайла, либо None."""
         if self.scene is None:
@@ -295,6 +469,10 @@ class Game(arcade.Window):
         if self.ui.handle_key_press(symbol, modifiers):
             return
 
+        if symbol == arcade.key.F3:
+            self._toggle_debug_overlay()
+            return
+
         if symbol == arcade.key.ESCAPE:
             self._pause_game()
             return
@@ -312,66 +490,134 @@ class Game(arcade.Window):
                 self.camera_controller.zoom_out()
             return
 
+        # Быстрые сохранение и загрузка. Сохранять можно только в ход игрока: во время
+        # анимации шаг игрока уже сделан в движке, а ответ врагов ещё нет
+        if symbol == arcade.key.F5:
+            if self.state.is_player_turn():
+                self._save_game()
+            return
+        if symbol == arcade.key.F9:
+            if not self.state.is_paused():
+                self._load_game()
+            return
+
         now = time.time()
+        self._record_key(symbol, now)
+
+        # Любое ручное действие прерывает автоперемещение
+        if self.auto_travel is not None and self.auto_travel.active:
+            self.auto_travel.stop()
+            if symbol not in PLAYER_DIRECTION_KEYS:
+                return
 
         if symbol in PLAYER_DIRECTION_KEYS:
             self.movement_input.press(symbol, now)
             self._process_player_movement(now)
             return
 
+        # Автоисследование и переход к лестнице; шаги начнутся в ход игрока
+        if symbol == arcade.key.O:
+            self._start_explore()
+            return
+        if symbol == arcade.key.PERIOD:
+            self._start_travel_to_stairs()
+            return
+
         # Игрок может действовать только в свой ход
         if not self.state.is_player_turn():
             return
 
         # Пропуск хода по пробелу
         if symbol == arcade.key.SPACE:
-            self._recover_player_light(2)
-            self.state.set_phase(GamePhase.ENEMY_TURN)
-            self.process_enemy_turns()
+            if self.sim is not None and self.sim.player_wait().acted:
+                self.state.set_phase(GamePhase.ENEMY_TURN)
+                self.process_enemy_turns()
             return
 
-    def _move_with_fallback(self, entity, dx, dy):
-        """Попытка перемещения с fallback по осям при диагональном столкновении со стеной."""
-        res, blocker = entity.attempt_move(dx, dy, self.level, self.scene)
-        if res == MoveResult.MOVED:
-            return res, blocker
-        if dx != 0 and dy != 0 and res == MoveResult.BLOCKED_WALL:
-            res2, blocker2 = entity.attempt_move(dx, 0, self.level, self.scene)
-            if res2 == MoveResult.MOVED:
-                return res2, blocker2
-            res3, blocker3 = entity.attempt_move(0, dy, self.level, self.scene)
-            return res3, blocker3
-        return res, blocker
+    def _record_key(self, symbol, now: float) -> None:
+        """Пишет нажатие, дошедшее до игровой логики, как событие журнала ввода."""
+        if self.recorder is None:
+            return
+        if symbol in PLAYER_DIRECTION_KEYS:
+            self.recorder.record(now, replay.DIRECTION_PRESS, symbol)
+        elif symbol == arcade.key.O:
+            self.recorder.record(now, replay.EXPLORE)
+        elif symbol == arcade.key.PERIOD:
+            self.recorder.record(now, replay.TRAVEL_STAIRS)
+        elif symbol == arcade.key.SPACE:
+            self.recorder.record(now, replay.WAIT)
+        else:
+            self.recorder.record(now, replay.OTHER_KEY, symbol)
 
     def _try_player_move(self, dx, dy):
         """Попытка перемещения игрока с управлением сменой хода."""
-        res, blocker = self._move_with_fallback(self.player_sprite, dx, dy)
-        if res is None:
+        if self.sim is None:
             return None, None
-        if res == MoveResult.BLOCKED_WALL:
-            return res, blocker
-        if res == MoveResult.BLOCKED_ENTITY:
-            if blocker is not None and hasattr(self.player_sprite, 'attack'):
-                self.player_sprite.attack(blocker)
-                self._consume_player_light(1)
+        result = self.sim.player_move(dx, dy)
+        if not result.acted:
+            return result.move_result, None
+
+        duration = self._turn_move_duration()
+        for event in result.player_events:
+            if isinstance(event, MoveEvent):
+                self._animate_move(event.entity, event.to_tile, duration)
+
+        if result.move_result == MoveResult.MOVED:
+            # Шаг на лестницу: после анимации спускаемся, враги этого этажа не ходят
+            self._descend_pending = self.level.get(self.player_sprite.tile_x, self.player_sprite.tile_y) == STAIRS
+            self.state.set_phase(GamePhase.PLAYER_ANIM)
+        else:
             self.state.set_phase(GamePhase.ENEMY_TURN)
             self.process_enemy_turns()
-            return res, blocker
-        if res == MoveResult.MOVED:
-            self._consume_player_light(1)
-            self.state.set_phase(GamePhase.PLAYER_ANIM)
-            return res, blocker
-        return res, blocker
+        return result.move_result, None
 
     def on_key_release(self, symbol, modifiers):
         if not self.state.is_in_game() or self.ui.has_active_overlay():
             return
-        self.movement_input.release(symbol, time.time())
+        now = time.time()
+        if self.recorder is not None and symbol in PLAYER_DIRECTION_KEYS:
+            self.recorder.record(now, replay.DIRECTION_RELEASE, symbol)
+        self.movement_input.release(symbol, now)
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        if button != arcade.MOUSE_BUTTON_LEFT or self.ui.has_active_overlay():
+            return
+        if not self.state.is_in_game() or self.camera is None or self.auto_travel is None:
+            return
+        world = self.camera.unproject((x, y))
+        tile = (int(world[0] // TILE_SIZE), int(world[1] // TILE_SIZE))
+        now = time.time()
+        if self.recorder is not None:
+            self.recorder.record(now, replay.TRAVEL, *tile)
+        if self.auto_travel.start_travel(tile):
+            self._process_player_movement(now)
+
+    def _start_explore(self) -> None:
+        if self.auto_travel is not None and self.auto_travel.start_explore():
+            self._process_player_movement(time.time())
+
+    def _start_travel_to_stairs(self) -> None:
+        """Автопереход к ближайшей уже увиденной лестнице."""
+        if self.auto_travel is None or self.sim is None:
+            return
+        player = self.player_sprite
+        seen = [
+            (x, y) for x, y in self.level.positions_of((STAIRS,)) if self.sim.explored[y, x]
+        ]
+        if not seen:
+            return
+        goal = min(seen, key=lambda t: max(abs(t[0] - player.tile_x), abs(t[1] - player.tile_y)))
+        if self.auto_travel.start_travel(goal):
+            self._process_player_movement(time.time())
 
     def _process_player_movement(self, now: float):
         if not self.state.is_player_turn():
             return
 
+        if self.auto_travel is not None and self.auto_travel.active:
+            self._process_auto_travel()
+            return
+
         move = self.movement_input.resolve_move(now)
         if move is None:
             return
@@ -381,77 +627,105 @@ class Game(arcade.Window):
         if res == MoveResult.BLOCKED_WALL:
             self.movement_input.mark_blocked(dx, dy)
 
-    def _snap_moving_sprites(self):
-        if self.scene is None:
+    def _process_auto_travel(self) -> None:
+        """Следующий шаг автоперемещения; любой несостоявшийся шаг его прерывает."""
+        move = self.auto_travel.next_move()
+        if move is None:
             return
+        res, _ = self._try_player_move(*move)
+        if res != MoveResult.MOVED:
+            self.auto_travel.stop()
 
-        zoom = self.camera_controller.zoom if self.camera_controller is not None else self.camera.zoom
-        sprite_lists = getattr(self.scene, "sprite_lists", {})
-        for sprites in sprite_lists.values():
-            for sprite in sprites:
-                if not getattr(sprite, "moving", False):
-                    continue
-                snapped_x, snapped_y = snap_world_point(sprite.center_x, sprite.center_y, zoom)
-                sprite.position = (snapped_x, snapped_y)
+    def _animate_move(self, entity, to_tile, duration: float = MOVE_DURATION) -> None:
+        """Запускает анимацию перемещения под управлением общего TweenManager."""
+        if entity.tweens is not self.tweens:
+            self.tweens.attach(entity)
+        entity.start_move(*to_tile, duration=duration)
+
+    def _turn_move_duration(self) -> float:
+        """
+        Длительность анимаций текущей фазы: ускоренная, пока враги не встревожены
+        и никого не видно; обычная — как только кто-то замечает игрока.
+        """
+        if self.settings.fast_forward and self.sim is not None and self.sim.is_quiet():
+            return self.settings.fast_forward_move_duration
+        return MOVE_DURATION
+
+    def _render_zoom(self) -> float | None:
+        if self.camera_controller is not None:
+            return self.camera_controller.zoom
+        if self.camera is not None:
+            return self.camera.zoom
+        return None
 
     def process_enemy_turns(self):
-        """Запускает последовательную обработку ходов всех врагов с ожиданием их анимаций."""
-        if self.state.is_paused() or self.scene is None:
+        """Разрешает ходы всех врагов в движке и запускает анимацию их перемещений."""
+        if self.state.is_paused() or self.sim is None:
             return
-        # Сформируем очередь живых врагов
-        enemies = list(self.scene.get_sprite_list("Skeleton") or [])
-        self._enemy_queue = deque(e for e in enemies if not getattr(e, 'removed', False))
+        events = self.sim.run_enemy_turns()
         self._current_enemy = None
-        # Запускаем обработку
+        if self.sim.simultaneous:
+            self._enemy_queue.clear()
+            self._animate_enemy_moves(events)
+            return
+        self._enemy_queue = deque(events)
         self._process_next_enemy()
 
+    def _animate_enemy_moves(self, events):
+        """
+        Запускает все перемещения врагов одновременно: ход длится одну анимацию
+        независимо от числа врагов. Ход возвращается игроку после последней.
+        """
+        moves = [event for event in events if isinstance(event, MoveEvent) and event.entity.hp > 0]
+        if not moves:
+            self.state.set_phase(GamePhase.PLAYER_TURN)
+            return
+
+        duration = self._turn_move_duration()
+
+        self._enemy_moves_pending = len(moves)
+
+        def _make_callback(e):
+            def cb():
+                e.on_move_complete = None
+                self._enemy_moves_pending -= 1
+                if self._enemy_moves_pending == 0:
+                    self.state.set_phase(GamePhase.PLAYER_TURN)
+            return cb
+
+        for event in moves:
+            event.entity.on_move_complete = _make_callback(event.entity)
+            self._animate_move(event.entity, event.to_tile, duration)
+
     def _process_next_enemy(self):
         """
-        Обрабатывает следующий враг из очереди. Если враг начинает анимацию — ждём её завершения.
-        Иначе продолжаем к следующему врагу. По окончании возвращаем ход игроку.
+        Анимирует следующее перемещение врага из очереди и ждёт его завершения.
+        Атаки уже применены движком. По окончании очереди возвращаем ход игроку.
         """
         if self.state.is_paused():
             return
 
         while self._enemy_queue:
-            enemy = self._enemy_queue.popleft()
-            # Пропуск мёртвых/удалённых сущностей
-            if getattr(enemy, "removed", False):
+            event = self._enemy_queue.popleft()
+            if not isinstance(event, MoveEvent):
                 continue
-            action = decide_enemy_action(enemy, self.player_sprite, self.level, self.scene)
-
-            if action.kind == "wait":
+            enemy = event.entity
+            if enemy.hp <= 0:
                 continue
 
-            if action.kind == "attack":
-                if hasattr(enemy, "attack"):
-                    enemy.attack(self.player_sprite)
-                continue
+            self._current_enemy = enemy
 
-            if action.kind != "move":
-                continue
+            def _make_callback(e):
+                def cb():
+                    e.on_move_complete = None
+                    self._current_enemy = None
+                    self._process_next_enemy()
+                return cb
 
-            res, blocker = self._move_with_fallback(enemy, action.dx, action.dy)
-            if res == MoveResult.BLOCKED_WALL:
-                continue
-            if res == MoveResult.BLOCKED_ENTITY:
-                if blocker is self.player_sprite:
-                    enemy.attack(self.player_sprite)
-                continue
-            if res == MoveResult.MOVED:
-                self._current_enemy = enemy
-
-                def _make_callback(e):
-                    def cb():
-                        e.on_move_complete = None
-                        self._current_enemy = None
-                        self._process_next_enemy()
-                    return cb
-
-                enemy.on_move_complete = _make_callback(enemy)
-                # ждем завершения анимации — выходим, дальнейшая обработка продолжится в callback
-                return
-            continue
+            enemy.on_move_complete = _make_callback(enemy)
+            self._animate_move(enemy, event.to_tile, self._turn_move_duration())
+            # ждем завершения анимации — выходим, дальнейшая обработка продолжится в callback
+            return
 
         # Очередь пуста — возвращаем ход игроку
         self.state.set_phase(GamePhase.PLAYER_TURN)
@@ -459,12 +733,23 @@ class Game(arcade.Window):
     def _pause_game(self) -> None:
         if not self.state.pause():
             return
+        if self.recorder is not None:
+            self.recorder.record(time.time(), replay.PAUSE)
         self.movement_input.clear()
+        if self.auto_travel is not None:
+            self.auto_travel.stop()
         self.ui.show_screen(OverlayScreenId.PAUSE)
 
+    def _on_settings_changed(self) -> None:
+        # Длительность шага зависит от ускорения, поэтому переключение попадает в журнал
+        if self.recorder is not None:
+            self.recorder.record(time.time(), replay.FAST_FORWARD, int(self.settings.fast_forward))
+
     def _resume_game(self) -> None:
         if not self.state.resume():
             return
+        if self.recorder is not None:
+            self.recorder.record(time.time(), replay.RESUME)
         self.movement_input.clear()
         self.ui.clear_overlay()
 
@@ -476,8 +761,24 @@ class Game(arcade.Window):
         self.ui.show_view_screen(ViewScreenId.MAIN_MENU)
 
 
-def main():
-    game = Game()
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Shardveil")
+    parser.add_argument("--record", type=Path, help="record seed and input to a replay log on exit")
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        help=f"write a Chrome trace (Perfetto) of frames, turns and AI on exit; also ${trace.TRACE_ENV}",
+    )
+    profiling.add_arguments(parser, "frame")
+    args = parser.parse_args(argv)
+
+    if args.trace is not None:
+        trace.start(args.trace)
+    else:
+        trace.start_from_env()
+    profiling.start_from_args(args, "frame")
+
+    game = Game(record_path=args.record)
     game.setup()
     arcade.run()
 
@@ -1,5 +1,7 @@
 """Логика ИИ врагов."""
 
+from .chase_map import ChaseMaps
 from .enemy_ai import EnemyAction, decide_enemy_action
+from .perception import PlayerPerception, max_notice_radius
 
-__all__ = ["EnemyAction", "decide_enemy_action"]
+__all__ = ["ChaseMaps", "EnemyAction", "PlayerPerception", "decide_enemy_action", "max_notice_radius"]
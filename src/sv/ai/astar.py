@@ -0,0 +1,86 @@
+"""Ограниченный A* по карте стоимости с ранним выходом."""
+
+import heapq
+
+import numpy as np
+
+CARDINAL_COST = 2
+DIAGONAL_COST = 3
+# Сколько узлов A* может раскрыть, прежде чем сдаться
+DEFAULT_NODE_BUDGET = 512
+
+_STEPS = (
+    (1, 0, CARDINAL_COST), (-1, 0, CARDINAL_COST), (0, 1, CARDINAL_COST), (0, -1, CARDINAL_COST),
+    (1, 1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST), (1, -1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST),
+)
+
+
+def _chebyshev(x: int, y: int, tx: int, ty: int) -> int:
+    # Допустимая эвристика: любой путь из max(dx, dy) шагов стоит не меньше CARDINAL_COST за шаг
+    return CARDINAL_COST * max(abs(x - tx), abs(y - ty))
+
+
+def astar_path(
+    cost: np.ndarray,
+    start: tuple[int, int],
+    goal: tuple[int, int],
+    max_nodes: int = DEFAULT_NODE_BUDGET,
+) -> list[tuple[int, int]] | None:
+    """
+    Ищет путь по cost (индекс [y, x], 0 — непроходимо) от start до goal.
+    Поиск ведётся от цели и останавливается, как только раскрыт start.
+    Возвращает шаги (x, y) после start до goal включительно, [] если пути нет,
+    и None, если исчерпан бюджет max_nodes.
+    """
+    height, width = cost.shape
+    sx, sy = start
+    gx, gy = goal
+    if not (0 <= sx < width and 0 <= sy < height and 0 <= gx < width and 0 <= gy < height):
+        return []
+    if start == goal:
+        return []
+    if cost[gy, gx] <= 0:
+        return []
+
+    passable = cost.ravel().tolist()
+    best = {goal: 0}
+    parent: dict[tuple[int, int], tuple[int, int]] = {}
+    counter = 0
+    frontier = [(_chebyshev(gx, gy, sx, sy), counter, 0, goal)]
+    expanded = 0
+
+    while frontier:
+        _, _, distance, node = heapq.heappop(frontier)
+        if distance > best.get(node, distance):
+            continue
+        if node == start:
+            path = []
+            while node != goal:
+                node = parent[node]
+                path.append(node)
+            return path
+
+        expanded += 1
+        if expanded > max_nodes:
+            return None
+
+        x, y = node
+        for dx, dy, step_cost in _STEPS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            # Стартовый тайл занят самим актёром, но в него можно «прийти»
+            if (nx, ny) != start and passable[ny * width + nx] <= 0:
+                continue
+            new_distance = distance + step_cost
+            neighbour = (nx, ny)
+            if new_distance >= best.get(neighbour, new_distance + 1):
+                continue
+            best[neighbour] = new_distance
+            parent[neighbour] = node
+            counter += 1
+            heapq.heappush(
+                frontier,
+                (new_distance + _chebyshev(nx, ny, sx, sy), counter, new_distance, neighbour),
+            )
+    return []
@@ -0,0 +1,104 @@
+"""Общие карты расстояний (Дейкстра) для преследования в пределах одного хода врагов."""
+
+import numpy as np
+import tcod.path
+
+from sv.core import trace
+from sv.core.collision import get_blocking_entity
+from sv.world.level_grid import LevelGrid, as_level_grid
+
+UNREACHABLE = np.iinfo(np.int32).max
+CARDINAL_COST = 2
+DIAGONAL_COST = 3
+
+# Сначала ортогональные шаги: при равных расстояниях враг не срезает углы
+_NEIGHBOURS = (
+    (1, 0), (-1, 0), (0, 1), (0, -1),
+    (1, 1), (-1, 1), (1, -1), (-1, -1),
+)
+
+
+def dijkstra_map(walkable: np.ndarray, goals: np.ndarray) -> np.ndarray:
+    """Карта расстояний (только чтение) до ближайшей из целей goals по проходимым тайлам."""
+    distance = np.full(walkable.shape, UNREACHABLE, dtype=np.int32)
+    distance[goals] = 0
+    with trace.span("dijkstra_map", "path"):
+        tcod.path.dijkstra2d(distance, walkable, CARDINAL_COST, DIAGONAL_COST, out=distance)
+    distance.flags.writeable = False
+    return distance
+
+
+class ChaseMaps:
+    """
+    Карты расстояний до целей, общие для всех врагов в пределах хода.
+    Для каждой различной цели строится одна карта Дейкстры по рельефу;
+    враг получает следующий шаг спуском по градиенту к соседнему свободному тайлу.
+    Создаётся заново на каждый ход врагов.
+    """
+
+    def __init__(self, level):
+        self.level: LevelGrid = as_level_grid(level)
+        self._revision = self.level.revision
+        self._maps: dict[tuple[int, int], np.ndarray | None] = {}
+
+    @property
+    def computed(self) -> int:
+        """Сколько карт Дейкстры было построено за ход."""
+        return len(self._maps)
+
+    def distance_map(self, goal_tile: tuple[int, int]) -> np.ndarray | None:
+        """Возвращает карту расстояний до goal_tile (индекс [y, x]) или None, если цель непроходима."""
+        if self.level.revision != self._revision:
+            self._maps.clear()
+            self._revision = self.level.revision
+
+        goal = (int(goal_tile[0]), int(goal_tile[1]))
+        if goal in self._maps:
+            return self._maps[goal]
+
+        distance = None
+        goal_x, goal_y = goal
+        if self.level.is_walkable(goal_x, goal_y):
+            goals = np.zeros(self.level.shape, dtype=bool)
+            goals[goal_y, goal_x] = True
+            distance = dijkstra_map(self.level.walkable, goals)
+        self._maps[goal] = distance
+        return distance
+
+    def next_step(self, actor, goal_tile: tuple[int, int], scene) -> tuple[int, int] | None:
+        """
+        Возвращает соседний тайл (x, y), ближайший к цели, или None.
+        Тайлы, занятые другими блокирующими сущностями, пропускаются (кроме самой цели).
+        """
+        distance = self.distance_map(goal_tile)
+        if distance is None:
+            return None
+        return descend(distance, actor, scene, goal_tile)
+
+
+def descend(distance: np.ndarray, actor, scene, goal_tile: tuple[int, int] | None = None) -> tuple[int, int] | None:
+    """
+    Спуск по карте расстояний: соседний тайл (x, y) с наименьшим расстоянием,
+    меньшим текущего, или None. Занятые блокирующими сущностями тайлы пропускаются,
+    кроме goal_tile.
+    """
+    height, width = distance.shape
+    x, y = int(actor.tile_x), int(actor.tile_y)
+    if not (0 <= x < width and 0 <= y < height):
+        return None
+
+    goal = (int(goal_tile[0]), int(goal_tile[1])) if goal_tile is not None else None
+    best_tile = None
+    best_distance = int(distance[y, x])
+    for dx, dy in _NEIGHBOURS:
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < width and 0 <= ny < height):
+            continue
+        step_distance = int(distance[ny, nx])
+        if step_distance >= best_distance:
+            continue
+        if (nx, ny) != goal and get_blocking_entity(scene, nx, ny, ignore=actor) is not None:
+            continue
+        best_tile = (nx, ny)
+        best_distance = step_distance
+    return best_tile
@@ -5,8 +5,13 @@ import tcod.map
 import tcod.path
 from tcod.constants import FOV_RESTRICTIVE
 
-from sv.core.collision import iter_blocking_entities
-from sv.world.tiles import build_transparency_mask, build_walkable_mask
+from sv.ai.astar import DEFAULT_NODE_BUDGET, astar_path
+from sv.ai.chase_map import ChaseMaps
+from sv.ai.perception import PlayerPerception
+from sv.ai.window import TileWindow
+from sv.core import trace
+from sv.core.collision import get_blocking_entity, iter_blocking_entities
+from sv.world.level_grid import as_level_grid
 
 
 @dataclass(slots=True)
@@ -19,8 +24,27 @@ def _is_adjacent(enemy, player) -> bool:
     return max(abs(enemy.tile_x - player.tile_x), abs(enemy.tile_y - player.tile_y)) == 1
 
 
-def _build_cost_map(level, scene, actor, goal_tile: tuple[int, int] | None) -> np.ndarray:
-    walkable_mask = np.array(build_walkable_mask(level), dtype=np.int8, order="C")
+# Отступ окна поиска пути вокруг прямоугольника «враг — цель»
+PATH_WINDOW_MARGIN = 8
+
+
+def _is_partial(window: TileWindow, grid) -> bool:
+    """Окно не покрывает всю карту: путь в обход за его пределами ещё возможен."""
+    return window.width < grid.width or window.height < grid.height
+
+
+def _build_cost_map(
+    level,
+    scene,
+    actor,
+    goal_tile: tuple[int, int] | None,
+    window: TileWindow | None = None,
+) -> np.ndarray:
+    """Карта стоимости в координатах окна (или всей карты, если окно не задано)."""
+    walkable = as_level_grid(level).walkable
+    if window is None:
+        window = TileWindow(0, 0, walkable.shape[1], walkable.shape[0])
+    walkable_mask = window.crop(walkable).astype(np.int8)
     if walkable_mask.size == 0:
         return walkable_mask
 
@@ -32,62 +56,214 @@ def _build_cost_map(level, scene, actor, goal_tile: tuple[int, int] | None) -> n
             continue
         if goal_tile is not None and (ex, ey) == (goal_x, goal_y):
             continue
-        if 0 <= ey < walkable_mask.shape[0] and 0 <= ex < walkable_mask.shape[1]:
-            walkable_mask[ey, ex] = 0
+        if window.contains(ex, ey):
+            lx, ly = window.to_local(ex, ey)
+            walkable_mask[ly, lx] = 0
 
-    if goal_tile is not None and 0 <= goal_y < walkable_mask.shape[0] and 0 <= goal_x < walkable_mask.shape[1]:
-        walkable_mask[goal_y, goal_x] = 1
+    if goal_tile is not None and window.contains(goal_x, goal_y):
+        lx, ly = window.to_local(goal_x, goal_y)
+        walkable_mask[ly, lx] = 1
 
     return walkable_mask
 
 
-def can_enemy_notice_player(enemy, player, level) -> bool:
+def can_enemy_notice_player(enemy, player, level, perception: PlayerPerception | None = None) -> bool:
     if enemy is None or player is None:
         return False
+    if perception is not None:
+        return perception.can_see(enemy, player, level)
 
     radius = max(0, int(getattr(enemy, "notice_radius", 0)))
     if max(abs(enemy.tile_x - player.tile_x), abs(enemy.tile_y - player.tile_y)) > radius:
         return False
 
-    transparency = np.array(build_transparency_mask(level), dtype=bool, order="C")
+    transparency = as_level_grid(level).transparent
     if transparency.size == 0:
         return False
 
-    visible = tcod.map.compute_fov(
-        transparency,
-        (enemy.tile_y, enemy.tile_x),
-        radius=radius,
-        light_walls=True,
-        algorithm=FOV_RESTRICTIVE,
-    )
-    return bool(visible[player.tile_y, player.tile_x])
+    # FOV считается только в окне notice_radius вокруг врага
+    window = TileWindow.around(transparency.shape, (enemy.tile_x, enemy.tile_y), radius)
+    if not window.contains(player.tile_x, player.tile_y):
+        return False
+    enemy_lx, enemy_ly = window.to_local(enemy.tile_x, enemy.tile_y)
+    player_lx, player_ly = window.to_local(player.tile_x, player.tile_y)
+
+    with trace.span("enemy_fov", "fov"):
+        visible = tcod.map.compute_fov(
+            window.crop(transparency),
+            (enemy_ly, enemy_lx),
+            radius=radius,
+            light_walls=True,
+            algorithm=FOV_RESTRICTIVE,
+        )
+    return bool(visible[player_ly, player_lx])
 
 
-def build_path_to_target(enemy, goal_tile: tuple[int, int], level, scene) -> list[tuple[int, int]]:
-    cost = _build_cost_map(level, scene, enemy, goal_tile)
+def build_path_to_target(
+    enemy,
+    goal_tile: tuple[int, int],
+    level,
+    scene,
+    margin: int | None = PATH_WINDOW_MARGIN,
+) -> list[tuple[int, int]]:
+    """
+    Строит путь от врага к goal_tile (без стартового тайла).
+    Поиск ведётся в окне вокруг врага и цели с отступом margin; margin=None — по всей карте.
+    Если в окне пути нет, поиск один раз повторяется по всей карте: обход может
+    выходить за окно.
+    """
+    grid = as_level_grid(level)
+    goal_x, goal_y = goal_tile
+    if not grid.in_bounds(goal_x, goal_y) or not grid.in_bounds(enemy.tile_x, enemy.tile_y):
+        return []
+
+    window = None
+    if margin is not None:
+        window = TileWindow.covering(grid.shape, ((enemy.tile_x, enemy.tile_y), (goal_x, goal_y)), margin)
+    cost = _build_cost_map(grid, scene, enemy, goal_tile, window)
     if cost.size == 0:
         return []
+    if window is None:
+        window = TileWindow(0, 0, cost.shape[1], cost.shape[0])
+
+    goal_lx, goal_ly = window.to_local(goal_x, goal_y)
+    if cost[goal_ly, goal_lx] <= 0:
+        return []
+
+    enemy_lx, enemy_ly = window.to_local(enemy.tile_x, enemy.tile_y)
+    with trace.span("tcod_path", "path") as span:
+        graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
+        pathfinder = tcod.path.Pathfinder(graph)
+        pathfinder.add_root((goal_ly, goal_lx))
+        raw_path = pathfinder.path_from((enemy_ly, enemy_lx))[1:].tolist()
+        if span:
+            span.annotate(cells=int(cost.size), length=len(raw_path))
+    if not raw_path and (enemy_lx, enemy_ly) != (goal_lx, goal_ly) and _is_partial(window, grid):
+        return build_path_to_target(enemy, goal_tile, level, scene, margin=None)
+    return [window.to_world(step_x, step_y) for step_y, step_x in raw_path]
 
+
+def find_bounded_path(
+    enemy,
+    goal_tile: tuple[int, int],
+    level,
+    scene,
+    max_nodes: int = DEFAULT_NODE_BUDGET,
+    margin: int | None = PATH_WINDOW_MARGIN,
+) -> list[tuple[int, int]] | None:
+    """
+    Путь A* с эвристикой Чебышёва и бюджетом узлов, в том же окне, что и build_path_to_target.
+    Возвращает None, если бюджет исчерпан раньше, чем найден путь. Если в окне пути нет,
+    он ищется по всей карте через build_path_to_target: обход вокруг длинной стены
+    в бюджет A* обычно не укладывается, а жадный шаг упёрся бы в ту же стену.
+    """
+    grid = as_level_grid(level)
     goal_x, goal_y = goal_tile
-    if not (0 <= goal_y < cost.shape[0] and 0 <= goal_x < cost.shape[1]):
+    if not grid.in_bounds(goal_x, goal_y) or not grid.in_bounds(enemy.tile_x, enemy.tile_y):
         return []
-    if cost[goal_y, goal_x] <= 0:
+
+    if margin is None:
+        window = TileWindow(0, 0, grid.width, grid.height)
+    else:
+        window = TileWindow.covering(grid.shape, ((enemy.tile_x, enemy.tile_y), (goal_x, goal_y)), margin)
+    cost = _build_cost_map(grid, scene, enemy, goal_tile, window)
+    if cost.size == 0:
         return []
 
-    graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
-    pathfinder = tcod.path.Pathfinder(graph)
-    pathfinder.add_root((goal_y, goal_x))
+    with trace.span("astar", "path") as span:
+        local_path = astar_path(
+            cost,
+            window.to_local(enemy.tile_x, enemy.tile_y),
+            window.to_local(goal_x, goal_y),
+            max_nodes=max_nodes,
+        )
+        if span:
+            span.annotate(cells=int(cost.size), found=local_path is not None)
+    if local_path is None:
+        return None
+    if not local_path and (enemy.tile_x, enemy.tile_y) != goal_tile and _is_partial(window, grid):
+        return build_path_to_target(enemy, goal_tile, level, scene, margin=None)
+    return [window.to_world(step_x, step_y) for step_x, step_y in local_path]
 
-    raw_path = pathfinder.path_from((enemy.tile_y, enemy.tile_x))[1:].tolist()
-    return [(step_x, step_y) for step_y, step_x in raw_path]
 
+def greedy_step(enemy, goal_tile: tuple[int, int], level, scene) -> tuple[int, int] | None:
+    """Соседний свободный тайл, который приближает врага к цели, без поиска пути."""
+    grid = as_level_grid(level)
+    goal_x, goal_y = goal_tile
+
+    def _distance(tx: int, ty: int) -> tuple[int, int]:
+        dx, dy = abs(goal_x - tx), abs(goal_y - ty)
+        return max(dx, dy), dx * dx + dy * dy
+
+    best_tile = None
+    best_distance = _distance(enemy.tile_x, enemy.tile_y)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dx == 0 and dy == 0:
+                continue
+            nx, ny = enemy.tile_x + dx, enemy.tile_y + dy
+            if not grid.is_walkable(nx, ny):
+                continue
+            if (nx, ny) != (goal_x, goal_y) and get_blocking_entity(scene, nx, ny, ignore=enemy) is not None:
+                continue
+            distance = _distance(nx, ny)
+            if distance < best_distance:
+                best_tile = (nx, ny)
+                best_distance = distance
+    return best_tile
+
+
+def _cached_step(enemy, goal_tile: tuple[int, int], level, scene) -> tuple[int, int] | None:
+    """
+    Следующий шаг из сохранённого пути врага, если цель не менялась,
+    а шаг по-прежнему проходим и свободен. Иначе сбрасывает кэш и возвращает None.
+    """
+    path = getattr(enemy, "cached_path", None)
+    if not path or getattr(enemy, "cached_path_goal", None) != goal_tile:
+        return None
+
+    # Пропускаем уже пройденные шаги
+    position = (enemy.tile_x, enemy.tile_y)
+    if position in path:
+        del path[: path.index(position) + 1]
+
+    if path:
+        next_x, next_y = path[0]
+        adjacent = max(abs(next_x - enemy.tile_x), abs(next_y - enemy.tile_y)) == 1
+        free = (next_x, next_y) == goal_tile or get_blocking_entity(scene, next_x, next_y, ignore=enemy) is None
+        if adjacent and free and as_level_grid(level).is_walkable(next_x, next_y):
+            return next_x, next_y
 
-def choose_movement_action(enemy, goal_tile: tuple[int, int], level, scene) -> EnemyAction:
-    path = build_path_to_target(enemy, goal_tile, level, scene)
-    if not path:
+    enemy.cached_path = []
+    enemy.cached_path_goal = None
+    return None
+
+
+def choose_movement_action(
+    enemy,
+    goal_tile: tuple[int, int],
+    level,
+    scene,
+    chase_maps: ChaseMaps | None = None,
+    max_nodes: int = DEFAULT_NODE_BUDGET,
+) -> EnemyAction:
+    step = _cached_step(enemy, goal_tile, level, scene)
+    if step is None and chase_maps is not None:
+        step = chase_maps.next_step(enemy, goal_tile, scene)
+    elif step is None:
+        path = find_bounded_path(enemy, goal_tile, level, scene, max_nodes=max_nodes)
+        if path is None:
+            # Бюджет A* исчерпан — идём напрямую к последней известной позиции
+            step = greedy_step(enemy, goal_tile, level, scene)
+        else:
+            step = path[0] if path else None
+            # Сохраняем путь: пока цель та же, его можно переиспользовать
+            enemy.cached_path = path
+            enemy.cached_path_goal = goal_tile
+    if step is None:
         return EnemyAction("wait")
 
-    next_x, next_y = path[0]
+    next_x, next_y = step
     return EnemyAction("move", dx=next_x - enemy.tile_x, dy=next_y - enemy.tile_y)
 
 
@@ -95,9 +271,24 @@ def _reset_alert(enemy) -> None:
     enemy.is_alerted = False
     enemy.last_seen_player_tile = None
     enemy.search_turns_left = 0
+    enemy.cached_path = []
+    enemy.cached_path_goal = None
 
 
-def decide_enemy_action(enemy, player, level, scene) -> EnemyAction:
+def decide_enemy_action(
+    enemy,
+    player,
+    level,
+    scene,
+    chase_maps: ChaseMaps | None = None,
+    perception: PlayerPerception | None = None,
+) -> EnemyAction:
+    """
+    Решает действие врага на текущий ход.
+    chase_maps — общие карты расстояний хода для преследования видимого игрока;
+    в фазе поиска враг идёт по своему сохранённому пути к last_seen_player_tile.
+    perception — общее поле зрения игрока; без него FOV считается из позиции врага.
+    """
     if enemy is None or player is None:
         return EnemyAction("wait")
 
@@ -107,11 +298,11 @@ def decide_enemy_action(enemy, player, level, scene) -> EnemyAction:
         enemy.search_turns_left = int(getattr(enemy, "search_turn_limit", 0))
         return EnemyAction("attack")
 
-    if can_enemy_notice_player(enemy, player, level):
+    if can_enemy_notice_player(enemy, player, level, perception):
         enemy.is_alerted = True
         enemy.last_seen_player_tile = (player.tile_x, player.tile_y)
         enemy.search_turns_left = int(getattr(enemy, "search_turn_limit", 0))
-        return choose_movement_action(enemy, enemy.last_seen_player_tile, level, scene)
+        return choose_movement_action(enemy, enemy.last_seen_player_tile, level, scene, chase_maps)
 
     if enemy.is_alerted and enemy.last_seen_player_tile is not None and enemy.search_turns_left > 0:
         enemy.search_turns_left -= 1
@@ -124,3 +315,26 @@ def decide_enemy_action(enemy, player, level, scene) -> EnemyAction:
 
     _reset_alert(enemy)
     return EnemyAction("wait")
+
+
+def retry_enemy_move(
+    enemy,
+    player,
+    level,
+    scene,
+    chase_maps: ChaseMaps | None = None,
+    perception: PlayerPerception | None = None,
+) -> EnemyAction:
+    """
+    Повторный выбор шага для врага, который уже решил в этом ходу и остался на месте
+    (например, путь был занят другим врагом, который с тех пор ушёл). Состояние тревоги
+    не меняется: враг идёт к той же цели, что выбрал decide_enemy_action.
+    """
+    if enemy is None or player is None or not enemy.is_alerted or enemy.last_seen_player_tile is None:
+        return EnemyAction("wait")
+    if _is_adjacent(enemy, player):
+        return EnemyAction("wait")
+    # Как в decide_enemy_action: общие карты — только для преследования видимого игрока
+    if not can_enemy_notice_player(enemy, player, level, perception):
+        chase_maps = None
+    return choose_movement_action(enemy, enemy.last_seen_player_tile, level, scene, chase_maps)
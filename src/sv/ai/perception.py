@@ -0,0 +1,88 @@
+"""Общее поле зрения игрока для проверки, замечают ли его враги."""
+
+import math
+
+import numpy as np
+import tcod.map
+from tcod.constants import FOV_SYMMETRIC_SHADOWCAST
+
+from sv.ai.window import TileWindow
+from sv.core import trace
+from sv.world.level_grid import as_level_grid
+
+
+def max_notice_radius(enemies) -> int:
+    """Максимальный радиус обнаружения среди врагов."""
+    return max((max(0, int(getattr(enemy, "notice_radius", 0))) for enemy in enemies), default=0)
+
+
+class PlayerPerception:
+    """
+    Поле зрения, вычисляемое один раз из позиции игрока вместо FOV от каждого врага.
+    При симметричном алгоритме «игрок видит тайл врага» равносильно «враг видит игрока»,
+    поэтому каждый враг отвечает на вопрос поиском в общем массиве.
+    Массив пересчитывается только при смене тайла игрока, радиуса или ревизии уровня
+    и покрывает лишь окно радиусом обнаружения вокруг игрока (координаты — в window).
+    """
+
+    def __init__(self, algorithm: int = FOV_SYMMETRIC_SHADOWCAST):
+        self.algorithm = algorithm
+        self.radius = 0
+        self.computed = 0
+        self._key: tuple | None = None
+        self._visible: np.ndarray | None = None
+        self.window: TileWindow | None = None
+
+    def update(self, level, player, radius: int) -> np.ndarray | None:
+        """Возвращает поле зрения игрока радиусом не меньше radius (индекс [y, x] внутри window)."""
+        if player is None:
+            return None
+        grid = as_level_grid(level)
+        radius = max(0, int(radius))
+        key = (id(grid), grid.revision, int(player.tile_x), int(player.tile_y))
+        if self._key == key and self._visible is not None and radius <= self.radius:
+            return self._visible
+
+        player_xy = (int(player.tile_x), int(player.tile_y))
+        if not grid.in_bounds(*player_xy):
+            self._key = None
+            self._visible = None
+            self.window = None
+            return None
+
+        window = TileWindow.around(grid.shape, player_xy, radius)
+        player_lx, player_ly = window.to_local(*player_xy)
+        # Обнаружение ограничено квадратом (Чебышёв), а радиус FOV в tcod — кругом:
+        # берём круг, описанный вокруг квадрата notice_radius
+        with trace.span("player_fov", "fov"):
+            self._visible = tcod.map.compute_fov(
+                window.crop(grid.transparent),
+                (player_ly, player_lx),
+                radius=math.ceil(radius * math.sqrt(2)) + 1 if radius > 0 else 0,
+                light_walls=True,
+                algorithm=self.algorithm,
+            )
+        self._key = key
+        self.window = window
+        self.radius = radius
+        self.computed += 1
+        return self._visible
+
+    def can_see(self, enemy, player, level) -> bool:
+        """Проверяет, может ли враг заметить игрока в пределах своего notice_radius."""
+        if enemy is None or player is None:
+            return False
+        radius = max(0, int(getattr(enemy, "notice_radius", 0)))
+        dx = int(enemy.tile_x) - int(player.tile_x)
+        dy = int(enemy.tile_y) - int(player.tile_y)
+        if max(abs(dx), abs(dy)) > radius:
+            return False
+
+        visible = self.update(level, player, max(radius, self.radius))
+        if visible is None or self.window is None:
+            return False
+        ex, ey = int(enemy.tile_x), int(enemy.tile_y)
+        if not self.window.contains(ex, ey):
+            return False
+        lx, ly = self.window.to_local(ex, ey)
+        return bool(visible[ly, lx])
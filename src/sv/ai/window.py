@@ -0,0 +1,60 @@
+"""Окна-вырезки карты вокруг актёра для локальных FOV и поиска пути."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class TileWindow:
+    """Прямоугольник тайлов [x0, x1) x [y0, y1) внутри карты."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+
+    @classmethod
+    def around(cls, shape: tuple[int, int], center: tuple[int, int], radius: int) -> "TileWindow":
+        """Окно радиусом radius вокруг center=(x, y), обрезанное границами карты shape=(h, w)."""
+        return cls.covering(shape, (center,), radius)
+
+    @classmethod
+    def covering(cls, shape: tuple[int, int], tiles, margin: int) -> "TileWindow":
+        """Минимальное окно, содержащее все tiles (x, y) с отступом margin."""
+        height, width = shape
+        xs = [int(x) for x, _ in tiles]
+        ys = [int(y) for _, y in tiles]
+        margin = max(0, int(margin))
+        return cls(
+            x0=max(0, min(xs) - margin),
+            y0=max(0, min(ys) - margin),
+            x1=min(width, max(xs) + margin + 1),
+            y1=min(height, max(ys) + margin + 1),
+        )
+
+    @property
+    def width(self) -> int:
+        return max(0, self.x1 - self.x0)
+
+    @property
+    def height(self) -> int:
+        return max(0, self.y1 - self.y0)
+
+    @property
+    def slices(self) -> tuple[slice, slice]:
+        """Срезы (y, x) для индексации массивов карты."""
+        return slice(self.y0, self.y1), slice(self.x0, self.x1)
+
+    def crop(self, array: np.ndarray) -> np.ndarray:
+        """Возвращает представление массива карты внутри окна (без копирования)."""
+        return array[self.slices]
+
+    def contains(self, tx: int, ty: int) -> bool:
+        return self.x0 <= tx < self.x1 and self.y0 <= ty < self.y1
+
+    def to_local(self, tx: int, ty: int) -> tuple[int, int]:
+        return tx - self.x0, ty - self.y0
+
+    def to_world(self, lx: int, ly: int) -> tuple[int, int]:
+        return lx + self.x0, ly + self.y0
@@ -3,3 +3,5 @@ from .camera_controller import CameraController, snap_world_point
 from .config import Settings
 from .movement_input import MovementInputState
 from .state_manager import AppView, GamePhase, StateManager
+from .timing import FrameTimings, PhaseStats, RingBuffer
+from .tween import TweenManager
@@ -83,6 +83,13 @@ class CameraController:
         )
         self._apply_camera_state()
 
+    def visible_world_rect(self, margin: float = 0.0) -> tuple[float, float, float, float]:
+        """World-space (left, bottom, right, top) currently covered by the viewport."""
+        half_width = self.viewport_width / (2.0 * self.zoom) + margin
+        half_height = self.viewport_height / (2.0 * self.zoom) + margin
+        x, y = self.camera.position
+        return (x - half_width, y - half_height, x + half_width, y + half_height)
+
     def _find_zoom_index(self, initial_zoom: float) -> int:
         try:
             return self.zoom_levels.index(float(initial_zoom))
@@ -20,11 +20,107 @@ def is_tile_walkable(level, tx: int, ty: int) -> bool:
         return False
 
 
+class OccupancyIndex:
+    """
+    Индекс занятости тайлов блокирующими сущностями: (tile_x, tile_y) -> entity.
+    Поддерживается через commit_tile, Entity.move_to и Entity.die; подключается
+    к сцене как атрибут scene.occupancy (или передаётся вместо scene напрямую).
+    """
+
+    def __init__(self, entities=()):
+        self._by_tile: dict[tuple[int, int], object] = {}
+        self._tile_of: dict[int, tuple[int, int]] = {}
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity) -> bool:
+        """
+        Регистрирует сущность; неблокирующие сущности в индекс не попадают.
+        Если тайл занят другой сущностью, индекс не меняется и возвращается False.
+        """
+        if entity is None or not getattr(entity, "blocking", False):
+            return False
+        tile = (int(entity.tile_x), int(entity.tile_y))
+        if not self._is_free(tile, entity):
+            return False
+        self.discard(entity)
+        self._by_tile[tile] = entity
+        self._tile_of[id(entity)] = tile
+        entity.occupancy = self
+        return True
+
+    def _is_free(self, tile: tuple[int, int], entity) -> bool:
+        occupant = self._by_tile.get(tile)
+        return occupant is None or occupant is entity
+
+    def discard(self, entity) -> None:
+        """Удаляет сущность из индекса, если она в нём есть."""
+        tile = self._tile_of.pop(id(entity), None)
+        if tile is not None and self._by_tile.get(tile) is entity:
+            del self._by_tile[tile]
+
+    def remove(self, entity) -> None:
+        """Удаляет сущность из индекса и отвязывает её от него."""
+        self.discard(entity)
+        if getattr(entity, "occupancy", None) is self:
+            entity.occupancy = None
+
+    def move(self, entity, tx: int, ty: int) -> bool:
+        """
+        Переносит зарегистрированную сущность на новый тайл.
+        Занятый другой сущностью тайл не перезаписывается: возвращается False.
+        """
+        if id(entity) not in self._tile_of:
+            return False
+        tile = (int(tx), int(ty))
+        if not self._is_free(tile, entity):
+            return False
+        self.discard(entity)
+        self._by_tile[tile] = entity
+        self._tile_of[id(entity)] = tile
+        return True
+
+    def get(self, tx: int, ty: int, ignore=None):
+        """Возвращает блокирующую сущность на тайле или None."""
+        entity = self._by_tile.get((tx, ty))
+        if entity is ignore:
+            return None
+        return entity
+
+    def entities(self, ignore=None):
+        """Итерирует по зарегистрированным сущностям."""
+        for entity in tuple(self._by_tile.values()):
+            if entity is not ignore:
+                yield entity
+
+    def clear(self) -> None:
+        for entity in tuple(self._by_tile.values()):
+            self.remove(entity)
+
+    def __contains__(self, entity) -> bool:
+        return id(entity) in self._tile_of
+
+    def __len__(self) -> int:
+        return len(self._by_tile)
+
+
+def get_occupancy(scene) -> OccupancyIndex | None:
+    """Возвращает индекс занятости сцены, если он подключён."""
+    if isinstance(scene, OccupancyIndex):
+        return scene
+    return getattr(scene, "occupancy", None)
+
+
 def iter_blocking_entities(scene, ignore=None):
     """Итерирует по всем блокирующим сущностям на сцене."""
     if scene is None:
         return
 
+    occupancy = get_occupancy(scene)
+    if occupancy is not None:
+        yield from occupancy.entities(ignore=ignore)
+        return
+
     sprite_lists = getattr(scene, "sprite_lists", None)
     if sprite_lists:
         for sprites in sprite_lists.values():
@@ -55,8 +151,13 @@ def iter_blocking_entities(scene, ignore=None):
 def get_blocking_entity(scene, tx: int, ty: int, ignore=None):
     """
     Ищет и возвращает первую блокирующую сущность на указанном тайле.
-    Ищем по всем спискам спрайтов в scene (если есть атрибут sprite_lists) или через known names.
+    Если у сцены есть индекс занятости — O(1) поиск, иначе перебор
+    всех списков спрайтов в scene (атрибут sprite_lists) или known names.
     """
+    occupancy = get_occupancy(scene)
+    if occupancy is not None:
+        return occupancy.get(tx, ty, ignore=ignore)
+
     for entity in iter_blocking_entities(scene, ignore=ignore):
         if getattr(entity, "tile_x", None) == tx and getattr(entity, "tile_y", None) == ty:
             return entity
@@ -95,15 +196,19 @@ def commit_tile(entity, tx: int, ty: int) -> bool:
     """
     Резервирует тайл для сущности — обновляет tile_x/tile_y без изменения center_x/center_y.
     Это позволяет начать анимацию перемещения, при этом тайл считается занятым.
+    Тайл, занятый в индексе другой сущностью, не резервируется (возвращается False).
     """
     if entity is None:
         return False
+    occupancy = getattr(entity, "occupancy", None)
     try:
-        entity.tile_x = int(tx)
-        entity.tile_y = int(ty)
-        return True
+        tile = (int(tx), int(ty))
+        if occupancy is not None and entity in occupancy and not occupancy.move(entity, *tile):
+            return False
+        entity.tile_x, entity.tile_y = tile
     except Exception:
         return False
+    return True
 
 
 def attempt_move(entity, dx: int, dy: int, level, scene) -> tuple[MoveResult, object | None]:
@@ -118,9 +223,9 @@ def attempt_move(entity, dx: int, dy: int, level, scene) -> tuple[MoveResult, ob
         return res, blocker
 
     # Коммит перемещения: обновим tile и мировые координаты
+    if not commit_tile(entity, target_tx, target_ty):
+        return MoveResult.BLOCKED_WALL, None
     try:
-        entity.tile_x = target_tx
-        entity.tile_y = target_ty
         # Пытаемся получить TILE_SIZE из Settings
         try:
             from sv.core import Settings
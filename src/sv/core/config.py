@@ -4,3 +4,12 @@ class Settings:
         self.screen_width = 1280
         self.screen_height = 720
         self.title = "Shardveil"
+        # Зерно забега: None — случайное; одинаковое зерно повторяет все этажи
+        self.seed: int | None = None
+        # Враги решают ход одновременно и анимируются параллельно, а не по очереди
+        self.simultaneous_enemy_turns = True
+        # Ускорение анимаций, пока ни один враг не встревожен и не видит игрока
+        self.fast_forward = True
+        self.fast_forward_move_duration = 0.04
+        # Автосохранение при спуске на новый этаж
+        self.autosave = True
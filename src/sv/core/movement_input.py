@@ -26,6 +26,10 @@ class MovementInputState:
     def __post_init__(self) -> None:
         self._directional_keys = set(self.horizontal_bindings) | set(self.vertical_bindings)
 
+    @property
+    def has_pressed_keys(self) -> bool:
+        return bool(self._pressed_keys)
+
     def press(self, symbol: int, now: float) -> None:
         if symbol not in self._directional_keys:
             return
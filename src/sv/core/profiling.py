@@ -0,0 +1,301 @@
+"""
+Профилирование cProfile: весь процесс или только выбранные фазы, ограниченное
+числом кадров или ходов. При остановке пишет pstats, свёрнутые стеки для
+флейм-графов (рядом, с суффиксом .folded) и печатает самые дорогие функции.
+
+Профилировщик один на процесс, как и трассировка (sv.core.trace):
+
+    with profiling.phase("enemy_turns"):
+        ...
+    profiling.step("turn")
+"""
+
+import atexit
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from pathlib import Path
+
+# Фазы, которые можно профилировать выборочно
+PHASE_PLAYER_TURN = "player_turn"
+PHASE_ENEMY_TURNS = "enemy_turns"
+PHASE_GENERATION = "generation"
+PHASES = (PHASE_PLAYER_TURN, PHASE_ENEMY_TURNS, PHASE_GENERATION)
+
+DEFAULT_TOP = 25
+# Поддеревья дешевле этого (мкс) в свёрнутые стеки не попадают
+FOLDED_MIN_US = 1.0
+FOLDED_MAX_DEPTH = 128
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("_profiler",)
+
+    def __init__(self, profiler: "Profiler"):
+        self._profiler = profiler
+
+    def __enter__(self):
+        self._profiler._enter_phase()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler._exit_phase()
+        return False
+
+
+class Profiler:
+    """
+    Профиль cProfile на каждый поток (cProfile не умеет профилировать чужие потоки),
+    при записи профили складываются. Без phases поток, вызвавший start(), профилируется
+    целиком, а в остальных потоках (например, подготовка этажа в фоне) — участки любых
+    phase(); с phases — только код внутри phase() с этими именами, в любом потоке.
+    limit — сколько шагов step(unit) собирать, None — до остановки.
+    """
+
+    def __init__(self, path, limit: int | None = None, phases=(), unit: str = "frame", top: int = DEFAULT_TOP):
+        unknown = set(phases) - set(PHASES)
+        if unknown:
+            raise ValueError(f"unknown profiling phases: {', '.join(sorted(unknown))}")
+        self.path = Path(path)
+        self.limit = limit
+        self.phases = frozenset(phases)
+        self.unit = unit
+        self.top = int(top)
+        self.steps = 0
+        self.done = False
+        self._owner = threading.get_ident()
+        self._lock = threading.Lock()
+        self._profiles: dict[int, cProfile.Profile] = {}
+        self._depth: dict[int, int] = {}
+        self._enabled: set[int] = set()
+        self._running = False
+
+    def _profile(self) -> cProfile.Profile:
+        ident = threading.get_ident()
+        with self._lock:
+            profile = self._profiles.get(ident)
+            if profile is None:
+                profile = self._profiles[ident] = cProfile.Profile()
+        return profile
+
+    def start(self) -> None:
+        if not self.phases and not self.done and not self._running:
+            self._profile().enable()
+            self._running = True
+
+    def phase(self, name: str):
+        """Участок фазы name; профилируется, если фаза выбрана и лимит не исчерпан."""
+        if self.done:
+            return _NULL_PHASE
+        if self.phases:
+            return _Phase(self) if name in self.phases else _NULL_PHASE
+        # Весь процесс: поток владельца и так профилируется целиком
+        if threading.get_ident() == self._owner:
+            return _NULL_PHASE
+        return _Phase(self)
+
+    def _enter_phase(self) -> None:
+        ident = threading.get_ident()
+        depth = self._depth.get(ident, 0)
+        self._depth[ident] = depth + 1
+        if depth == 0:
+            try:
+                self._profile().enable()
+            except ValueError:
+                # Другой профилировщик уже активен (Python 3.12+): фаза в этом потоке пропускается
+                return
+            self._enabled.add(ident)
+
+    def _exit_phase(self) -> None:
+        ident = threading.get_ident()
+        depth = self._depth[ident] - 1
+        self._depth[ident] = depth
+        if depth == 0 and ident in self._enabled:
+            self._enabled.discard(ident)
+            self._profiles[ident].disable()
+
+    def step(self, unit: str) -> None:
+        """Отмечает завершённый кадр или ход; по достижении limit сбор прекращается."""
+        if unit != self.unit or self.done:
+            return
+        self.steps += 1
+        if self.limit is not None and self.steps >= self.limit:
+            self.finish_collecting()
+
+    def finish_collecting(self) -> None:
+        """Прекращает сбор; профиль остаётся в памяти до write()."""
+        self.done = True
+        if self._running and threading.get_ident() == self._owner:
+            self._profiles[self._owner].disable()
+            self._running = False
+
+    def stats(self) -> pstats.Stats | None:
+        """Сумма профилей всех потоков; None, если ничего не собрано."""
+        self.finish_collecting()
+        stats = None
+        for profile in list(self._profiles.values()):
+            thread_stats = pstats.Stats(profile, stream=io.StringIO())
+            if not thread_stats.stats:
+                continue
+            if stats is None:
+                stats = thread_stats
+            else:
+                stats.add(thread_stats)
+        return stats
+
+    def write(self, stream=None) -> Path | None:
+        """Пишет path (pstats) и path.folded, печатает top функций по собственному времени."""
+        stats = self.stats()
+        stream = stream if stream is not None else sys.stderr
+        if stats is None:
+            print(f"profile: nothing collected for {self.path}", file=stream)
+            return None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(self.path)
+        folded_path = folded_stacks_path(self.path)
+        folded_path.write_text("".join(f"{line}\n" for line in collapsed_stacks(stats)), encoding="utf-8")
+
+        scope = ", ".join(sorted(self.phases)) if self.phases else "all"
+        print(
+            f"profile: {self.steps} {self.unit}(s), phases={scope} -> {self.path}, {folded_path}",
+            file=stream,
+        )
+        stats.stream = stream
+        stats.sort_stats(pstats.SortKey.TIME, pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        return self.path
+
+
+def folded_stacks_path(path) -> Path:
+    return Path(path).with_suffix(".folded")
+
+
+def _label(func) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """
+    Свёрнутые стеки «корень;...;лист мкс» для flamegraph.pl / speedscope.
+
+    cProfile хранит только рёбра вызывающий → вызываемый, а не полные стеки, поэтому
+    стеки восстанавливаются приближённо: время функции делится между вызывающими
+    пропорционально их доле совокупного времени. Рекурсия обрывается на повторе
+    функции в стеке.
+    """
+    entries = stats.stats
+    callees: dict[tuple, list[tuple[tuple, float]]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    totals: dict[str, float] = {}
+
+    def walk(func, stack: list[str], on_stack: set, share: float) -> None:
+        _cc, _nc, tt, ct, _callers = entries[func]
+        stack.append(_label(func))
+        on_stack.add(func)
+        self_us = tt * share * 1e6
+        if self_us >= FOLDED_MIN_US:
+            key = ";".join(stack)
+            totals[key] = totals.get(key, 0.0) + self_us
+        if len(stack) < FOLDED_MAX_DEPTH:
+            for callee, edge_ct in callees.get(func, ()):
+                callee_ct = entries[callee][3]
+                if callee in on_stack or callee_ct <= 0:
+                    continue
+                child_share = share * edge_ct / callee_ct
+                if edge_ct * share * 1e6 >= FOLDED_MIN_US:
+                    walk(callee, stack, on_stack, child_share)
+        on_stack.discard(func)
+        stack.pop()
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    for root in roots:
+        walk(root, [], set(), 1.0)
+    return [f"{key} {round(value)}" for key, value in totals.items() if round(value) > 0]
+
+
+def add_arguments(parser, unit: str) -> None:
+    """Добавляет в argparse-парсер флаги --profile, --profile-<unit>s, --profile-phase и --profile-top."""
+    parser.add_argument("--profile", type=Path, metavar="OUT.pstats", help="profile with cProfile and write pstats on exit")
+    parser.add_argument(
+        f"--profile-{unit}s",
+        dest="profile_limit",
+        type=int,
+        metavar="N",
+        help=f"stop profiling after N {unit}s",
+    )
+    parser.add_argument(
+        "--profile-phase",
+        action="append",
+        choices=PHASES,
+        default=[],
+        help="profile only inside this phase (repeatable)",
+    )
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP, metavar="N", help="hotspots to print on exit")
+
+
+def start_from_args(args, unit: str) -> Profiler | None:
+    """Включает профилирование по флагам из add_arguments, если задан --profile."""
+    if args.profile is None:
+        return None
+    return start(args.profile, args.profile_limit, args.profile_phase, unit, args.profile_top)
+
+
+_profiler: Profiler | None = None
+
+
+def start(path, limit: int | None = None, phases=(), unit: str = "frame", top: int = DEFAULT_TOP) -> Profiler:
+    """Включает профилирование процесса; при выходе профиль будет записан."""
+    global _profiler
+    if _profiler is None:
+        atexit.register(stop)
+    _profiler = Profiler(path, limit, phases, unit, top)
+    _profiler.start()
+    return _profiler
+
+
+def active() -> Profiler | None:
+    return _profiler
+
+
+def phase(name: str):
+    """Участок фазы для выборочного профилирования или пустой менеджер."""
+    profiler = _profiler
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
+
+
+def step(unit: str) -> None:
+    profiler = _profiler
+    if profiler is not None:
+        profiler.step(unit)
+
+
+def stop(stream=None) -> Path | None:
+    """Выключает профилирование и записывает результат; повторный вызов ничего не делает."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    return profiler.write(stream)
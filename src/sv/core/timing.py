@@ -0,0 +1,135 @@
+"""Замеры времени фаз кадра в кольцевых буферах фиксированного размера."""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import trace
+
+
+class RingBuffer:
+    """Последние capacity значений; запись без выделения памяти."""
+
+    __slots__ = ("_values", "_index", "_count")
+
+    def __init__(self, capacity: int = 240):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._values = np.zeros(int(capacity), dtype=np.float64)
+        self._index = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, value: float) -> None:
+        self._values[self._index] = value
+        self._index = (self._index + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+
+    def values(self) -> np.ndarray:
+        """Сохранённые значения от старых к новым (копия)."""
+        if self._count < len(self._values):
+            return self._values[: self._count].copy()
+        return np.roll(self._values, -self._index)
+
+    def clear(self) -> None:
+        self._index = 0
+        self._count = 0
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseStats:
+    """Перцентили длительности фазы в миллисекундах."""
+
+    p50: float
+    p95: float
+    max: float
+    samples: int
+
+
+class _Span:
+    """
+    Контекстный менеджер одной фазы; переиспользуется, вложенные замеры одной фазы
+    не поддерживаются. При включённой трассировке фаза попадает и в неё.
+    """
+
+    __slots__ = ("_name", "_buffer", "_started")
+
+    def __init__(self, name: str, buffer: RingBuffer):
+        self._name = name
+        self._buffer = buffer
+        self._started = 0
+
+    def __enter__(self):
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter_ns() - self._started
+        self._buffer.push(duration / 1e9)
+        tracer = trace.active()
+        if tracer is not None:
+            tracer.complete(self._name, "frame", self._started, duration)
+        return False
+
+
+class FrameTimings:
+    """
+    Длительности фаз кадра (секунды) в кольцевых буферах по capacity замеров.
+    Пока enabled=False, span() ничего не пишет в буферы и возвращает участок трассировки
+    (sv.core.trace) — общий пустой менеджер, если и она выключена, так что выключенные
+    замеры стоят один вызов метода.
+    """
+
+    def __init__(self, capacity: int = 240, enabled: bool = False):
+        self.capacity = int(capacity)
+        self.enabled = bool(enabled)
+        self._buffers: dict[str, RingBuffer] = {}
+        self._spans: dict[str, _Span] = {}
+
+    def buffer(self, name: str) -> RingBuffer:
+        buffer = self._buffers.get(name)
+        if buffer is None:
+            buffer = self._buffers[name] = RingBuffer(self.capacity)
+        return buffer
+
+    def span(self, name: str):
+        """Замер фазы name: `with timings.span("draw"): ...`."""
+        if not self.enabled:
+            return trace.span(name, "frame")
+        span = self._spans.get(name)
+        if span is None:
+            span = self._spans[name] = _Span(name, self.buffer(name))
+        return span
+
+    def record(self, name: str, seconds: float) -> None:
+        """Добавляет готовый замер (например, delta_time кадра)."""
+        if self.enabled:
+            self.buffer(name).push(seconds)
+
+    @property
+    def phases(self) -> list[str]:
+        """Фазы в порядке первого замера."""
+        return list(self._buffers)
+
+    def stats(self) -> dict[str, PhaseStats]:
+        """p50/p95/max по каждой фазе в миллисекундах; фазы без замеров пропускаются."""
+        result = {}
+        for name, buffer in self._buffers.items():
+            values = buffer.values()
+            if len(values) == 0:
+                continue
+            p50, p95 = np.percentile(values, (50, 95)) * 1000.0
+            result[name] = PhaseStats(float(p50), float(p95), float(values.max() * 1000.0), len(values))
+        return result
+
+    def clear(self) -> None:
+        for buffer in self._buffers.values():
+            buffer.clear()
@@ -0,0 +1,188 @@
+"""
+Трассировка в формате Chrome trace-event JSON (открывается в Perfetto / chrome://tracing).
+
+Трассировщик один на процесс: start() включает его, span() размечает участки кода,
+flush() пишет накопленные в памяти события в файл. Пока трассировка выключена,
+span() возвращает общий пустой менеджер контекста.
+
+    with trace.span("decide_enemy_action", "ai") as span:
+        action = decide(...)
+        if span:
+            span.annotate(kind=action.kind)
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Переменная окружения с путём файла трассировки
+TRACE_ENV = "SV_TRACE"
+# Предел событий в памяти; сверх него события отбрасываются и считаются
+DEFAULT_MAX_EVENTS = 2_000_000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __bool__(self) -> bool:
+        return False
+
+    def annotate(self, **args) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class TraceSpan:
+    """Участок с началом и длительностью; annotate() добавляет аргументы события."""
+
+    __slots__ = ("_tracer", "name", "cat", "args", "_started")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str):
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args: dict | None = None
+        self._started = 0
+
+    def __enter__(self):
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tracer.complete(self.name, self.cat, self._started, time.perf_counter_ns() - self._started, self.args)
+        return False
+
+    def __bool__(self) -> bool:
+        return True
+
+    def annotate(self, **args) -> None:
+        if self.args is None:
+            self.args = args
+        else:
+            self.args.update(args)
+
+
+class Tracer:
+    """Копит события «X» (начало и длительность) в памяти; потоки различаются по tid."""
+
+    def __init__(self, path, max_events: int = DEFAULT_MAX_EVENTS):
+        self.path = Path(path)
+        self.max_events = int(max_events)
+        self.dropped = 0
+        # (name, cat, начало нс, длительность нс, tid, args)
+        self._events: list[tuple] = []
+        self._threads: dict[int, str] = {}
+        self._origin = time.perf_counter_ns()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def span(self, name: str, cat: str = "app") -> TraceSpan:
+        return TraceSpan(self, name, cat)
+
+    def complete(self, name: str, cat: str, start_ns: int, duration_ns: int, args: dict | None = None) -> None:
+        """Добавляет завершённый участок; время — time.perf_counter_ns()."""
+        if len(self._events) >= self.max_events:
+            self.dropped += 1
+            return
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if tid not in self._threads:
+            self._threads[tid] = thread.name
+        self._events.append((name, cat, start_ns, duration_ns, tid, args))
+
+    def trace_events(self) -> list[dict]:
+        """События в формате Chrome trace-event (микросекунды от запуска трассировки)."""
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._threads.items()
+        ]
+        origin = self._origin
+        for name, cat, start_ns, duration_ns, tid, args in list(self._events):
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start_ns - origin) / 1000.0,
+                "dur": duration_ns / 1000.0,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+    def write(self, path=None) -> Path:
+        """Атомарно записывает трассировку в path (по умолчанию — self.path)."""
+        path = Path(path) if path is not None else self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+        fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as stream:
+                json.dump(data, stream, separators=(",", ":"))
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        return path
+
+
+_tracer: Tracer | None = None
+
+
+def start(path, max_events: int = DEFAULT_MAX_EVENTS) -> Tracer:
+    """Включает трассировку процесса; при выходе из интерпретатора она будет записана."""
+    global _tracer
+    if _tracer is None:
+        atexit.register(stop)
+    _tracer = Tracer(path, max_events)
+    return _tracer
+
+
+def start_from_env() -> Tracer | None:
+    """Включает трассировку, если задана переменная окружения SV_TRACE."""
+    path = os.environ.get(TRACE_ENV)
+    return start(path) if path else None
+
+
+def active() -> Tracer | None:
+    return _tracer
+
+
+def span(name: str, cat: str = "app"):
+    """Участок трассировки или пустой менеджер, если трассировка выключена."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return TraceSpan(tracer, name, cat)
+
+
+def stop() -> Path | None:
+    """Выключает трассировку и записывает накопленное; повторный вызов ничего не делает."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return None
+    return tracer.write()
@@ -0,0 +1,111 @@
+"""Централизованная анимация перемещений: все активные твины в массивах numpy."""
+
+import numpy as np
+
+
+def ease_out_quad(t: np.ndarray) -> np.ndarray:
+    """Квадратичное ease-out: t' = 1 - (1-t)^2."""
+    return 1.0 - (1.0 - t) * (1.0 - t)
+
+
+class TweenManager:
+    """
+    Активные перемещения сущностей: начало, конец, прошедшее время и длительность
+    хранятся в массивах, кадр продвигает и сглаживает их одной векторной операцией.
+
+    Entity.start_move регистрирует твин, смерть сущности снимает его. Завершённые
+    твины удаляются из массивов до вызова хуков, поэтому хук может сразу запустить
+    новое перемещение (оно начнётся со следующего кадра).
+    """
+
+    def __init__(self, capacity: int = 16):
+        capacity = max(1, int(capacity))
+        self._start = np.zeros((capacity, 2), dtype=np.float64)
+        self._end = np.zeros((capacity, 2), dtype=np.float64)
+        self._elapsed = np.zeros(capacity, dtype=np.float64)
+        self._duration = np.ones(capacity, dtype=np.float64)
+        self._entities: list = []
+        self._slot: dict[int, int] = {}
+
+    def attach(self, entity) -> None:
+        """Подключает сущность: её start_move будет регистрировать твин здесь."""
+        entity.tweens = self
+
+    def start(self, entity, start: tuple[float, float], end: tuple[float, float], duration: float) -> None:
+        """Запускает (или перезапускает) твин сущности от start до end за duration секунд."""
+        index = self._slot.get(id(entity))
+        if index is None:
+            index = len(self._entities)
+            if index == len(self._elapsed):
+                self._grow()
+            self._entities.append(entity)
+            self._slot[id(entity)] = index
+        self._start[index] = start
+        self._end[index] = end
+        self._elapsed[index] = 0.0
+        self._duration[index] = max(1e-6, float(duration))
+
+    def discard(self, entity) -> None:
+        """Снимает твин без вызова хука завершения."""
+        index = self._slot.get(id(entity))
+        if index is not None:
+            self._remove_slots(np.array([index]))
+
+    def clear(self) -> None:
+        self._entities.clear()
+        self._slot.clear()
+
+    def __contains__(self, entity) -> bool:
+        return id(entity) in self._slot
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def update(self, delta_time: float, zoom: float | None = None) -> None:
+        """Продвигает все твины, записывает позиции и вызывает хуки завершённых."""
+        count = len(self._entities)
+        if count == 0:
+            return
+
+        elapsed = self._elapsed[:count]
+        elapsed += max(0.0, float(delta_time))
+        t = np.minimum(1.0, elapsed / self._duration[:count])
+        start = self._start[:count]
+        end = self._end[:count]
+        positions = start + (end - start) * ease_out_quad(t)[:, None]
+        if zoom is not None and zoom > 0:
+            positions = np.round(positions * zoom) / zoom
+        done = t >= 1.0
+        # Завершённые ставятся точно в цель, без привязки к пиксельной сетке
+        positions[done] = end[done]
+
+        for entity, (x, y) in zip(self._entities, positions.tolist()):
+            entity.position = (x, y)
+
+        if not done.any():
+            return
+        finished_slots = np.flatnonzero(done)
+        finished = [self._entities[index] for index in finished_slots]
+        self._remove_slots(finished_slots)
+        for entity in finished:
+            entity.finish_move()
+
+    def _grow(self) -> None:
+        capacity = len(self._elapsed) * 2
+        for name in ("_start", "_end", "_elapsed", "_duration"):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def _remove_slots(self, slots: np.ndarray) -> None:
+        """Уплотняет массивы, сохраняя порядок оставшихся твинов."""
+        count = len(self._entities)
+        keep = np.ones(count, dtype=bool)
+        keep[slots] = False
+        kept = np.flatnonzero(keep)
+        for name in ("_start", "_end", "_elapsed", "_duration"):
+            array = getattr(self, name)
+            array[: len(kept)] = array[kept]
+        self._entities = [self._entities[index] for index in kept]
+        self._slot = {id(entity): index for index, entity in enumerate(self._entities)}
@@ -2,6 +2,8 @@ import arcade
 from sv.core import Settings
 
 TILE_SIZE = Settings.TILE_SIZE
+# Длительность анимации шага по умолчанию, секунды
+MOVE_DURATION = 0.18
 
 class Entity(arcade.Sprite):
     """Базовая сущность игрового мира"""
@@ -19,15 +21,19 @@ class Entity(arcade.Sprite):
 
         # По умолчанию сущность блокирует движение (предметы могут быть non-blocking)
         self.blocking = bool(blocking)
+        # Индекс занятости тайлов (sv.core.collision.OccupancyIndex), если сущность в нём
+        self.occupancy = None
 
         # --- Новые атрибуты для анимированного перемещения ---
         self.moving = False
         self._move_from = (self.center_x, self.center_y)
         self._move_to = (self.center_x, self.center_y)
         self._move_elapsed = 0.0
-        self._move_duration = 0.18  # секунда по умолчанию
+        self._move_duration = MOVE_DURATION
         # hook, вызывается когда анимация перемещения завершена
         self.on_move_complete = None
+        # Менеджер твинов (sv.core.tween.TweenManager); без него анимация считается в update
+        self.tweens = None
 
     def move_to(self, tile_x: int, tile_y: int):
         """Прямое перемещение сущности в тайловых координатах (без проверок)."""
@@ -35,6 +41,8 @@ class Entity(arcade.Sprite):
         self.tile_y = int(tile_y)
         self.center_x = self.tile_x * TILE_SIZE + TILE_SIZE // 2
         self.center_y = self.tile_y * TILE_SIZE + TILE_SIZE // 2
+        if self.occupancy is not None:
+            self.occupancy.move(self, self.tile_x, self.tile_y)
 
     def start_move(self, target_tile_x: int, target_tile_y: int, duration: float | None = None):
         """
@@ -49,6 +57,8 @@ class Entity(arcade.Sprite):
         self._move_from = (self.center_x, self.center_y)
         self._move_to = (target_tile_x * TILE_SIZE + TILE_SIZE // 2,
                          target_tile_y * TILE_SIZE + TILE_SIZE // 2)
+        if self.tweens is not None:
+            self.tweens.start(self, self._move_from, self._move_to, self._move_duration)
 
     def attempt_move(self, dx: int, dy: int, level, scene):
         """Попытка перемещения: использует разделённый can_move/commit_tile чтобы запустить анимацию вместо мгновенного перемещения."""
@@ -77,12 +87,16 @@ class Entity(arcade.Sprite):
             self.die()
 
     def die(self):
+        if self.occupancy is not None:
+            self.occupancy.remove(self)
+        if self.tweens is not None:
+            self.tweens.discard(self)
         self.remove_from_sprite_lists()
 
     def update(self, *args, **kwargs):
         # Совместимая сигнатура с arcade.Sprite.update
-        # Обновляем анимацию позиционирования, если мы в движении
-        if self.moving:
+        # Обновляем анимацию позиционирования, если мы в движении и её не ведёт TweenManager
+        if self.moving and self.tweens is None:
             # delta_time may be passed as first positional arg in some arcade versions
             delta_time = 1/60
             if len(args) > 0 and isinstance(args[0], (int, float)):
@@ -98,19 +112,20 @@ class Entity(arcade.Sprite):
             self.center_y = sy + (ey - sy) * tt
 
             if t >= 1.0:
-                # Завершили перемещение: гарантированно ставим в целевые мировые координаты
-                self.center_x = ex
-                self.center_y = ey
-                self.moving = False
-                # Вызов хуков
-                try:
-                    if callable(self.on_move_complete):
-                        self.on_move_complete()
-                except Exception:
-                    pass
+                self.finish_move()
         # вызов базового обновления
         super().update(*args, **kwargs)
 
+    def finish_move(self):
+        """Завершает перемещение: ставит в целевые мировые координаты и вызывает хук."""
+        self.center_x, self.center_y = self._move_to
+        self.moving = False
+        try:
+            if callable(self.on_move_complete):
+                self.on_move_complete()
+        except Exception:
+            pass
+
     def take_turn(self):
         """Метод, вызываемый, когда наступает ход сущности. Основная игровая логика."""
         pass # Реализация в дочерних классах
@@ -190,6 +205,9 @@ class Enemy(Entity):
         self.is_alerted = False
         self.last_seen_player_tile: tuple[int, int] | None = None
         self.search_turns_left = 0
+        # Сохранённый путь к last_seen_player_tile (переиспользуется, пока цель не изменилась)
+        self.cached_path: list[tuple[int, int]] = []
+        self.cached_path_goal: tuple[int, int] | None = None
 
     def take_turn(self):
         """Ход врага: немедленно выполняет логику ИИ."""
@@ -0,0 +1,4 @@
+"""Headless turn simulation (no rendering)."""
+from .actors import Actor, EnemyActor, PlayerActor
+from .engine import AttackEvent, MoveEvent, SimulationEngine, TurnResult, pick_spawn_tiles
+from .travel import AutoTravel
@@ -0,0 +1,5 @@
+import sys
+
+from sv.sim.runner import main
+
+sys.exit(main())
@@ -0,0 +1,81 @@
+"""Сущности без отрисовки для безоконной симуляции."""
+
+
+class Actor:
+    """Игровая сущность: тайловая позиция, здоровье и бой, без arcade.Sprite."""
+
+    def __init__(self, tile_x: int, tile_y: int, hp: int = 1, blocking: bool = True):
+        self.hp = hp
+        self.max_hp = hp
+        self.tile_x = int(tile_x)
+        self.tile_y = int(tile_y)
+        self.blocking = bool(blocking)
+        self.occupancy = None
+        self.removed = False
+
+    def move_to(self, tile_x: int, tile_y: int):
+        """Прямое перемещение сущности в тайловых координатах (без проверок)."""
+        self.tile_x = int(tile_x)
+        self.tile_y = int(tile_y)
+        if self.occupancy is not None:
+            self.occupancy.move(self, self.tile_x, self.tile_y)
+
+    def take_damage(self, amount: int):
+        self.hp -= amount
+        if self.hp <= 0:
+            self.die()
+
+    def die(self):
+        if self.occupancy is not None:
+            self.occupancy.remove(self)
+        self.removed = True
+
+    def attack(self, target: "Actor", damage: int = 1):
+        """Наносит урон другой сущности (по умолчанию 1)."""
+        if target is None or target is self:
+            return
+        if not isinstance(target, Actor):
+            return
+        target.take_damage(damage)
+
+
+class PlayerActor(Actor):
+    """Игрок для симуляции: здоровье и запас света как у Player."""
+
+    def __init__(self, tile_x: int, tile_y: int):
+        super().__init__(tile_x, tile_y, hp=10, blocking=True)
+        self.light_max = 10
+        self.light = 10
+
+    def spend_light(self, amount: int = 1) -> int:
+        """Тратит свет и возвращает фактически потраченное количество."""
+        amount = max(0, int(amount))
+        spent = min(self.light, amount)
+        self.light -= spent
+        return spent
+
+    def recover_light(self, amount: int = 1) -> int:
+        """Восстанавливает свет и возвращает фактически восстановленное количество."""
+        amount = max(0, int(amount))
+        before = self.light
+        self.light = min(self.light_max, self.light + amount)
+        return self.light - before
+
+    def light_ratio(self) -> float:
+        if self.light_max <= 0:
+            return 0.0
+        return max(0.0, min(1.0, self.light / self.light_max))
+
+
+class EnemyActor(Actor):
+    """Враг для симуляции: поля ИИ как у Enemy."""
+
+    def __init__(self, tile_x: int, tile_y: int, hp: int = 4):
+        super().__init__(tile_x, tile_y, hp=hp, blocking=True)
+        self.notice_radius = 8
+        self.search_turn_limit = 3
+        self.is_alerted = False
+        self.last_seen_player_tile: tuple[int, int] | None = None
+        self.search_turns_left = 0
+        self.cached_path: list[tuple[int, int]] = []
+        self.cached_path_goal: tuple[int, int] | None = None
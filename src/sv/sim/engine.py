@@ -0,0 +1,328 @@
+"""Пошаговый движок без отрисовки: уровень, сущности и порядок ходов."""
+
+import random
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from sv.ai.chase_map import ChaseMaps
+from sv.ai.enemy_ai import decide_enemy_action, retry_enemy_move
+from sv.ai.perception import PlayerPerception, max_notice_radius
+from sv.core import profiling, trace
+from sv.core.collision import MoveResult, OccupancyIndex, can_move, commit_tile
+from sv.world.level_grid import LevelGrid, as_level_grid
+from sv.world.tiles import WALKABLE
+
+# Радиус, в котором игрок открывает карту (исследованные тайлы)
+SIGHT_RADIUS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class MoveEvent:
+    entity: object
+    from_tile: tuple[int, int]
+    to_tile: tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class AttackEvent:
+    attacker: object
+    target: object
+
+
+@dataclass(slots=True)
+class TurnResult:
+    """Итог действия игрока: ход засчитан (acted) и события игрока и врагов по порядку."""
+
+    acted: bool = False
+    move_result: MoveResult | None = None
+    player_events: list = field(default_factory=list)
+    enemy_events: list = field(default_factory=list)
+
+
+def pick_spawn_tiles(
+    level,
+    count: int,
+    exclude=(),
+    rng: random.Random | None = None,
+) -> list[tuple[int, int]]:
+    """Выбирает count различных проходимых тайлов, не входящих в exclude."""
+    rng = rng if rng is not None else random
+    excluded = set(exclude)
+    candidates = [xy for xy in as_level_grid(level).positions_of(WALKABLE) if xy not in excluded]
+    return rng.sample(candidates, min(count, len(candidates)))
+
+
+class SimulationEngine:
+    """
+    Владеет уровнем, игроком, врагами и очередностью ходов; не зависит от отрисовки.
+    Работает с любыми сущностями с полями tile_x/tile_y/hp/blocking (Entity или sv.sim.actors).
+    Ход разрешается синхронно: действие игрока, затем ходы всех живых врагов.
+
+    simultaneous=True включает одновременное разрешение ходов врагов: все решения
+    принимаются по расстановке на начало хода, затем перемещения применяются
+    через индекс занятости как таблицу резервирования (см. run_enemy_turns).
+    """
+
+    def __init__(self, level, player, enemies=(), simultaneous: bool = False):
+        self.level: LevelGrid = as_level_grid(level)
+        self.player = player
+        self.enemies: list = list(enemies)
+        self.occupancy = OccupancyIndex([player, *self.enemies])
+        self.perception = PlayerPerception()
+        self.simultaneous = bool(simultaneous)
+        self.turn = 0
+        # Тайлы, которые игрок уже видел; explored_version растёт при каждом открытии новых
+        self.explored = np.zeros(self.level.shape, dtype=bool)
+        self.explored_version = 0
+        self.reveal()
+
+    @property
+    def is_over(self) -> bool:
+        return self.player is None or self.player.hp <= 0
+
+    def living_enemies(self) -> list:
+        return [enemy for enemy in self.enemies if enemy.hp > 0]
+
+    def reveal(self) -> None:
+        """Отмечает исследованными тайлы в поле зрения игрока."""
+        if self.player is None:
+            return
+        visible = self.perception.update(self.level, self.player, SIGHT_RADIUS)
+        window = self.perception.window
+        if visible is None or window is None:
+            return
+        explored = window.crop(self.explored)
+        if (visible & ~explored).any():
+            explored |= visible
+            self.explored_version += 1
+
+    def restore_explored(self, explored) -> None:
+        """Добавляет сохранённую маску исследованных тайлов (например, из сохранения)."""
+        explored = np.asarray(explored, dtype=bool)
+        if explored.shape != self.explored.shape:
+            raise ValueError(f"explored mask shape {explored.shape} does not match level {self.explored.shape}")
+        self.explored |= explored
+        self.explored_version += 1
+
+    def is_quiet(self) -> bool:
+        """Нет встревоженных врагов и ни один враг не видит игрока: можно ускорять ходы."""
+        if self.is_over:
+            return False
+        for enemy in self.enemies:
+            if enemy.hp <= 0:
+                continue
+            if enemy.is_alerted or self.perception.can_see(enemy, self.player, self.level):
+                return False
+        return True
+
+    def add_enemy(self, enemy) -> None:
+        self.enemies.append(enemy)
+        self.occupancy.add(enemy)
+
+    def try_move(self, entity, dx: int, dy: int) -> tuple[MoveResult, object | None]:
+        """
+        Перемещение с fallback по осям при диагональном столкновении со стеной.
+        Тайл сразу резервируется (commit_tile); мировые координаты не меняются.
+        """
+        result, blocker = self._move(entity, dx, dy)
+        if result == MoveResult.MOVED:
+            return result, blocker
+        if dx != 0 and dy != 0 and result == MoveResult.BLOCKED_WALL:
+            result, blocker = self._move(entity, dx, 0)
+            if result == MoveResult.MOVED:
+                return result, blocker
+            return self._move(entity, 0, dy)
+        return result, blocker
+
+    def _move(self, entity, dx: int, dy: int) -> tuple[MoveResult, object | None]:
+        result, blocker, target_x, target_y = can_move(entity, dx, dy, self.level, self.occupancy)
+        if result != MoveResult.MOVED:
+            return result, blocker
+        if not commit_tile(entity, target_x, target_y):
+            return MoveResult.BLOCKED_WALL, None
+        return MoveResult.MOVED, None
+
+    def player_move(self, dx: int, dy: int) -> TurnResult:
+        """Действие игрока в направлении (dx, dy): шаг или атака. Удар в стену ход не тратит."""
+        with trace.span("player_move", "turn"), profiling.phase(profiling.PHASE_PLAYER_TURN):
+            result = TurnResult()
+            if self.is_over:
+                return result
+
+            from_tile = (self.player.tile_x, self.player.tile_y)
+            move_result, blocker = self.try_move(self.player, dx, dy)
+            result.move_result = move_result
+            if move_result == MoveResult.BLOCKED_WALL:
+                return result
+
+            result.acted = True
+            if move_result == MoveResult.BLOCKED_ENTITY:
+                if blocker is not None and hasattr(self.player, "attack"):
+                    self.player.attack(blocker)
+                    result.player_events.append(AttackEvent(self.player, blocker))
+            else:
+                result.player_events.append(
+                    MoveEvent(self.player, from_tile, (self.player.tile_x, self.player.tile_y))
+                )
+                self.reveal()
+            self._spend_light(1)
+            return result
+
+    def player_wait(self) -> TurnResult:
+        """Пропуск хода: восстанавливает немного света."""
+        with trace.span("player_wait", "turn"), profiling.phase(profiling.PHASE_PLAYER_TURN):
+            if self.is_over:
+                return TurnResult()
+            recover = getattr(self.player, "recover_light", None)
+            if callable(recover):
+                recover(2)
+            return TurnResult(acted=True)
+
+    def run_enemy_turns(self) -> list:
+        """Ходы всех живых врагов. Возвращает события в порядке применения."""
+        with trace.span("enemy_turns", "turn") as span, profiling.phase(profiling.PHASE_ENEMY_TURNS):
+            if span:
+                span.annotate(turn=self.turn, enemies=len(self.enemies))
+            events: list = []
+            self.enemies = self.living_enemies()
+            if self.is_over or not self.enemies:
+                self.turn += 1
+                return events
+
+            chase_maps = ChaseMaps(self.level)
+            self.perception.update(self.level, self.player, max_notice_radius(self.enemies))
+            if self.simultaneous:
+                self._resolve_simultaneous(chase_maps, events)
+            else:
+                self._resolve_sequential(chase_maps, events)
+
+            self.enemies = self.living_enemies()
+            self.turn += 1
+            return events
+
+    def _decide(self, enemy, chase_maps):
+        with trace.span("decide_enemy_action", "ai") as span:
+            action = decide_enemy_action(
+                enemy,
+                self.player,
+                self.level,
+                self.occupancy,
+                chase_maps=chase_maps,
+                perception=self.perception,
+            )
+            if span:
+                span.annotate(x=enemy.tile_x, y=enemy.tile_y, action=action.kind)
+            return action
+
+    def _retry(self, enemy, chase_maps):
+        with trace.span("retry_enemy_move", "ai"):
+            return retry_enemy_move(
+                enemy,
+                self.player,
+                self.level,
+                self.occupancy,
+                chase_maps=chase_maps,
+                perception=self.perception,
+            )
+
+    def _resolve_sequential(self, chase_maps, events: list) -> None:
+        """Каждый враг решает и действует по очереди, видя уже сделанные ходы предыдущих."""
+        for enemy in self.enemies:
+            if enemy.hp <= 0 or self.is_over:
+                continue
+            action = self._decide(enemy, chase_maps)
+            if action.kind == "attack":
+                enemy.attack(self.player)
+                events.append(AttackEvent(enemy, self.player))
+            elif action.kind == "move":
+                self._apply_move(enemy, action, events)
+
+    def _resolve_simultaneous(self, chase_maps, events: list) -> None:
+        """
+        Все враги решают по расстановке на начало хода, затем действия применяются.
+        Индекс занятости служит таблицей резервирования: успешный ход сразу занимает
+        целевой тайл, и второй претендент на него получает отказ. Ходы, упёршиеся во
+        врага, повторяются, пока кто-то продвигается: так цепочка врагов сдвигается
+        за один ход независимо от порядка, а встречные обмены местами не проходят.
+        Враги, которые остались на месте (ждали за спиной другого или упёрлись в него),
+        после каждого продвижения выбирают шаг заново с учётом освободившихся тайлов:
+        колонна в коридоре идёт вперёд целиком, как и при поочерёдных ходах.
+        """
+        actions = [(enemy, self._decide(enemy, chase_maps)) for enemy in self.enemies if enemy.hp > 0]
+
+        pending = []
+        waiting = []
+        for enemy, action in actions:
+            if self.is_over:
+                return
+            if action.kind == "attack":
+                enemy.attack(self.player)
+                events.append(AttackEvent(enemy, self.player))
+            elif action.kind == "move":
+                pending.append((enemy, action))
+            else:
+                waiting.append(enemy)
+
+        while pending and not self.is_over:
+            blocked = self._apply_pending(pending, events)
+            if len(blocked) == len(pending):
+                break
+            pending = []
+            retry = waiting + [enemy for enemy, _ in blocked]
+            waiting = []
+            for enemy in retry:
+                if enemy.hp <= 0:
+                    continue
+                action = self._retry(enemy, chase_maps)
+                if action.kind == "move":
+                    pending.append((enemy, action))
+                else:
+                    waiting.append(enemy)
+
+    def _apply_pending(self, pending: list, events: list) -> list:
+        """Применяет ходы, повторяя упёршиеся во врага, пока кто-то продвигается; возвращает оставшиеся."""
+        while pending and not self.is_over:
+            blocked = [
+                (enemy, action)
+                for enemy, action in pending
+                if enemy.hp > 0 and not self._apply_move(enemy, action, events, defer_on_entity=True)
+            ]
+            if len(blocked) == len(pending):
+                return blocked
+            pending = blocked
+        return pending
+
+    def _apply_move(self, enemy, action, events: list, defer_on_entity: bool = False) -> bool:
+        """
+        Применяет ход врага; упор в игрока превращается в атаку.
+        Возвращает False, только если ход отложен: defer_on_entity и путь закрыт другим врагом.
+        """
+        from_tile = (enemy.tile_x, enemy.tile_y)
+        move_result, blocker = self.try_move(enemy, action.dx, action.dy)
+        if move_result == MoveResult.MOVED:
+            events.append(MoveEvent(enemy, from_tile, (enemy.tile_x, enemy.tile_y)))
+        elif move_result == MoveResult.BLOCKED_ENTITY and blocker is self.player:
+            enemy.attack(self.player)
+            events.append(AttackEvent(enemy, self.player))
+        elif move_result == MoveResult.BLOCKED_ENTITY and defer_on_entity:
+            return False
+        return True
+
+    def step_move(self, dx: int, dy: int) -> TurnResult:
+        """Полный ход синхронно: действие игрока и, если оно засчитано, ответ врагов."""
+        result = self.player_move(dx, dy)
+        if result.acted:
+            result.enemy_events = self.run_enemy_turns()
+        return result
+
+    def step_wait(self) -> TurnResult:
+        result = self.player_wait()
+        if result.acted:
+            result.enemy_events = self.run_enemy_turns()
+        return result
+
+    def _spend_light(self, amount: int) -> None:
+        spend = getattr(self.player, "spend_light", None)
+        if callable(spend):
+            spend(amount)
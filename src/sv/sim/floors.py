@@ -0,0 +1,91 @@
+"""Подготовка этажей: генерация, расстановка и запекание рельефа, в том числе в фоне."""
+
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from sv.core import profiling, trace
+from sv.sim.engine import pick_spawn_tiles
+from sv.world.level_generator import LevelGenerator
+from sv.world.level_grid import LevelGrid
+from sv.world.terrain import TERRAIN_CHUNK_SIZE, bake_chunks
+
+
+@dataclass(slots=True)
+class PreparedFloor:
+    """Всё, что нужно для входа на этаж без тяжёлой работы: уровень, точки и пиксели чанков."""
+
+    seed: int
+    level: LevelGrid
+    spawn_xy: tuple[int, int]
+    stairs_xy: tuple[int, int]
+    enemy_tiles: list[tuple[int, int]]
+    chunks: dict[tuple[int, int], np.ndarray]
+
+
+def prepare_floor(
+    seed: int,
+    width: int,
+    height: int,
+    atlas: np.ndarray | None = None,
+    enemies: int = 1,
+    chunk_size: int = TERRAIN_CHUNK_SIZE,
+) -> PreparedFloor:
+    """
+    Генерирует этаж из зерна и расставляет врагов тем же rng; при заданном atlas
+    запекает пиксели чанков рельефа. Не трогает arcade и глобальный random,
+    поэтому безопасна в рабочем потоке.
+    """
+    with trace.span("prepare_floor", "world") as span, profiling.phase(profiling.PHASE_GENERATION):
+        if span:
+            span.annotate(seed=seed, width=width, height=height)
+        rng = random.Random(seed)
+        with trace.span("generate_level", "world"):
+            level, spawn_xy, stairs_xy = LevelGenerator(width=width, height=height, rng=rng).generate()
+        enemy_tiles = pick_spawn_tiles(level, enemies, exclude=(spawn_xy, stairs_xy), rng=rng)
+        with trace.span("bake_chunks", "world"):
+            chunks = bake_chunks(level, atlas, chunk_size) if atlas is not None else {}
+        return PreparedFloor(seed, level, spawn_xy, stairs_xy, enemy_tiles, chunks)
+
+
+class FloorPrefetcher:
+    """
+    Готовит следующий этаж в фоновом потоке, пока игрок проходит текущий.
+    take() дожидается заказа с тем же зерном, а если заказан другой этаж или заказа
+    не было — готовит синхронно.
+    """
+
+    def __init__(self, prepare=prepare_floor):
+        self._prepare = prepare
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: tuple[int, Future] | None = None
+
+    def submit(self, seed: int, *args, **kwargs) -> None:
+        """Заказывает подготовку этажа; предыдущий незабранный заказ отбрасывается."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-prefetch")
+        self.cancel()
+        self._pending = (seed, self._executor.submit(self._prepare, seed, *args, **kwargs))
+
+    def take(self, seed: int, *args, **kwargs) -> PreparedFloor:
+        """Этаж с зерном seed: из фонового заказа с тем же зерном или синхронно с этими аргументами."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending_seed, future = pending
+            if pending_seed == seed:
+                return future.result()
+            future.cancel()
+        return self._prepare(seed, *args, **kwargs)
+
+    def cancel(self) -> None:
+        if self._pending is not None:
+            self._pending[1].cancel()
+            self._pending = None
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,498 @@
+"""
+Запись и воспроизведение ввода: зерно забега и события ввода с отметками времени.
+
+Game пишет журнал (`python src/main.py --record session.svr`), а воспроизведение
+прогоняет его через безоконный цикл ходов с виртуальными часами так быстро, как
+позволяет процессор:
+
+    python -m sv.sim.replay session.svr --repeat 10
+
+Файл: заголовок REPLAY_HEADER | привязки клавиш BINDING_DTYPE | события EVENT_DTYPE,
+сжатые zlib (кадры с почти одинаковым delta_time сжимаются в разы).
+"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from sv.core import profiling, trace
+from sv.core.collision import MoveResult
+from sv.core.movement_input import MovementInputState
+from sv.sim.actors import EnemyActor, PlayerActor
+from sv.sim.engine import MoveEvent, SimulationEngine
+from sv.sim.floors import prepare_floor
+from sv.sim.travel import AutoTravel
+from sv.world.tiles import STAIRS
+
+MAGIC = b"SVIN"
+VERSION = 1
+FLAG_SIMULTANEOUS = 1
+FLAG_FAST_FORWARD = 2
+# magic, version, flags, run_seed, width, height, enemies, binding_count, event_count,
+# размер сжатых событий, diagonal_window, move_duration, fast_move_duration, duration,
+# итог записи: floor_number, turn, player_x, player_y, player_hp
+REPLAY_HEADER = struct.Struct("<4sHHQHHHHIIddddIIiii")
+
+# Клавиша направления: ось 0 — горизонталь, 1 — вертикаль
+BINDING_DTYPE = np.dtype([("symbol", "<i4"), ("axis", "u1"), ("value", "i1")])
+# dt — delta_time кадра (только для FRAME)
+EVENT_DTYPE = np.dtype([("time", "<f8"), ("kind", "u1"), ("a", "<i4"), ("b", "<i4"), ("dt", "<f8")])
+
+# Виды событий
+FRAME = 0  # кадр игры, в котором что-то происходило; dt = delta_time
+DIRECTION_PRESS = 1  # a = клавиша
+DIRECTION_RELEASE = 2  # a = клавиша
+WAIT = 3
+EXPLORE = 4
+TRAVEL_STAIRS = 5
+OTHER_KEY = 6  # прочая клавиша: только прерывает автоперемещение
+TRAVEL = 7  # a, b = тайл
+PAUSE = 8
+RESUME = 9
+FAST_FORWARD = 10  # a = 1/0: ускорение включено/выключено в меню посреди забега
+
+PLAYER_TURN = "player_turn"
+PLAYER_ANIM = "player_anim"
+ENEMY_TURN = "enemy_turn"
+
+
+@dataclass(slots=True)
+class ReplaySummary:
+    """Итог забега: по нему воспроизведение сверяется с записью."""
+
+    floor_number: int = 1
+    turn: int = 0
+    player_xy: tuple[int, int] = (-1, -1)
+    player_hp: int = 0
+
+
+@dataclass(slots=True)
+class InputLog:
+    """Журнал ввода одного забега: параметры этажей, привязки клавиш и события."""
+
+    run_seed: int
+    width: int
+    height: int
+    enemies: int
+    simultaneous: bool
+    fast_forward: bool
+    diagonal_window: float
+    move_duration: float
+    fast_move_duration: float
+    bindings: np.ndarray
+    events: np.ndarray
+    duration: float = 0.0
+    summary: ReplaySummary = field(default_factory=ReplaySummary)
+
+    def movement_input(self) -> MovementInputState:
+        """Состояние ввода направлений с записанными привязками."""
+        horizontal = {}
+        vertical = {}
+        for symbol, axis, value in self.bindings.tolist():
+            (vertical if axis else horizontal)[symbol] = value
+        return MovementInputState(horizontal, vertical, diagonal_window=self.diagonal_window)
+
+
+def write_log(path, log: InputLog) -> Path:
+    """Записывает журнал атомарно (временный файл и os.replace)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    flags = (FLAG_SIMULTANEOUS if log.simultaneous else 0) | (FLAG_FAST_FORWARD if log.fast_forward else 0)
+    events = zlib.compress(np.ascontiguousarray(log.events, dtype=EVENT_DTYPE).tobytes())
+    summary = log.summary
+    header = REPLAY_HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        log.run_seed,
+        log.width,
+        log.height,
+        log.enemies,
+        len(log.bindings),
+        len(log.events),
+        len(events),
+        log.diagonal_window,
+        log.move_duration,
+        log.fast_move_duration,
+        log.duration,
+        summary.floor_number,
+        summary.turn,
+        summary.player_xy[0],
+        summary.player_xy[1],
+        summary.player_hp,
+    )
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            stream.write(header)
+            stream.write(np.ascontiguousarray(log.bindings, dtype=BINDING_DTYPE).tobytes())
+            stream.write(events)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def read_log(path) -> InputLog:
+    data = Path(path).read_bytes()
+    if len(data) < REPLAY_HEADER.size or data[:4] != MAGIC:
+        raise ValueError(f"{path} is not an input log")
+    (
+        _magic,
+        version,
+        flags,
+        run_seed,
+        width,
+        height,
+        enemies,
+        binding_count,
+        event_count,
+        events_size,
+        diagonal_window,
+        move_duration,
+        fast_move_duration,
+        duration,
+        floor_number,
+        turn,
+        player_x,
+        player_y,
+        player_hp,
+    ) = REPLAY_HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"unsupported input log version {version}")
+    offset = REPLAY_HEADER.size
+    if len(data) != offset + binding_count * BINDING_DTYPE.itemsize + events_size:
+        raise ValueError(f"{path} is truncated or corrupt")
+    bindings = np.frombuffer(data, dtype=BINDING_DTYPE, count=binding_count, offset=offset).copy()
+    offset += bindings.nbytes
+    try:
+        raw_events = zlib.decompress(data[offset:])
+    except zlib.error as exc:
+        raise ValueError(f"{path} is truncated or corrupt") from exc
+    events = np.frombuffer(raw_events, dtype=EVENT_DTYPE, count=event_count).copy()
+    return InputLog(
+        run_seed=run_seed,
+        width=width,
+        height=height,
+        enemies=enemies,
+        simultaneous=bool(flags & FLAG_SIMULTANEOUS),
+        fast_forward=bool(flags & FLAG_FAST_FORWARD),
+        diagonal_window=diagonal_window,
+        move_duration=move_duration,
+        fast_move_duration=fast_move_duration,
+        bindings=bindings,
+        events=events,
+        duration=duration,
+        summary=ReplaySummary(floor_number, turn, (player_x, player_y), player_hp),
+    )
+
+
+class InputRecorder:
+    """
+    Копит события ввода забега с временем относительно begin().
+    Game вызывает record в тех же местах, где сам обрабатывает ввод, поэтому в
+    журнал попадает только ввод, дошедший до игровой логики, и только кадры,
+    в которых что-то происходило.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.log: InputLog | None = None
+        self._events: list[tuple[float, int, int, int, float]] = []
+        self._started_at = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.log is not None
+
+    def begin(
+        self,
+        now: float,
+        run_seed: int,
+        width: int,
+        height: int,
+        enemies: int,
+        movement_input: MovementInputState,
+        simultaneous: bool,
+        fast_forward: bool,
+        move_duration: float,
+        fast_move_duration: float,
+    ) -> None:
+        """Начинает журнал нового забега; предыдущие события отбрасываются."""
+        bindings = [(symbol, 0, value) for symbol, value in movement_input.horizontal_bindings.items()]
+        bindings += [(symbol, 1, value) for symbol, value in movement_input.vertical_bindings.items()]
+        self.log = InputLog(
+            run_seed=run_seed,
+            width=width,
+            height=height,
+            enemies=enemies,
+            simultaneous=simultaneous,
+            fast_forward=fast_forward,
+            diagonal_window=movement_input.diagonal_window,
+            move_duration=move_duration,
+            fast_move_duration=fast_move_duration,
+            bindings=np.array(bindings, dtype=BINDING_DTYPE),
+            events=np.zeros(0, dtype=EVENT_DTYPE),
+        )
+        self._events = []
+        self._started_at = now
+
+    def record(self, now: float, kind: int, a: int = 0, b: int = 0) -> None:
+        if self.log is not None:
+            self._events.append((now - self._started_at, kind, int(a), int(b), 0.0))
+
+    def record_frame(self, now: float, delta_time: float) -> None:
+        if self.log is not None:
+            self._events.append((now - self._started_at, FRAME, 0, 0, float(delta_time)))
+
+    def abandon(self) -> None:
+        """Прекращает запись (например, после загрузки сохранения журнал уже не воспроизводим)."""
+        self.log = None
+        self._events = []
+
+    def finish(self, now: float, summary: ReplaySummary) -> Path | None:
+        """Записывает журнал с итогом забега; None, если записывать нечего."""
+        if self.log is None:
+            return None
+        self.log.events = np.array(self._events, dtype=EVENT_DTYPE)
+        self.log.duration = now - self._started_at
+        self.log.summary = summary
+        return write_log(self.path, self.log)
+
+
+def summarize(engine: SimulationEngine, floor_number: int) -> ReplaySummary:
+    player = engine.player
+    return ReplaySummary(floor_number, engine.turn, (player.tile_x, player.tile_y), player.hp)
+
+
+class ReplaySession:
+    """
+    Безоконный цикл ходов, повторяющий фазы Game на виртуальных часах журнала.
+    Анимации заменены счётчиками времени с тем же правилом завершения, что у
+    TweenManager, а кадры берутся из журнала вместе с их delta_time, поэтому шаги,
+    ходы врагов и спуски совпадают с записанной игрой кадр в кадр.
+    """
+
+    def __init__(self, log: InputLog):
+        self.log = log
+        self.movement_input = log.movement_input()
+        self.floor_rng = random.Random(log.run_seed)
+        self.floor_number = 1
+        self.frames = 0
+        self.phase = PLAYER_TURN
+        self.paused = False
+        # Настройка ускорения меняется в меню паузы; в заголовке — значение на начало забега
+        self.fast_forward = log.fast_forward
+        # Текущая «анимация» фазы: [прошедшее время, длительность]
+        self._anim: list[float] | None = None
+        # Ещё не показанные последовательные перемещения врагов
+        self._enemy_moves_left = 0
+        self._descend_pending = False
+        self._player: PlayerActor | None = None
+        self.engine: SimulationEngine | None = None
+        self.auto_travel: AutoTravel | None = None
+        self._enter_floor(self.floor_rng.getrandbits(32))
+
+    def _enter_floor(self, seed: int) -> None:
+        floor = prepare_floor(seed, self.log.width, self.log.height, None, self.log.enemies)
+        if self._player is None:
+            self._player = PlayerActor(*floor.spawn_xy)
+        else:
+            self._player.occupancy = None
+            self._player.move_to(*floor.spawn_xy)
+        self.engine = SimulationEngine(
+            floor.level,
+            self._player,
+            [EnemyActor(x, y) for x, y in floor.enemy_tiles],
+            simultaneous=self.log.simultaneous,
+        )
+        self.auto_travel = AutoTravel(self.engine)
+        self._anim = None
+        # Game сразу заказывает зерно следующего этажа
+        self._next_seed = self.floor_rng.getrandbits(32)
+
+    def apply(self, now: float, kind: int, a: int = 0, b: int = 0, dt: float = 0.0) -> None:
+        """Применяет событие журнала так же, как соответствующий обработчик Game."""
+        if kind == FRAME:
+            self.frame(now, dt)
+        elif kind == PAUSE:
+            self.paused = True
+            self.movement_input.clear()
+            self.auto_travel.stop()
+        elif kind == RESUME:
+            self.paused = False
+            self.movement_input.clear()
+        elif kind == FAST_FORWARD:
+            self.fast_forward = bool(a)
+        elif kind == DIRECTION_RELEASE:
+            self.movement_input.release(a, now)
+        elif kind == TRAVEL:
+            if self.auto_travel.start_travel((a, b)):
+                self.poll(now)
+        else:
+            self._key_press(now, kind, a)
+
+    def _key_press(self, now: float, kind: int, symbol: int) -> None:
+        # Любая клавиша прерывает автоперемещение; направления при этом обрабатываются
+        if self.auto_travel.active:
+            self.auto_travel.stop()
+            if kind != DIRECTION_PRESS:
+                return
+        if kind == DIRECTION_PRESS:
+            self.movement_input.press(symbol, now)
+            self.poll(now)
+        elif kind == EXPLORE:
+            if self.auto_travel.start_explore():
+                self.poll(now)
+        elif kind == TRAVEL_STAIRS:
+            self._travel_to_stairs(now)
+        elif kind == WAIT and self.phase == PLAYER_TURN:
+            if self.engine.player_wait().acted:
+                self._enemy_turn()
+
+    def frame(self, now: float, delta_time: float) -> None:
+        """Кадр Game.on_update: анимации, смена фаз, затем ход игрока."""
+        self.frames += 1
+        if self._anim is not None:
+            self._anim[0] += max(0.0, float(delta_time))
+            if self._anim[0] / self._anim[1] >= 1.0:
+                self._anim = None
+                if self.phase == ENEMY_TURN:
+                    self._next_enemy_anim()
+
+        if self.phase == PLAYER_ANIM and self._anim is None:
+            if self._descend_pending:
+                self._descend_pending = False
+                self.floor_number += 1
+                self._enter_floor(self._next_seed)
+                self.phase = PLAYER_TURN
+                return
+            self._enemy_turn()
+            return
+
+        self.poll(now)
+
+    def poll(self, now: float) -> None:
+        """Ход игрока из удерживаемых клавиш или автоперемещения (как _process_player_movement)."""
+        if self.phase != PLAYER_TURN or self.paused:
+            return
+        if self.auto_travel.active:
+            move = self.auto_travel.next_move()
+            if move is not None and self._player_move(*move) != MoveResult.MOVED:
+                self.auto_travel.stop()
+            return
+        move = self.movement_input.resolve_move(now)
+        if move is None:
+            return
+        if self._player_move(*move) == MoveResult.BLOCKED_WALL:
+            self.movement_input.mark_blocked(*move)
+
+    def _move_duration(self) -> float:
+        if self.fast_forward and self.engine.is_quiet():
+            return self.log.fast_move_duration
+        return self.log.move_duration
+
+    def _player_move(self, dx: int, dy: int) -> MoveResult | None:
+        result = self.engine.player_move(dx, dy)
+        if not result.acted:
+            return result.move_result
+        if result.move_result != MoveResult.MOVED:
+            self._enemy_turn()
+            return result.move_result
+
+        player = self.engine.player
+        self._anim = [0.0, self._move_duration()]
+        self._descend_pending = self.engine.level.get(player.tile_x, player.tile_y) == STAIRS
+        self.phase = PLAYER_ANIM
+        return result.move_result
+
+    def _enemy_turn(self) -> None:
+        self.phase = ENEMY_TURN
+        events = self.engine.run_enemy_turns()
+        profiling.step("turn")
+        moves = sum(1 for event in events if isinstance(event, MoveEvent) and event.entity.hp > 0)
+        # Параллельные перемещения заканчиваются одновременно — как одно
+        self._enemy_moves_left = min(moves, 1) if self.log.simultaneous else moves
+        self._next_enemy_anim()
+
+    def _next_enemy_anim(self) -> None:
+        if self._enemy_moves_left == 0:
+            self.phase = PLAYER_TURN
+            return
+        self._enemy_moves_left -= 1
+        self._anim = [0.0, self._move_duration()]
+
+    def _travel_to_stairs(self, now: float) -> None:
+        engine = self.engine
+        player = engine.player
+        seen = [(x, y) for x, y in engine.level.positions_of((STAIRS,)) if engine.explored[y, x]]
+        if not seen:
+            return
+        goal = min(seen, key=lambda t: max(abs(t[0] - player.tile_x), abs(t[1] - player.tile_y)))
+        if self.auto_travel.start_travel(goal):
+            self.poll(now)
+
+    def run(self) -> ReplaySummary:
+        """Воспроизводит весь журнал и возвращает итог забега."""
+        for event in self.log.events.tolist():
+            self.apply(*event)
+        return summarize(self.engine, self.floor_number)
+
+
+def replay(log: InputLog) -> ReplaySummary:
+    return ReplaySession(log).run()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded Shardveil input log headlessly")
+    parser.add_argument("log", type=Path)
+    parser.add_argument("--repeat", type=int, default=1, help="replay the log several times (benchmarking)")
+    parser.add_argument("--trace", type=Path, help=f"write a Chrome trace of turns and AI; also ${trace.TRACE_ENV}")
+    profiling.add_arguments(parser, "turn")
+    args = parser.parse_args(argv)
+
+    if args.trace is not None:
+        trace.start(args.trace)
+    else:
+        trace.start_from_env()
+    profiling.start_from_args(args, "turn")
+    log = read_log(args.log)
+    repeat = max(1, args.repeat)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        summary = replay(log)
+    elapsed = time.perf_counter() - started
+    trace.stop()
+    profiling.stop()
+
+    recorded = log.summary
+    matched = summary == recorded
+    turns = summary.turn * repeat
+    rate = turns / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"events={len(log.events)} session={log.duration:.1f}s floor={summary.floor_number}"
+        f" turn={summary.turn} player={summary.player_xy} hp={summary.player_hp}"
+    )
+    print(
+        f"recorded floor={recorded.floor_number} turn={recorded.turn} player={recorded.player_xy}"
+        f" hp={recorded.player_hp} match={matched}"
+    )
+    print(f"replays={repeat} elapsed={elapsed:.3f}s turns/s={rate:.0f}")
+    return 0 if matched else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
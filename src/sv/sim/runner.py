@@ -0,0 +1,93 @@
+"""Безоконный прогон ходов: soak-тесты и балансировка."""
+
+import argparse
+import random
+import time
+
+from sv.core import profiling
+from sv.sim.actors import EnemyActor, PlayerActor
+from sv.sim.engine import SimulationEngine, pick_spawn_tiles
+from sv.sim.travel import AutoTravel
+from sv.world.level_generator import LevelGenerator
+
+DIRECTIONS = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy)
+
+
+def build_engine(
+    width: int = 64,
+    height: int = 48,
+    enemies: int = 1,
+    rng: random.Random | None = None,
+    simultaneous: bool = False,
+) -> SimulationEngine:
+    """Генерирует уровень и расставляет игрока и врагов так же, как Game.start_new_game."""
+    rng = rng if rng is not None else random.Random()
+    with profiling.phase(profiling.PHASE_GENERATION):
+        level, spawn_xy, stairs_xy = LevelGenerator(width=width, height=height, rng=rng).generate()
+    player = PlayerActor(*spawn_xy)
+    spawns = pick_spawn_tiles(level, enemies, exclude=(spawn_xy, stairs_xy), rng=rng)
+    return SimulationEngine(
+        level,
+        player,
+        [EnemyActor(x, y) for x, y in spawns],
+        simultaneous=simultaneous,
+    )
+
+
+def run_turns(engine: SimulationEngine, turns: int, rng: random.Random, policy: str = "random") -> int:
+    """
+    Играет за игрока и возвращает число засчитанных ходов.
+    policy="random" — случайные шаги; "explore" — автоисследование, а при его
+    остановке (враг рядом, карта открыта) — случайные шаги.
+    """
+    auto = AutoTravel(engine) if policy == "explore" else None
+    played = 0
+    attempts = 0
+    while played < turns and not engine.is_over and attempts < turns * 10:
+        attempts += 1
+        move = None
+        if auto is not None:
+            if not auto.active:
+                auto.start_explore()
+            move = auto.next_move()
+        if move is not None:
+            result = engine.step_move(*move)
+        elif rng.random() < 0.1:
+            result = engine.step_wait()
+        else:
+            result = engine.step_move(*rng.choice(DIRECTIONS))
+        if result.acted:
+            played += 1
+            profiling.step("turn")
+    return played
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless Shardveil turn simulation")
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=64)
+    parser.add_argument("--height", type=int, default=48)
+    parser.add_argument("--enemies", type=int, default=20)
+    parser.add_argument("--simultaneous", action="store_true", help="resolve enemy turns simultaneously")
+    parser.add_argument("--policy", choices=("random", "explore"), default="random", help="how the player moves")
+    profiling.add_arguments(parser, "turn")
+    args = parser.parse_args(argv)
+    profiling.start_from_args(args, "turn")
+
+    rng = random.Random(args.seed)
+
+    # Когда игрок погибает, прогон продолжается на новом уровне
+    played = 0
+    floors = 0
+    started = time.perf_counter()
+    while played < args.turns:
+        engine = build_engine(args.width, args.height, args.enemies, rng, args.simultaneous)
+        floors += 1
+        played += run_turns(engine, args.turns - played, rng, args.policy)
+    elapsed = time.perf_counter() - started
+    profiling.stop()
+
+    rate = played / elapsed if elapsed > 0 else float("inf")
+    print(f"turns={played} floors={floors} elapsed={elapsed:.3f}s turns/s={rate:.0f}")
+    return 0
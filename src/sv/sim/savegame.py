@@ -0,0 +1,287 @@
+"""
+Двоичные сохранения: заголовок, сырая сетка уровня uint8, маска исследованных
+тайлов и упакованные записи сущностей.
+
+    заголовок (HEADER_SIZE байт) | tiles (h*w) | explored (h*w, если есть) | записи ENTITY_DTYPE
+
+Сетка и маска при загрузке отображаются в память (copy-on-write), записи
+сущностей читаются одним массивом и применяются по столбцам.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"SVSV"
+VERSION = 1
+# magic, version, flags, width, height, turn, floor_number, floor_seed, next_floor_seed, entity_count
+HEADER = struct.Struct("<4sHHIIIIQQI")
+# Заголовок дополнен до фиксированного размера, чтобы сетка начиналась с ровного смещения
+HEADER_SIZE = 64
+FLAG_EXPLORED = 1
+
+KIND_PLAYER = 0
+KIND_ENEMY = 1
+
+# Упакованная запись сущности (без выравнивания); seen_x/seen_y = -1 — игрок не замечен
+ENTITY_DTYPE = np.dtype(
+    [
+        ("kind", "u1"),
+        ("alerted", "u1"),
+        ("tile_x", "<i4"),
+        ("tile_y", "<i4"),
+        ("hp", "<i2"),
+        ("max_hp", "<i2"),
+        ("light", "<i2"),
+        ("light_max", "<i2"),
+        ("seen_x", "<i4"),
+        ("seen_y", "<i4"),
+        ("search_turns_left", "<i2"),
+    ]
+)
+
+
+@dataclass(slots=True)
+class SaveState:
+    """Снимок забега, независимый от живых объектов: его можно писать из другого потока."""
+
+    floor_number: int
+    floor_seed: int
+    next_floor_seed: int
+    turn: int
+    tiles: np.ndarray
+    explored: np.ndarray | None
+    entities: np.ndarray
+
+    @property
+    def player_record(self) -> np.void:
+        return self.entities[self.entities["kind"] == KIND_PLAYER][0]
+
+    @property
+    def enemy_records(self) -> np.ndarray:
+        return self.entities[self.entities["kind"] == KIND_ENEMY]
+
+
+def entity_records(player, enemies) -> np.ndarray:
+    """Упаковывает игрока и живых врагов в массив ENTITY_DTYPE; игрок — первая запись."""
+    living = [enemy for enemy in enemies if enemy.hp > 0]
+    records = np.zeros(1 + len(living), dtype=ENTITY_DTYPE)
+    records["seen_x"] = -1
+    records["seen_y"] = -1
+
+    records[0] = (
+        KIND_PLAYER,
+        0,
+        player.tile_x,
+        player.tile_y,
+        player.hp,
+        player.max_hp,
+        getattr(player, "light", 0),
+        getattr(player, "light_max", 0),
+        -1,
+        -1,
+        0,
+    )
+    for index, enemy in enumerate(living, start=1):
+        seen = enemy.last_seen_player_tile or (-1, -1)
+        records[index] = (
+            KIND_ENEMY,
+            enemy.is_alerted,
+            enemy.tile_x,
+            enemy.tile_y,
+            enemy.hp,
+            enemy.max_hp,
+            0,
+            0,
+            seen[0],
+            seen[1],
+            enemy.search_turns_left,
+        )
+    return records
+
+
+def snapshot(engine, floor_number: int, floor_seed: int, next_floor_seed: int) -> SaveState:
+    """Снимает состояние движка с копиями массивов; вызывается в игровом потоке."""
+    return SaveState(
+        floor_number=int(floor_number),
+        floor_seed=int(floor_seed),
+        next_floor_seed=int(next_floor_seed),
+        turn=int(engine.turn),
+        tiles=np.array(engine.level.tiles, dtype=np.uint8),
+        explored=np.array(engine.explored, dtype=bool),
+        entities=entity_records(engine.player, engine.enemies),
+    )
+
+
+def write_save(path, state: SaveState) -> Path:
+    """
+    Атомарно записывает сохранение: во временный файл рядом с path, fsync, затем
+    os.replace — прерванная запись не портит предыдущее сохранение.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    height, width = state.tiles.shape
+    flags = FLAG_EXPLORED if state.explored is not None else 0
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        width,
+        height,
+        state.turn,
+        state.floor_number,
+        state.floor_seed,
+        state.next_floor_seed,
+        len(state.entities),
+    )
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            stream.write(header.ljust(HEADER_SIZE, b"\0"))
+            stream.write(np.ascontiguousarray(state.tiles, dtype=np.uint8).tobytes())
+            if state.explored is not None:
+                stream.write(np.ascontiguousarray(state.explored, dtype=bool).tobytes())
+            stream.write(np.ascontiguousarray(state.entities, dtype=ENTITY_DTYPE).tobytes())
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def read_save(path, mmap: bool = True) -> SaveState:
+    """
+    Читает сохранение: сетка и маска отображаются в память в режиме copy-on-write
+    (изменения уровня не попадают в файл), записи сущностей читаются одним блоком.
+    mmap=False читает сетку и маску в память: файл не остаётся открытым, и его можно
+    сразу перезаписать (на Windows os.replace поверх отображённого файла не проходит).
+    """
+    path = Path(path)
+    with open(path, "rb") as stream:
+        raw = stream.read(HEADER_SIZE)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path} is not a save file")
+    (
+        magic,
+        version,
+        flags,
+        width,
+        height,
+        turn,
+        floor_number,
+        floor_seed,
+        next_floor_seed,
+        entity_count,
+    ) = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a save file")
+    if version != VERSION:
+        raise ValueError(f"unsupported save version {version}")
+
+    cells = width * height
+    offset = HEADER_SIZE
+    expected = offset + cells * (2 if flags & FLAG_EXPLORED else 1) + entity_count * ENTITY_DTYPE.itemsize
+    if path.stat().st_size != expected:
+        raise ValueError(f"{path} is truncated or corrupt")
+
+    tiles = _read_grid(path, np.uint8, offset, (height, width), mmap)
+    offset += cells
+    explored = None
+    if flags & FLAG_EXPLORED:
+        explored = _read_grid(path, bool, offset, (height, width), mmap)
+        offset += cells
+    entities = np.fromfile(path, dtype=ENTITY_DTYPE, count=entity_count, offset=offset)
+    return SaveState(floor_number, floor_seed, next_floor_seed, turn, tiles, explored, entities)
+
+
+def _read_grid(path: Path, dtype, offset: int, shape: tuple[int, int], mmap: bool) -> np.ndarray:
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape)
+    return np.fromfile(path, dtype=dtype, count=shape[0] * shape[1], offset=offset).reshape(shape)
+
+
+def apply_entity_records(records: np.ndarray, player, enemies) -> None:
+    """
+    Переносит записи на уже созданные сущности: первая запись KIND_PLAYER — игроку,
+    записи KIND_ENEMY — врагам по порядку (их столько же, сколько enemies).
+    """
+    player_record = records[records["kind"] == KIND_PLAYER][0]
+    player.hp = int(player_record["hp"])
+    player.max_hp = int(player_record["max_hp"])
+    if hasattr(player, "light"):
+        player.light = int(player_record["light"])
+        player.light_max = int(player_record["light_max"])
+
+    enemy_records = records[records["kind"] == KIND_ENEMY]
+    if len(enemy_records) != len(enemies):
+        raise ValueError(f"expected {len(enemy_records)} enemies, got {len(enemies)}")
+    # Столбцы в списки одним проходом numpy, затем простой цикл по атрибутам
+    columns = {name: enemy_records[name].tolist() for name in ENTITY_DTYPE.names}
+    for index, enemy in enumerate(enemies):
+        enemy.hp = columns["hp"][index]
+        enemy.max_hp = columns["max_hp"][index]
+        enemy.is_alerted = bool(columns["alerted"][index])
+        seen = (columns["seen_x"][index], columns["seen_y"][index])
+        enemy.last_seen_player_tile = None if seen[0] < 0 else seen
+        enemy.search_turns_left = columns["search_turns_left"][index]
+
+
+def enemy_tiles(records: np.ndarray) -> list[tuple[int, int]]:
+    """Тайлы врагов из записей в порядке сохранения."""
+    enemy_records = records[records["kind"] == KIND_ENEMY]
+    return list(zip(enemy_records["tile_x"].tolist(), enemy_records["tile_y"].tolist()))
+
+
+def _print_save_error(exc: BaseException) -> None:
+    print(f"Save failed: {exc}", file=sys.stderr)
+
+
+class SaveWriter:
+    """
+    Пишет сохранения в фоновом потоке, чтобы автосохранение не задерживало кадр.
+    Запросы выполняются по очереди одним рабочим потоком; ошибки записи передаются
+    в on_error (по умолчанию печатаются), чтобы неудачное автосохранение не прошло молча.
+    """
+
+    def __init__(self, write=write_save, on_error=None):
+        self._write = write
+        self._on_error = on_error if on_error is not None else _print_save_error
+        self._executor: ThreadPoolExecutor | None = None
+        self._last: Future | None = None
+
+    def submit(self, path, state: SaveState) -> Future:
+        """Заказывает запись снимка state в path; возвращает Future с путём."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save-writer")
+        self._last = self._executor.submit(self._write, path, state)
+        self._last.add_done_callback(self._report)
+        return self._last
+
+    def _report(self, future: Future) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self._on_error(exc)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Дожидается последней заказанной записи (ошибки записи пробрасываются)."""
+        if self._last is not None:
+            self._last.result(timeout)
+
+    def shutdown(self) -> None:
+        """Завершает поток, дописав уже заказанные сохранения."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
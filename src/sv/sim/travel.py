@@ -0,0 +1,85 @@
+"""Автоперемещение игрока по картам расстояний: переход к тайлу и исследование."""
+
+import numpy as np
+
+from sv.ai.chase_map import UNREACHABLE, ChaseMaps, descend, dijkstra_map
+
+TRAVEL = "travel"
+EXPLORE = "explore"
+
+
+class AutoTravel:
+    """
+    Выбирает шаги игрока для перехода к тайлу или исследования уровня.
+    Карты Дейкстры кэшируются: для перехода — по цели (ChaseMaps), для исследования —
+    пока не изменились explored_version движка и ревизия уровня. Останавливается,
+    как только цель достигнута, исследовать нечего или враг встревожен/виден.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.mode: str | None = None
+        self.goal: tuple[int, int] | None = None
+        self._travel_maps = ChaseMaps(engine.level)
+        self._explore_key: tuple[int, int] | None = None
+        self._explore_map: np.ndarray | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    def start_travel(self, goal: tuple[int, int]) -> bool:
+        """Начинает переход к исследованному проходимому тайлу. Возвращает False, если он невозможен."""
+        gx, gy = int(goal[0]), int(goal[1])
+        level = self.engine.level
+        if not level.is_walkable(gx, gy) or not self.engine.explored[gy, gx]:
+            return False
+        self.mode = TRAVEL
+        self.goal = (gx, gy)
+        return True
+
+    def start_explore(self) -> bool:
+        self.mode = EXPLORE
+        self.goal = None
+        return True
+
+    def stop(self) -> None:
+        self.mode = None
+        self.goal = None
+
+    def explore_map(self) -> np.ndarray | None:
+        """Карта расстояний до ближайших неисследованных проходимых тайлов; None, если их нет."""
+        engine = self.engine
+        key = (engine.level.revision, engine.explored_version)
+        if key != self._explore_key:
+            goals = engine.level.walkable & ~engine.explored
+            self._explore_map = dijkstra_map(engine.level.walkable, goals) if goals.any() else None
+            self._explore_key = key
+        return self._explore_map
+
+    def next_move(self) -> tuple[int, int] | None:
+        """Направление (dx, dy) следующего шага или None — тогда автоперемещение остановлено."""
+        if not self.active:
+            return None
+        engine = self.engine
+        if not engine.is_quiet():
+            self.stop()
+            return None
+
+        player = engine.player
+        if self.mode == TRAVEL:
+            if (player.tile_x, player.tile_y) == self.goal:
+                self.stop()
+                return None
+            tile = self._travel_maps.next_step(player, self.goal, engine.occupancy)
+        else:
+            distance = self.explore_map()
+            if distance is None or int(distance[player.tile_y, player.tile_x]) == UNREACHABLE:
+                self.stop()
+                return None
+            tile = descend(distance, player, engine.occupancy)
+
+        if tile is None:
+            self.stop()
+            return None
+        return tile[0] - player.tile_x, tile[1] - player.tile_y
@@ -0,0 +1,74 @@
+"""Отладочный оверлей: время фаз кадра и счётчики сущностей и спрайтов."""
+
+from __future__ import annotations
+
+import arcade
+
+from sv.core.timing import PhaseStats
+
+# Текст перестраивается не чаще, чем раз в REFRESH_INTERVAL секунд: вёрстка текста дорогая
+REFRESH_INTERVAL = 0.25
+
+
+def format_debug_lines(stats: dict[str, PhaseStats], counts: dict[str, int]) -> list[str]:
+    """Строки оверлея: таблица фаз (мс) и счётчики."""
+    lines = [f"{'phase':<12}{'p50':>7}{'p95':>7}{'max':>7}"]
+    for name, phase in stats.items():
+        lines.append(f"{name:<12}{phase.p50:>7.2f}{phase.p95:>7.2f}{phase.max:>7.2f}")
+    if counts:
+        lines.append("  ".join(f"{name}={value}" for name, value in counts.items()))
+    return lines
+
+
+class DebugOverlay:
+    """Полупрозрачная панель в левом верхнем углу; рисуется только когда visible."""
+
+    def __init__(self, font_size: int = 11):
+        self.visible = False
+        self.font_size = font_size
+        self._text = arcade.Text(
+            "",
+            0,
+            0,
+            arcade.color.WHITE,
+            font_size,
+            width=360,
+            multiline=True,
+            font_name=("DejaVu Sans Mono", "Consolas", "Courier New"),
+            anchor_y="top",
+        )
+        self._since_refresh = REFRESH_INTERVAL
+
+    def toggle(self) -> bool:
+        self.visible = not self.visible
+        self._since_refresh = REFRESH_INTERVAL
+        return self.visible
+
+    def update(self, delta_time: float, stats_source, counts_source) -> None:
+        """
+        Обновляет текст раз в REFRESH_INTERVAL; stats_source и counts_source —
+        функции без аргументов, чтобы статистика считалась только при обновлении.
+        """
+        if not self.visible:
+            return
+        self._since_refresh += delta_time
+        if self._since_refresh < REFRESH_INTERVAL:
+            return
+        self._since_refresh = 0.0
+        self._text.text = "\n".join(format_debug_lines(stats_source(), counts_source()))
+
+    def draw(self) -> None:
+        if not self.visible or not self._text.text:
+            return
+        window = arcade.get_window()
+        window.default_camera.use()
+        left, top = 8, window.height - 8
+        self._text.position = (left + 6, top - 4)
+        arcade.draw_lrbt_rectangle_filled(
+            left,
+            left + self._text.content_width + 12,
+            top - self._text.content_height - 8,
+            top,
+            (0, 0, 0, 170),
+        )
+        self._text.draw()
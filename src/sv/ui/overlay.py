@@ -8,6 +8,8 @@ from enum import Enum
 import arcade
 from arcade import gui
 
+from .debug_overlay import DebugOverlay
+
 
 class ViewScreenId(str, Enum):
     MAIN_MENU = "main_menu"
@@ -171,11 +173,17 @@ class PauseMenuScreen(MenuScreen):
 
 
 class SettingsScreen(MenuScreen):
-    def __init__(self, on_back: Callable[[], None], *, visual: MenuVisualSpec):
+    def __init__(
+        self,
+        on_back: Callable[[], None],
+        *,
+        visual: MenuVisualSpec,
+        options: list[MenuAction] | None = None,
+    ):
         super().__init__(
             ViewScreenId.SETTINGS if visual is VIEW_VISUAL_SPEC else OverlayScreenId.SETTINGS,
             "Настройки",
-            [MenuAction("Назад", on_back)],
+            [*(options or []), MenuAction("Назад", on_back)],
             visual,
         )
 
@@ -190,13 +198,18 @@ class GameUI:
         on_main_menu: Callable[[], None],
         on_new_game: Callable[[], None],
         on_exit_game: Callable[[], None],
+        settings=None,
+        on_settings_changed: Callable[[], None] | None = None,
     ) -> None:
         self.manager = manager
+        self.settings = settings
+        self.on_settings_changed = on_settings_changed
         self.hud_layer = hud_layer
         self.on_resume = on_resume
         self.on_main_menu = on_main_menu
         self.on_new_game = on_new_game
         self.on_exit_game = on_exit_game
+        self.debug_overlay = DebugOverlay()
         self.overlay_stack: ScreenStack = ScreenStack()
         self.view_stack: ScreenStack = ScreenStack()
         self._active_overlay: gui.UIWidget | None = None
@@ -222,6 +235,13 @@ class GameUI:
 
     def draw(self) -> None:
         self.manager.draw()
+        self.debug_overlay.draw()
+
+    def toggle_debug_overlay(self) -> bool:
+        return self.debug_overlay.toggle()
+
+    def update_debug_overlay(self, delta_time: float, stats_source, counts_source) -> None:
+        self.debug_overlay.update(delta_time, stats_source, counts_source)
 
     def set_hud_visible(self, visible: bool) -> None:
         self.hud_layer.root.visible = visible
@@ -408,10 +428,44 @@ class GameUI:
         )
 
     def _build_overlay_settings_screen(self) -> SettingsScreen:
-        return SettingsScreen(on_back=self.pop_screen, visual=OVERLAY_VISUAL_SPEC)
+        return SettingsScreen(
+            on_back=self.pop_screen,
+            visual=OVERLAY_VISUAL_SPEC,
+            options=self._settings_options(overlay=True),
+        )
 
     def _build_view_settings_screen(self) -> SettingsScreen:
-        return SettingsScreen(on_back=self.pop_view_screen, visual=VIEW_VISUAL_SPEC)
+        return SettingsScreen(
+            on_back=self.pop_view_screen,
+            visual=VIEW_VISUAL_SPEC,
+            options=self._settings_options(overlay=False),
+        )
+
+    def _settings_options(self, *, overlay: bool) -> list[MenuAction]:
+        if self.settings is None:
+            return []
+        state = "вкл" if self.settings.fast_forward else "выкл"
+        return [
+            MenuAction(
+                f"Ускорение: {state}",
+                lambda: self._toggle_fast_forward(overlay=overlay),
+            )
+        ]
+
+    def _toggle_fast_forward(self, *, overlay: bool) -> None:
+        self.settings.fast_forward = not self.settings.fast_forward
+        if self.on_settings_changed is not None:
+            self.on_settings_changed()
+        # Перестраиваем экран, чтобы обновить подпись, и сохраняем выбранную кнопку
+        if overlay:
+            index = self._overlay_selected_index
+            self._render_overlay_screen()
+            self._overlay_selected_index = index
+        else:
+            index = self._view_selected_index
+            self._render_view_screen()
+            self._view_selected_index = index
+        self._refresh_button_labels(overlay=overlay)
 
 
 def _menu_button_style() -> dict[str, dict[str, object]]:
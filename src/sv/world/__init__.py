@@ -1,2 +1,3 @@
 """World generation and map logic."""
-from .level_generator import LevelGenerator
\ No newline at end of file
+from .level_generator import LevelGenerator
+from .level_grid import LevelGrid, as_level_grid
@@ -0,0 +1,154 @@
+"""
+Пакетная генерация уровней в пуле процессов для подбора параметров генератора.
+
+    python -m sv.world.batch --count 10000 --seed 1 --output levels.npy
+
+Тайлы пишутся потоково в .npy-memmap формы (count, height, width), статистика по
+уровням — в соседний .stats.npy (структурированный массив) и в stdout.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import tcod.path
+
+from .level_generator import LevelGenerator
+
+STATS_DTYPE = np.dtype(
+    [
+        ("seed", np.int64),
+        ("rooms", np.int32),
+        ("floor_ratio", np.float32),
+        ("spawn_stairs_distance", np.int32),
+    ]
+)
+
+
+def spawn_stairs_distance(walkable: np.ndarray, spawn_xy, stairs_xy) -> int:
+    """Число ходов (с диагоналями) от спавна до лестницы; -1, если лестница недостижима."""
+    unreachable = np.iinfo(np.int32).max
+    distance = np.full(walkable.shape, unreachable, dtype=np.int32)
+    distance[spawn_xy[1], spawn_xy[0]] = 0
+    tcod.path.dijkstra2d(distance, walkable, 1, 1, out=distance)
+    steps = int(distance[stairs_xy[1], stairs_xy[0]])
+    return -1 if steps == unreachable else steps
+
+
+def generate_one(job: tuple[int, int, int, dict]) -> tuple[np.ndarray, tuple]:
+    """Генерирует уровень из зерна; возвращает тайлы и строку статистики (порядок STATS_DTYPE)."""
+    seed, width, height, params = job
+    generator = LevelGenerator(width=width, height=height, seed=seed, **params)
+    level, spawn_xy, stairs_xy = generator.generate()
+    walkable = level.walkable
+    stats = (
+        seed,
+        len(generator.rooms),
+        float(walkable.mean()),
+        spawn_stairs_distance(walkable, spawn_xy, stairs_xy),
+    )
+    return level.tiles, stats
+
+
+def run_batch(
+    output: Path,
+    count: int,
+    seed: int = 0,
+    width: int = 64,
+    height: int = 48,
+    workers: int | None = None,
+    params: dict | None = None,
+    on_level=None,
+) -> np.ndarray:
+    """
+    Генерирует count уровней с зёрнами seed, seed+1, ... и пишет их в output по мере готовности.
+    Возвращает массив статистики (он же сохраняется в output.stats.npy).
+    workers=1 — без пула процессов. on_level(index, stats_row) вызывается для каждого уровня.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tiles = np.lib.format.open_memmap(output, mode="w+", dtype=np.uint8, shape=(count, height, width))
+    stats = np.zeros(count, dtype=STATS_DTYPE)
+    jobs = [(seed + index, width, height, dict(params or {})) for index in range(count)]
+
+    def _store(results):
+        for index, (level_tiles, row) in enumerate(results):
+            tiles[index] = level_tiles
+            stats[index] = row
+            if on_level is not None:
+                on_level(index, stats[index])
+
+    if workers == 1:
+        _store(map(generate_one, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _store(pool.map(generate_one, jobs, chunksize=max(1, min(64, count // 32))))
+
+    tiles.flush()
+    del tiles
+    np.save(stats_path(output), stats)
+    return stats
+
+
+def stats_path(output: Path) -> Path:
+    output = Path(output)
+    return output.with_name(output.stem + ".stats.npy")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch level generation for generator tuning")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first level; the rest follow")
+    parser.add_argument("--width", type=int, default=64)
+    parser.add_argument("--height", type=int, default=48)
+    parser.add_argument("--bsp-depth", type=int, default=5)
+    parser.add_argument("--room-min-size", type=int, default=3)
+    parser.add_argument("--room-max-size-ratio", type=float, default=0.8)
+    parser.add_argument("--workers", type=int, default=None, help="process count (1 = no pool)")
+    parser.add_argument("--output", type=Path, default=Path("levels.npy"))
+    parser.add_argument("--quiet", action="store_true", help="print only the summary")
+    args = parser.parse_args(argv)
+
+    params = {
+        "bsp_depth": args.bsp_depth,
+        "room_min_size": args.room_min_size,
+        "room_max_size_ratio": args.room_max_size_ratio,
+    }
+
+    def _print_level(index, row):
+        if not args.quiet:
+            print(
+                f"{index}\tseed={row['seed']}\trooms={row['rooms']}"
+                f"\tfloor={row['floor_ratio']:.3f}\tspawn_stairs={row['spawn_stairs_distance']}"
+            )
+
+    started = time.perf_counter()
+    stats = run_batch(
+        args.output,
+        args.count,
+        seed=args.seed,
+        width=args.width,
+        height=args.height,
+        workers=args.workers,
+        params=params,
+        on_level=_print_level,
+    )
+    elapsed = time.perf_counter() - started
+
+    reachable = stats["spawn_stairs_distance"][stats["spawn_stairs_distance"] >= 0]
+    print(
+        f"levels={len(stats)} elapsed={elapsed:.2f}s levels/s={len(stats) / max(elapsed, 1e-9):.0f}"
+        f" rooms={stats['rooms'].mean():.1f} (min {stats['rooms'].min(initial=0)}, max {stats['rooms'].max(initial=0)})"
+        f" floor={stats['floor_ratio'].mean():.3f}"
+        f" spawn_stairs={reachable.mean() if len(reachable) else float('nan'):.1f}"
+        f" unreachable={len(stats) - len(reachable)}"
+    )
+    print(f"tiles -> {args.output}, stats -> {stats_path(args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
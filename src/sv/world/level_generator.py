@@ -1,18 +1,22 @@
 """Процедурный генератор уровней BSP с использованием tcod."""
 import random
 from typing import Any
+import numpy as np
 import tcod.bsp
 import tcod.los
+import tcod.random
+from .level_grid import LevelGrid
 from .tiles import FLOOR, STAIRS, WALL
 
 
 def _tunnel_between(
-    start: tuple[int, int], end: tuple[int, int]
+    start: tuple[int, int], end: tuple[int, int], rng: random.Random | None = None
 ) -> list[tuple[int, int]]:
     """Возвращает координаты L-образного туннеля между двумя точками."""
+    rng = rng if rng is not None else random
     x1, y1 = start
     x2, y2 = end
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         corner_x, corner_y = x2, y1
     else:
         corner_x, corner_y = x1, y2
@@ -33,21 +37,31 @@ class LevelGenerator:
         bsp_depth: int = 5,
         room_min_size: int = 3,
         room_max_size_ratio: float = 0.8,
+        seed: int | None = None,
+        rng: random.Random | None = None,
     ):
+        """
+        Все случайные решения (разбиение BSP, комнаты, туннели, лестница) берутся
+        из собственного rng генератора: одинаковый seed даёт побайтно одинаковые уровни,
+        а генераторы в разных потоках не делят глобальное состояние random.
+        """
         self.width = width
         self.height = height
         self.bsp_depth = bsp_depth
         self.room_min_size = room_min_size
         self.room_max_size_ratio = room_max_size_ratio
+        self.rng = rng if rng is not None else random.Random(seed)
+        # Комнаты последнего сгенерированного уровня: (x1, y1, x2, y2) включительно
+        self.rooms: list[tuple[int, int, int, int]] = []
 
-    def generate(self) -> tuple[list[list[int]], tuple[int, int], tuple[int, int]]:
+    def generate(self) -> tuple[LevelGrid, tuple[int, int], tuple[int, int]]:
         """
         Генерирует уровень BSP. Возвращает (level, player_spawn_xy, stairs_xy).
         level[y][x]: 0=void, 1=floor, 2=wall, 3=stairs.
         """
-        level: list[list[int]] = [
-            [WALL for _ in range(self.width)] for _ in range(self.height)
-        ]
+        # Карта собирается прямо в массиве uint8: комнаты вырезаются срезами
+        level = np.full((self.height, self.width), WALL, dtype=np.uint8)
+        rng = self.rng
 
         bsp = tcod.bsp.BSP(x=0, y=0, width=self.width, height=self.height)
         bsp.split_recursive(
@@ -56,18 +70,17 @@ class LevelGenerator:
             min_height=self.room_min_size + 2,
             max_horizontal_ratio=1.5,
             max_vertical_ratio=1.5,
+            seed=tcod.random.Random(tcod.random.MERSENNE_TWISTER, seed=rng.getrandbits(32)),
         )
 
         # Список (x1, y1, x2, y2) границ комнат для спавна/лестниц
         rooms: list[tuple[int, int, int, int]] = []
+        self.rooms = rooms
 
         def _carve_room(
             node: Any, x1: int, y1: int, x2: int, y2: int
         ) -> tuple[int, int]:
-            for y in range(y1, y2 + 1):
-                for x in range(x1, x2 + 1):
-                    if 0 <= y < self.height and 0 <= x < self.width:
-                        level[y][x] = FLOOR
+            level[max(0, y1):max(0, y2 + 1), max(0, x1):max(0, x2 + 1)] = FLOOR
             cx = (x1 + x2) // 2
             cy = (y1 + y2) // 2
             return (cx, cy)
@@ -78,9 +91,10 @@ class LevelGenerator:
                 c1 = _process_node(left)
                 c2 = _process_node(right)
                 if c1 is not None and c2 is not None:
-                    for x, y in _tunnel_between(c1, c2):
-                        if 0 <= y < self.height and 0 <= x < self.width:
-                            level[y][x] = FLOOR
+                    points = np.array(_tunnel_between(c1, c2, rng), dtype=np.intp).reshape(-1, 2)
+                    xs, ys = points[:, 0], points[:, 1]
+                    inside = (0 <= xs) & (xs < self.width) & (0 <= ys) & (ys < self.height)
+                    level[ys[inside], xs[inside]] = FLOOR
                 return c1 if c1 is not None else c2
 
             # Leaf: вырезаем комнату с отступом 1 от краев разделителя
@@ -93,11 +107,11 @@ class LevelGenerator:
             high_rh = min(int(h * self.room_max_size_ratio) or self.room_min_size, h)
             if high_rw < self.room_min_size or high_rh < self.room_min_size:
                 return None
-            rw = random.randint(self.room_min_size, high_rw)
-            rh = random.randint(self.room_min_size, high_rh)
+            rw = rng.randint(self.room_min_size, high_rw)
+            rh = rng.randint(self.room_min_size, high_rh)
             # позиция внутри узла с отступом 1
-            rx = node.x + 1 + random.randint(0, w - rw) if w > rw else node.x + 1
-            ry = node.y + 1 + random.randint(0, h - rh) if h > rh else node.y + 1
+            rx = node.x + 1 + rng.randint(0, w - rw) if w > rw else node.x + 1
+            ry = node.y + 1 + rng.randint(0, h - rh) if h > rh else node.y + 1
             x1, y1 = rx, ry
             x2, y2 = rx + rw - 1, ry + rh - 1
             center = _carve_room(node, x1, y1, x2, y2)
@@ -109,16 +123,14 @@ class LevelGenerator:
         if not rooms:
             # fallback: одна комната в центре
             cx, cy = self.width // 2, self.height // 2
-            for y in range(cy - 2, cy + 3):
-                for x in range(cx - 2, cx + 3):
-                    if 0 <= y < self.height and 0 <= x < self.width:
-                        level[y][x] = FLOOR
+            level[max(0, cy - 2):max(0, cy + 3), max(0, cx - 2):max(0, cx + 3)] = FLOOR
+            rooms.append((max(0, cx - 2), max(0, cy - 2), cx + 2, cy + 2))
             spawn_xy = (cx, cy)
             stairs_xy = (cx + 1, cy)
             sx, sy = stairs_xy
             if 0 <= sy < self.height and 0 <= sx < self.width:
-                level[sy][sx] = STAIRS
-            return (level, spawn_xy, stairs_xy)
+                level[sy, sx] = STAIRS
+            return (LevelGrid(level), spawn_xy, stairs_xy)
 
         # Спавн в центре первой комнаты
         x1, y1, x2, y2 = rooms[0]
@@ -128,12 +140,12 @@ class LevelGenerator:
         stairs_xy = spawn_xy
         other_rooms = rooms[1:]
         if other_rooms:
-            sr = random.choice(other_rooms)
+            sr = rng.choice(other_rooms)
             sx1, sy1, sx2, sy2 = sr
             # случайный пол в этой комнате
-            sx = random.randint(sx1, sx2)
-            sy = random.randint(sy1, sy2)
-            level[sy][sx] = STAIRS
+            sx = rng.randint(sx1, sx2)
+            sy = rng.randint(sy1, sy2)
+            level[sy, sx] = STAIRS
             stairs_xy = (sx, sy)
         else:
             # если комнатa одна — разместим лестницу внутри неё, но не в точке спавна
@@ -142,11 +154,11 @@ class LevelGenerator:
                 for x in range(x1, x2 + 1):
                     if (x, y) == spawn_xy:
                         continue
-                    level[y][x] = STAIRS
+                    level[y, x] = STAIRS
                     stairs_xy = (x, y)
                     placed = True
                     break
                 if placed:
                     break
 
-        return (level, spawn_xy, stairs_xy)
+        return (LevelGrid(level), spawn_xy, stairs_xy)
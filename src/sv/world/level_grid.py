@@ -0,0 +1,182 @@
+"""Сетка уровня на основе непрерывного массива numpy."""
+
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from .tiles import TRANSPARENT, VOID, WALKABLE
+
+
+def _build_lookup(allowed: Iterable[int]) -> np.ndarray:
+    """Таблица соответствия значение тайла -> bool для векторной проверки."""
+    lookup = np.zeros(256, dtype=bool)
+    for value in allowed:
+        lookup[int(value)] = True
+    lookup.flags.writeable = False
+    return lookup
+
+
+_WALKABLE_LOOKUP = _build_lookup(WALKABLE)
+_TRANSPARENT_LOOKUP = _build_lookup(TRANSPARENT)
+_WALKABLE_KEY = tuple(sorted(WALKABLE))
+_TRANSPARENT_KEY = tuple(sorted(TRANSPARENT))
+
+
+class LevelGrid:
+    """
+    Тайловая карта уровня: массив uint8 формы (height, width), индекс [y, x].
+    Поддерживает совместимый доступ level[y][x] и len(level) как у list[list[int]].
+
+    Каждая фактическая запись тайла увеличивает revision; маски проходимости и
+    прозрачности кэшируются по ревизии и пересчитываются только после изменений.
+    """
+
+    __slots__ = ("_tiles", "_revision", "_mask_cache", "_mask_revision")
+
+    def __init__(self, tiles: np.ndarray):
+        tiles = np.ascontiguousarray(tiles, dtype=np.uint8)
+        if tiles.ndim != 2:
+            raise ValueError("tiles must be a 2D array")
+        self._tiles = tiles
+        self._revision = 0
+        self._mask_cache: dict[object, np.ndarray] = {}
+        self._mask_revision = 0
+
+    @classmethod
+    def filled(cls, width: int, height: int, value: int = VOID) -> "LevelGrid":
+        """Создаёт сетку заданного размера, заполненную одним типом тайла."""
+        return cls(np.full((int(height), int(width)), int(value), dtype=np.uint8))
+
+    @classmethod
+    def from_rows(cls, rows) -> "LevelGrid":
+        """Создаёт сетку из вложенных списков level[y][x]."""
+        if isinstance(rows, LevelGrid):
+            return rows
+        if not rows:
+            return cls(np.zeros((0, 0), dtype=np.uint8))
+        return cls(np.array(rows, dtype=np.uint8))
+
+    @property
+    def width(self) -> int:
+        return int(self._tiles.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self._tiles.shape[0])
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    @property
+    def revision(self) -> int:
+        """Счётчик изменений тайлов; меняется только при фактической записи."""
+        return self._revision
+
+    @property
+    def tiles(self) -> np.ndarray:
+        """Представление массива тайлов только для чтения (без копирования)."""
+        view = self._tiles.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def walkable(self) -> np.ndarray:
+        """Булева маска проходимости формы (height, width), кэшируется по ревизии."""
+        return self._cached_mask("walkable", _WALKABLE_LOOKUP)
+
+    @property
+    def transparent(self) -> np.ndarray:
+        """Булева маска прозрачности формы (height, width), кэшируется по ревизии."""
+        return self._cached_mask("transparent", _TRANSPARENT_LOOKUP)
+
+    def mask_for(self, lookup: np.ndarray) -> np.ndarray:
+        """Строит булеву маску по таблице соответствия одной векторной операцией."""
+        mask = lookup[self._tiles]
+        mask.flags.writeable = False
+        return mask
+
+    def mask(self, allowed: Iterable[int]) -> np.ndarray:
+        """Возвращает булеву маску по набору разрешённых типов тайлов."""
+        key = tuple(sorted(int(value) for value in allowed))
+        if key == _WALKABLE_KEY:
+            return self.walkable
+        if key == _TRANSPARENT_KEY:
+            return self.transparent
+        return self._cached_mask(key, _build_lookup(key))
+
+    def _cached_mask(self, key: object, lookup: np.ndarray) -> np.ndarray:
+        if self._mask_revision != self._revision:
+            self._mask_cache.clear()
+            self._mask_revision = self._revision
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = self.mask_for(lookup)
+            self._mask_cache[key] = mask
+        return mask
+
+    def _touch(self) -> None:
+        self._revision += 1
+
+    def in_bounds(self, tx: int, ty: int) -> bool:
+        return 0 <= tx < self._tiles.shape[1] and 0 <= ty < self._tiles.shape[0]
+
+    def get(self, tx: int, ty: int, default: int = VOID) -> int:
+        """Возвращает тип тайла или default, если координаты вне карты."""
+        if not self.in_bounds(tx, ty):
+            return default
+        return int(self._tiles[ty, tx])
+
+    def set_tile(self, tx: int, ty: int, value: int) -> None:
+        """Записывает тип тайла (двери, раскопки, лестницы)."""
+        if self._tiles[ty, tx] == value:
+            return
+        self._tiles[ty, tx] = value
+        self._touch()
+
+    def is_walkable(self, tx: int, ty: int) -> bool:
+        return self.in_bounds(tx, ty) and bool(_WALKABLE_LOOKUP[self._tiles[ty, tx]])
+
+    def is_transparent(self, tx: int, ty: int) -> bool:
+        return self.in_bounds(tx, ty) and bool(_TRANSPARENT_LOOKUP[self._tiles[ty, tx]])
+
+    def positions_of(self, allowed: Iterable[int]) -> list[tuple[int, int]]:
+        """Возвращает координаты (x, y) всех тайлов из набора, в порядке строк."""
+        ys, xs = np.nonzero(self.mask(allowed))
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def tolist(self) -> list[list[int]]:
+        return self._tiles.tolist()
+
+    def copy(self) -> "LevelGrid":
+        return LevelGrid(self._tiles.copy())
+
+    # --- совместимость с list[list[int]] ---
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __bool__(self) -> bool:
+        return self._tiles.size > 0
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self.tiles)
+
+    def __getitem__(self, key):
+        return self.tiles[key]
+
+    def __setitem__(self, key, value) -> None:
+        if not isinstance(key, tuple):
+            raise TypeError("use level[y, x] = value or set_tile(x, y, value)")
+        self._tiles[key] = value
+        self._touch()
+
+    def __repr__(self) -> str:
+        return f"LevelGrid(width={self.width}, height={self.height})"
+
+
+def as_level_grid(level) -> LevelGrid:
+    """Приводит уровень (LevelGrid или list[list[int]]) к LevelGrid."""
+    if isinstance(level, LevelGrid):
+        return level
+    return LevelGrid.from_rows(level)
@@ -0,0 +1,96 @@
+"""Запекание статичного рельефа уровня в RGBA-изображение без отдельного спрайта на тайл."""
+
+import math
+
+import numpy as np
+
+from .level_grid import as_level_grid
+from .tiles import FLOOR, STAIRS, WALL
+
+# Номер тайла в tileset.png для каждого типа; VOID не рисуется (прозрачный)
+TERRAIN_TEXTURE_INDEX = {
+    FLOOR: 0,
+    WALL: 1,
+    STAIRS: 2,
+}
+
+# Сторона чанка рельефа в тайлах
+TERRAIN_CHUNK_SIZE = 16
+
+
+def load_tile_atlas(path, tile_size: int, count: int = len(TERRAIN_TEXTURE_INDEX)) -> np.ndarray:
+    """Загружает первые count тайлов из горизонтального спрайтшита: (count, size, size, 4) uint8."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        pixels = np.asarray(image.convert("RGBA"), dtype=np.uint8)
+    row = pixels[:tile_size, : tile_size * count]
+    if row.shape[1] < tile_size * count:
+        raise ValueError(f"tileset is too small for {count} tiles of {tile_size}px")
+    return np.ascontiguousarray(
+        row.reshape(tile_size, count, tile_size, 4).transpose(1, 0, 2, 3)
+    )
+
+
+def _palette(atlas: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Таблица значение тайла -> индекс в палитре; последний элемент палитры прозрачный."""
+    atlas = np.asarray(atlas, dtype=np.uint8)
+    transparent = np.zeros((1, *atlas.shape[1:]), dtype=np.uint8)
+    palette = np.concatenate([atlas, transparent])
+    lookup = np.full(256, len(atlas), dtype=np.intp)
+    for value, index in TERRAIN_TEXTURE_INDEX.items():
+        lookup[value] = index
+    return lookup, palette
+
+
+def bake_terrain(level, atlas: np.ndarray, bounds=None) -> np.ndarray:
+    """
+    Собирает изображение рельефа (height*size, width*size, 4) одной векторной операцией.
+    bounds = (x0, y0, x1, y1) ограничивает область тайлов (x1/y1 не включительно).
+    Строка 0 изображения — верх области (наибольший y), как ожидает текстура arcade.
+    """
+    tiles = as_level_grid(level).tiles
+    if bounds is not None:
+        x0, y0, x1, y1 = bounds
+        tiles = tiles[y0:y1, x0:x1]
+    lookup, palette = _palette(atlas)
+    height, width = tiles.shape
+    size = palette.shape[1]
+    # (h, w) -> (h, w, size, size, 4), затем строки тайлов склеиваются в строки пикселей
+    blocks = palette[lookup[tiles[::-1]]]
+    return blocks.transpose(0, 2, 1, 3, 4).reshape(height * size, width * size, 4)
+
+
+def chunk_bounds(width: int, height: int, chunk_size: int = TERRAIN_CHUNK_SIZE):
+    """Перебирает чанки карты: ((cx, cy), (x0, y0, x1, y1)); крайние чанки обрезаются по карте."""
+    for cy in range((height + chunk_size - 1) // chunk_size):
+        for cx in range((width + chunk_size - 1) // chunk_size):
+            x0 = cx * chunk_size
+            y0 = cy * chunk_size
+            yield (cx, cy), (x0, y0, min(x0 + chunk_size, width), min(y0 + chunk_size, height))
+
+
+def chunks_in_rect(rect, tile_size: int, chunk_size: int = TERRAIN_CHUNK_SIZE) -> tuple[int, int, int, int]:
+    """
+    Диапазон чанков (cx0, cy0, cx1, cy1), пересекающих мировой прямоугольник
+    (left, bottom, right, top); cx1/cy1 не включительно, без обрезки по карте.
+    """
+    left, bottom, right, top = rect
+    span = float(tile_size * chunk_size)
+    return (
+        math.floor(left / span),
+        math.floor(bottom / span),
+        math.floor(right / span) + 1,
+        math.floor(top / span) + 1,
+    )
+
+
+def bake_chunks(level, atlas: np.ndarray, chunk_size: int = TERRAIN_CHUNK_SIZE) -> dict[tuple[int, int], np.ndarray]:
+    """Запекает все непустые чанки карты: {(cx, cy): пиксели}; чанки из одного VOID пропускаются."""
+    grid = as_level_grid(level)
+    baked = {}
+    for key, bounds in chunk_bounds(grid.width, grid.height, chunk_size):
+        pixels = bake_terrain(grid, atlas, bounds)
+        if pixels[..., 3].any():
+            baked[key] = pixels
+    return baked
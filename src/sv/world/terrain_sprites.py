@@ -0,0 +1,68 @@
+"""Отрисовка запечённого рельефа через arcade: чанки-текстуры и отсечение по камере."""
+
+import arcade
+from PIL import Image
+
+from .terrain import TERRAIN_CHUNK_SIZE, chunks_in_rect
+
+
+def build_terrain_sprite(pixels, tile_size: int, bounds, hash: str | None = None) -> arcade.Sprite:
+    """
+    Создаёт спрайт из запечённых пикселей области bounds = (x0, y0, x1, y1),
+    выровненный по мировым координатам. hash задаёт имя текстуры в атласе
+    и избавляет от хэширования пикселей.
+    """
+    x0, y0, x1, y1 = bounds
+    # Хитбокс по границам: рельеф не участвует в столкновениях, а обход пикселей дорог
+    texture = arcade.Texture(
+        Image.fromarray(pixels, "RGBA"),
+        hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+        hash=hash,
+    )
+    sprite = arcade.Sprite(texture)
+    sprite.center_x = (x0 + x1) * tile_size / 2
+    sprite.center_y = (y0 + y1) * tile_size / 2
+    return sprite
+
+
+class TerrainChunks:
+    """
+    Рельеф, разбитый на чанки chunk_size x chunk_size тайлов, по текстуре на чанк.
+    visible — список спрайтов только тех чанков, что пересекают видимую область камеры;
+    он пересобирается лишь при смене диапазона чанков, поэтому стоимость отрисовки
+    не зависит от размера карты.
+    """
+
+    def __init__(
+        self,
+        baked: dict,
+        tile_size: int,
+        chunk_size: int = TERRAIN_CHUNK_SIZE,
+        name: str | None = None,
+    ):
+        """baked — результат bake_chunks; name делает имена текстур уникальными без хэширования."""
+        self.tile_size = int(tile_size)
+        self.chunk_size = int(chunk_size)
+        self.chunks: dict[tuple[int, int], arcade.Sprite] = {}
+        for (cx, cy), pixels in baked.items():
+            height, width = pixels.shape[:2]
+            x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+            bounds = (x0, y0, x0 + width // self.tile_size, y0 + height // self.tile_size)
+            texture_hash = f"terrain:{name}:{cx}:{cy}" if name is not None else None
+            self.chunks[(cx, cy)] = build_terrain_sprite(pixels, self.tile_size, bounds, texture_hash)
+        self.visible = arcade.SpriteList()
+        self._visible_range: tuple[int, int, int, int] | None = None
+
+    def update_visible(self, rect) -> None:
+        """Оставляет в visible чанки, пересекающие мировой прямоугольник (left, bottom, right, top)."""
+        chunk_range = chunks_in_rect(rect, self.tile_size, self.chunk_size)
+        if chunk_range == self._visible_range:
+            return
+        self._visible_range = chunk_range
+        cx0, cy0, cx1, cy1 = chunk_range
+        self.visible.clear()
+        for cy in range(cy0, cy1):
+            for cx in range(cx0, cx1):
+                sprite = self.chunks.get((cx, cy))
+                if sprite is not None:
+                    self.visible.append(sprite)
@@ -15,6 +15,9 @@ def is_tile_in(level, tx: int, ty: int, allowed: Iterable[int]) -> bool:
     """Проверяет, что тайл существует и входит в указанный набор значений."""
     if level is None:
         return False
+    if hasattr(level, "in_bounds"):
+        # LevelGrid: прямой доступ к массиву без построчного обхода
+        return level.in_bounds(tx, ty) and level.get(tx, ty) in tuple(allowed)
     max_y = len(level)
     if max_y == 0:
         return False
@@ -34,19 +37,24 @@ def is_tile_transparent(level, tx: int, ty: int) -> bool:
     return is_tile_in(level, tx, ty, TRANSPARENT)
 
 
-def build_tile_mask(level, allowed: Iterable[int]) -> list[list[bool]]:
-    """Строит булеву матрицу по набору разрешённых типов тайлов."""
+def build_tile_mask(level, allowed: Iterable[int]):
+    """
+    Строит булеву матрицу по набору разрешённых типов тайлов.
+    Для LevelGrid возвращает np.ndarray формы (height, width), иначе list[list[bool]].
+    """
+    if hasattr(level, "mask"):
+        return level.mask(allowed)
     if not level:
         return []
     allowed_values = tuple(allowed)
     return [[tile in allowed_values for tile in row] for row in level]
 
 
-def build_walkable_mask(level) -> list[list[bool]]:
+def build_walkable_mask(level):
     """Строит булеву матрицу проходимости."""
     return build_tile_mask(level, WALKABLE)
 
 
-def build_transparency_mask(level) -> list[list[bool]]:
+def build_transparency_mask(level):
     """Строит булеву матрицу прозрачности для проверки видимости."""
     return build_tile_mask(level, TRANSPARENT)
@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np
+
+from sv.ai.astar import astar_path
+from sv.ai.enemy_ai import build_path_to_target, choose_movement_action, find_bounded_path
+from sv.world.level_grid import LevelGrid
+
+
+class DummyActor:
+    def __init__(self, tile_x: int, tile_y: int):
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.blocking = True
+
+
+class DummyScene:
+    def __init__(self, entities):
+        self.sprite_lists = {"Entities": entities}
+
+
+def _path_cost(start, path):
+    total = 0
+    x, y = start
+    for nx, ny in path:
+        total += 3 if nx != x and ny != y else 2
+        x, y = nx, ny
+    return total
+
+
+class AStarTests(unittest.TestCase):
+    def test_path_ends_at_goal_and_excludes_start(self):
+        cost = np.ones((5, 5), dtype=np.int8)
+
+        path = astar_path(cost, (0, 0), (3, 0))
+
+        self.assertEqual(path, [(1, 0), (2, 0), (3, 0)])
+
+    def test_path_cost_matches_dijkstra(self):
+        rows = [[1 for _ in range(12)] for _ in range(12)]
+        for y in range(1, 11):
+            rows[y][6] = 2
+        level = LevelGrid.from_rows(rows)
+        enemy = DummyActor(2, 6)
+        scene = DummyScene([enemy])
+
+        bounded = find_bounded_path(enemy, (10, 6), level, scene)
+        reference = build_path_to_target(enemy, (10, 6), level, scene)
+
+        self.assertEqual(bounded[-1], (10, 6))
+        self.assertEqual(_path_cost((2, 6), bounded), _path_cost((2, 6), reference))
+
+    def test_unreachable_goal_returns_empty_path(self):
+        cost = np.ones((3, 5), dtype=np.int8)
+        cost[:, 2] = 0
+
+        self.assertEqual(astar_path(cost, (0, 1), (4, 1)), [])
+
+    def test_exhausted_budget_returns_none(self):
+        cost = np.ones((20, 20), dtype=np.int8)
+
+        self.assertIsNone(astar_path(cost, (0, 0), (19, 19), max_nodes=3))
+
+    def test_greedy_fallback_when_budget_runs_out(self):
+        level = LevelGrid.from_rows([[1 for _ in range(20)] for _ in range(20)])
+        enemy = DummyActor(0, 0)
+        scene = DummyScene([enemy])
+
+        self.assertIsNone(find_bounded_path(enemy, (15, 15), level, scene, max_nodes=1))
+        action = choose_movement_action(enemy, (15, 15), level, scene, max_nodes=1)
+
+        self.assertEqual((action.kind, action.dx, action.dy), ("move", 1, 1))
+
+    def test_detour_outside_window_falls_back_to_whole_map(self):
+        # Стена x=10 при y=0..35: обход идёт далеко за окно вокруг врага и цели
+        rows = [[1 for _ in range(30)] for _ in range(40)]
+        for y in range(36):
+            rows[y][10] = 2
+        level = LevelGrid.from_rows(rows)
+        enemy = DummyActor(8, 5)
+        scene = DummyScene([enemy])
+
+        reference = build_path_to_target(enemy, (12, 5), level, scene, margin=None)
+        self.assertEqual(len(reference), 62)
+        self.assertEqual(build_path_to_target(enemy, (12, 5), level, scene), reference)
+
+        bounded = find_bounded_path(enemy, (12, 5), level, scene)
+        self.assertEqual(bounded[-1], (12, 5))
+        self.assertEqual(_path_cost((8, 5), bounded), _path_cost((8, 5), reference))
+
+        action = choose_movement_action(enemy, (12, 5), level, scene)
+        self.assertEqual(action.kind, "move")
+        self.assertEqual((enemy.tile_x + action.dx, enemy.tile_y + action.dy), bounded[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+import tempfile
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np
+
+from sv.world.batch import run_batch, spawn_stairs_distance, stats_path
+from sv.world.level_generator import LevelGenerator
+
+
+class SpawnStairsDistanceTests(unittest.TestCase):
+    def test_counts_diagonal_steps_and_reports_unreachable(self):
+        walkable = np.zeros((3, 5), dtype=bool)
+        walkable[0, :3] = True
+        walkable[1, 3] = True
+        walkable[2, 4] = False
+        self.assertEqual(spawn_stairs_distance(walkable, (0, 0), (3, 1)), 3)
+        self.assertEqual(spawn_stairs_distance(walkable, (0, 0), (4, 2)), -1)
+
+
+class RunBatchTests(unittest.TestCase):
+    def test_streams_levels_and_stats_for_consecutive_seeds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "levels.npy"
+            seen = []
+            stats = run_batch(output, 4, seed=10, width=40, height=30, workers=1, on_level=lambda i, row: seen.append(i))
+
+            tiles = np.load(output, mmap_mode="r")
+            self.assertEqual(tiles.shape, (4, 30, 40))
+            self.assertEqual(seen, [0, 1, 2, 3])
+            self.assertEqual(list(stats["seed"]), [10, 11, 12, 13])
+            np.testing.assert_array_equal(np.load(stats_path(output)), stats)
+
+            for index in range(4):
+                generator = LevelGenerator(width=40, height=30, seed=10 + index)
+                level, _, _ = generator.generate()
+                np.testing.assert_array_equal(tiles[index], level.tiles)
+                self.assertEqual(stats["rooms"][index], len(generator.rooms))
+                self.assertAlmostEqual(float(stats["floor_ratio"][index]), float(level.walkable.mean()), places=5)
+                self.assertGreater(stats["spawn_stairs_distance"][index], 0)
+            del tiles
+
+    def test_process_pool_matches_inline_generation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            inline = run_batch(Path(tmp) / "a.npy", 6, seed=3, width=32, height=24, workers=1)
+            pooled = run_batch(Path(tmp) / "b.npy", 6, seed=3, width=32, height=24, workers=2)
+            np.testing.assert_array_equal(inline, pooled)
+            self.assertEqual((Path(tmp) / "a.npy").read_bytes(), (Path(tmp) / "b.npy").read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
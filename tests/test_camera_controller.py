@@ -91,6 +91,16 @@ class CameraControllerTests(unittest.TestCase):
         controller.zoom_out()
         self.assertEqual(controller.zoom, 1.0)
 
+    def test_visible_world_rect_follows_position_and_zoom(self):
+        camera = DummyCamera(200, 100, position=(500.0, 400.0), zoom=2.0)
+        controller = CameraController(camera, world_width=1000, world_height=1000, initial_zoom=2.0)
+
+        self.assertEqual(controller.visible_world_rect(), (450.0, 375.0, 550.0, 425.0))
+        self.assertEqual(controller.visible_world_rect(margin=10.0), (440.0, 365.0, 560.0, 435.0))
+
+        controller.zoom_out()
+        self.assertEqual(controller.visible_world_rect(), (400.0, 350.0, 600.0, 450.0))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.ai.chase_map import ChaseMaps
+from sv.ai.enemy_ai import decide_enemy_action
+from sv.core.collision import OccupancyIndex
+from sv.world.level_grid import LevelGrid
+
+
+class DummyActor:
+    def __init__(self, tile_x: int, tile_y: int):
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.blocking = True
+        self.notice_radius = 8
+        self.search_turn_limit = 3
+        self.is_alerted = False
+        self.last_seen_player_tile = None
+        self.search_turns_left = 0
+
+
+class ChaseMapsTests(unittest.TestCase):
+    def setUp(self):
+        self.level = LevelGrid.from_rows([
+            [1, 1, 1, 1, 1],
+            [1, 1, 2, 1, 1],
+            [1, 1, 2, 1, 1],
+            [1, 1, 2, 1, 1],
+            [1, 1, 1, 1, 1],
+        ])
+
+    def test_one_map_is_shared_by_all_chasers_of_the_same_goal(self):
+        chase_maps = ChaseMaps(self.level)
+        enemies = [DummyActor(0, 0), DummyActor(0, 4), DummyActor(1, 2)]
+        scene = OccupancyIndex(enemies)
+
+        steps = [chase_maps.next_step(enemy, (4, 2), scene) for enemy in enemies]
+
+        self.assertEqual(chase_maps.computed, 1)
+        self.assertNotIn(None, steps)
+
+    def test_step_descends_around_wall(self):
+        chase_maps = ChaseMaps(self.level)
+        enemy = DummyActor(1, 2)
+
+        step = chase_maps.next_step(enemy, (3, 2), OccupancyIndex([enemy]))
+
+        self.assertIn(step, [(1, 1), (1, 3)])
+        self.assertNotEqual(step, (2, 2))
+
+    def test_occupied_tiles_are_skipped(self):
+        level = LevelGrid.from_rows([[1 for _ in range(5)] for _ in range(5)])
+        chase_maps = ChaseMaps(level)
+        enemy = DummyActor(0, 2)
+        blocker = DummyActor(1, 2)
+
+        step = chase_maps.next_step(enemy, (4, 2), OccupancyIndex([enemy, blocker]))
+
+        self.assertIsNotNone(step)
+        self.assertNotEqual(step, (1, 2))
+
+    def test_maps_are_rebuilt_after_terrain_change(self):
+        chase_maps = ChaseMaps(self.level)
+        before = chase_maps.distance_map((3, 2))
+
+        self.level.set_tile(2, 2, 1)
+
+        after = chase_maps.distance_map((3, 2))
+        self.assertIsNot(before, after)
+        self.assertEqual(after[2, 2], 2)
+
+    def test_decide_enemy_action_uses_shared_maps(self):
+        level = LevelGrid.from_rows([[1 for _ in range(6)] for _ in range(6)])
+        chase_maps = ChaseMaps(level)
+        player = DummyActor(4, 1)
+        first = DummyActor(1, 1)
+        second = DummyActor(1, 3)
+        scene = OccupancyIndex([player, first, second])
+
+        actions = [decide_enemy_action(e, player, level, scene, chase_maps=chase_maps) for e in (first, second)]
+
+        self.assertEqual([a.kind for a in actions], ["move", "move"])
+        self.assertEqual(chase_maps.computed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
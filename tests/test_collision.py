@@ -8,7 +8,7 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from sv.core.collision import MoveResult, can_move
+from sv.core.collision import MoveResult, OccupancyIndex, can_move, commit_tile, iter_blocking_entities
 
 
 class DummyEntity:
@@ -29,6 +29,12 @@ class DummyScene:
         self.sprite_lists = {"Entities": entities}
 
 
+class IndexedScene:
+    def __init__(self, entities):
+        self.sprite_lists = {}
+        self.occupancy = OccupancyIndex(entities)
+
+
 class CollisionTests(unittest.TestCase):
     def setUp(self):
         # 2x2 all-walkable map
@@ -65,5 +71,64 @@ class CollisionTests(unittest.TestCase):
         self.assertIs(blocker, walling_entity)
 
 
+class OccupancyIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.level = [[1 for _ in range(4)] for _ in range(4)]
+
+    def test_index_blocks_move_without_scanning_sprite_lists(self):
+        mover = DummyEntity(0, 0)
+        blocker = DummyEntity(1, 0)
+        scene = IndexedScene([mover, blocker])
+
+        res, found, _, _ = can_move(mover, 1, 0, self.level, scene)
+
+        self.assertEqual(res, MoveResult.BLOCKED_ENTITY)
+        self.assertIs(found, blocker)
+
+    def test_non_blocking_entities_are_not_indexed(self):
+        mover = DummyEntity(0, 0)
+        item = NonBlockingEntity(1, 0)
+        index = OccupancyIndex([mover, item])
+
+        self.assertEqual(len(index), 1)
+        self.assertNotIn(item, index)
+
+    def test_commit_tile_moves_entity_in_index(self):
+        mover = DummyEntity(0, 0)
+        index = OccupancyIndex([mover])
+
+        self.assertTrue(commit_tile(mover, 2, 3))
+
+        self.assertIsNone(index.get(0, 0))
+        self.assertIs(index.get(2, 3), mover)
+
+    def test_refuses_to_overwrite_tile_held_by_another_entity(self):
+        mover = DummyEntity(0, 0)
+        blocker = DummyEntity(1, 0)
+        index = OccupancyIndex([mover, blocker])
+
+        self.assertFalse(index.move(mover, 1, 0))
+        self.assertFalse(commit_tile(mover, 1, 0))
+        self.assertFalse(index.add(DummyEntity(1, 0)))
+
+        self.assertIs(index.get(0, 0), mover)
+        self.assertIs(index.get(1, 0), blocker)
+        self.assertEqual((mover.tile_x, mover.tile_y), (0, 0))
+        self.assertEqual(len(index), 2)
+
+    def test_removed_entity_frees_tile(self):
+        mover = DummyEntity(0, 0)
+        blocker = DummyEntity(1, 0)
+        scene = IndexedScene([mover, blocker])
+
+        scene.occupancy.remove(blocker)
+
+        res, found, _, _ = can_move(mover, 1, 0, self.level, scene)
+        self.assertEqual(res, MoveResult.MOVED)
+        self.assertIsNone(found)
+        self.assertIsNone(blocker.occupancy)
+        self.assertEqual(list(iter_blocking_entities(scene)), [mover])
+
+
 if __name__ == "__main__":
     unittest.main()
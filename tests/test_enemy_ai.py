@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 import unittest
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -8,7 +9,8 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from sv.ai.enemy_ai import build_path_to_target, can_enemy_notice_player, decide_enemy_action
+from sv.ai import enemy_ai
+from sv.ai.enemy_ai import build_path_to_target, can_enemy_notice_player, choose_movement_action, decide_enemy_action
 
 
 class DummyScene:
@@ -153,6 +155,42 @@ class EnemyAITests(unittest.TestCase):
         self.assertTrue(path)
         self.assertNotEqual(path[0], (1, 2))
 
+    def test_cached_path_is_reused_while_goal_is_unchanged(self):
+        level = [[1 for _ in range(10)] for _ in range(10)]
+        enemy = DummyEnemy(0, 0)
+        scene = DummyScene([enemy])
+
+        with mock.patch.object(enemy_ai, "find_bounded_path", wraps=enemy_ai.find_bounded_path) as finder:
+            for _ in range(4):
+                self._apply_move(enemy, choose_movement_action(enemy, (6, 0), level, scene))
+
+        self.assertEqual((enemy.tile_x, enemy.tile_y), (4, 0))
+        self.assertEqual(finder.call_count, 1)
+
+    def test_cached_path_is_recomputed_when_next_step_is_blocked(self):
+        level = [[1 for _ in range(10)] for _ in range(10)]
+        enemy = DummyEnemy(0, 0)
+        blocker = DummyBlocker(9, 9)
+        scene = DummyScene([enemy, blocker])
+
+        self._apply_move(enemy, choose_movement_action(enemy, (6, 0), level, scene))
+        blocker.tile_x, blocker.tile_y = 2, 0
+        action = choose_movement_action(enemy, (6, 0), level, scene)
+
+        self.assertEqual(action.kind, "move")
+        self.assertNotEqual((enemy.tile_x + action.dx, enemy.tile_y + action.dy), (2, 0))
+
+    def test_cached_path_is_dropped_when_goal_changes(self):
+        level = [[1 for _ in range(10)] for _ in range(10)]
+        enemy = DummyEnemy(0, 0)
+        scene = DummyScene([enemy])
+
+        choose_movement_action(enemy, (6, 0), level, scene)
+        action = choose_movement_action(enemy, (0, 6), level, scene)
+
+        self.assertEqual((action.dx, action.dy), (0, 1))
+        self.assertEqual(enemy.cached_path_goal, (0, 6))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+import threading
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.sim.floors import FloorPrefetcher, prepare_floor
+from sv.world.terrain import load_tile_atlas
+from sv.world.tiles import WALKABLE
+
+
+class PrepareFloorTests(unittest.TestCase):
+    def test_same_seed_prepares_same_floor(self):
+        atlas = load_tile_atlas(ROOT / "assets" / "sprites" / "tileset.png", 32)
+        first = prepare_floor(99, 48, 32, atlas, enemies=3)
+        second = prepare_floor(99, 48, 32, atlas, enemies=3)
+
+        self.assertEqual(first.level.tiles.tobytes(), second.level.tiles.tobytes())
+        self.assertEqual(first.enemy_tiles, second.enemy_tiles)
+        self.assertEqual(len(first.enemy_tiles), 3)
+        for x, y in first.enemy_tiles:
+            self.assertIn(first.level.get(x, y), WALKABLE)
+            self.assertNotIn((x, y), (first.spawn_xy, first.stairs_xy))
+        self.assertEqual(first.chunks.keys(), second.chunks.keys())
+        self.assertTrue(first.chunks)
+
+    def test_without_atlas_skips_baking(self):
+        self.assertEqual(prepare_floor(1, 32, 24).chunks, {})
+
+
+class FloorPrefetcherTests(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.threads = []
+        self.prefetcher = FloorPrefetcher(prepare=self._prepare)
+        self.addCleanup(self.prefetcher.shutdown)
+
+    def _prepare(self, seed, *args):
+        self.calls.append((seed, args))
+        self.threads.append(threading.current_thread().name)
+        return seed
+
+    def test_take_returns_background_result_for_same_seed(self):
+        self.prefetcher.submit(5, "a")
+
+        self.assertEqual(self.prefetcher.take(5, "a"), 5)
+        self.assertEqual(self.calls, [(5, ("a",))])
+        self.assertTrue(self.threads[0].startswith("floor-prefetch"))
+
+    def test_take_prepares_synchronously_for_other_seed(self):
+        self.prefetcher.submit(5)
+        self.prefetcher._pending[1].result()
+
+        self.assertEqual(self.prefetcher.take(6), 6)
+        self.assertEqual(self.threads[-1], threading.current_thread().name)
+        # Заказ забран: повторный take готовит заново
+        self.assertEqual(self.prefetcher.take(5), 5)
+        self.assertEqual(len(self.calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
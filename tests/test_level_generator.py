@@ -32,6 +32,30 @@ class LevelGeneratorTests(unittest.TestCase):
         self.assertIn(level[sy][sx], WALKABLE)
         self.assertIn(level[ty][tx], WALKABLE)
         self.assertEqual(level[ty][tx], STAIRS)
+        self.assertEqual(level.tiles.shape, (30, 40))
+
+    @unittest.skipUnless(HAS_TCOD, "tcod is required for level generation tests")
+    def test_same_seed_gives_byte_identical_level(self):
+        from sv.world.level_generator import LevelGenerator
+
+        first = LevelGenerator(width=64, height=48, seed=1234).generate()
+        second = LevelGenerator(width=64, height=48, seed=1234).generate()
+        other = LevelGenerator(width=64, height=48, seed=4321).generate()
+
+        self.assertEqual(first[0].tiles.tobytes(), second[0].tiles.tobytes())
+        self.assertEqual(first[1:], second[1:])
+        self.assertNotEqual(first[0].tiles.tobytes(), other[0].tiles.tobytes())
+
+    @unittest.skipUnless(HAS_TCOD, "tcod is required for level generation tests")
+    def test_generation_does_not_touch_global_random(self):
+        import random
+
+        from sv.world.level_generator import LevelGenerator
+
+        random.seed(7)
+        state = random.getstate()
+        LevelGenerator(width=40, height=30, rng=random.Random(3)).generate()
+        self.assertEqual(random.getstate(), state)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np
+
+from sv.world.level_grid import LevelGrid, as_level_grid
+from sv.world.tiles import FLOOR, STAIRS, VOID, WALL, build_walkable_mask, is_tile_walkable
+
+
+class LevelGridTests(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            [WALL, WALL, WALL],
+            [WALL, FLOOR, STAIRS],
+            [VOID, WALL, WALL],
+        ]
+        self.grid = LevelGrid.from_rows(self.rows)
+
+    def test_list_compatibility_shim(self):
+        self.assertEqual(len(self.grid), 3)
+        self.assertEqual(len(self.grid[0]), 3)
+        self.assertEqual(self.grid[1][2], STAIRS)
+        self.assertEqual(self.grid.tolist(), self.rows)
+
+    def test_storage_is_contiguous_uint8(self):
+        tiles = self.grid.tiles
+
+        self.assertEqual(tiles.dtype, np.uint8)
+        self.assertTrue(tiles.flags.c_contiguous)
+        self.assertEqual(self.grid.shape, (3, 3))
+
+    def test_masks_match_tile_sets(self):
+        expected_walkable = [
+            [False, False, False],
+            [False, True, True],
+            [False, False, False],
+        ]
+        self.assertEqual(self.grid.walkable.tolist(), expected_walkable)
+        self.assertEqual(self.grid.transparent.tolist(), expected_walkable)
+        self.assertEqual(build_walkable_mask(self.grid).tolist(), expected_walkable)
+
+    def test_row_views_are_read_only(self):
+        with self.assertRaises(ValueError):
+            self.grid[1][1] = WALL
+        with self.assertRaises(ValueError):
+            self.grid.walkable[1, 1] = False
+
+    def test_set_tile_updates_masks(self):
+        self.grid.set_tile(1, 1, WALL)
+
+        self.assertEqual(self.grid[1][1], WALL)
+        self.assertFalse(self.grid.walkable[1, 1])
+        self.assertFalse(is_tile_walkable(self.grid, 1, 1))
+
+    def test_out_of_bounds_tiles_are_not_walkable(self):
+        self.assertFalse(self.grid.is_walkable(-1, 1))
+        self.assertFalse(is_tile_walkable(self.grid, 3, 1))
+        self.assertEqual(self.grid.get(5, 5), VOID)
+
+    def test_masks_are_cached_until_tiles_change(self):
+        walkable = self.grid.walkable
+        revision = self.grid.revision
+
+        self.assertIs(self.grid.walkable, walkable)
+        self.grid.set_tile(1, 1, FLOOR)
+        self.assertEqual(self.grid.revision, revision)
+        self.assertIs(self.grid.walkable, walkable)
+
+        self.grid.set_tile(0, 0, FLOOR)
+
+        self.assertEqual(self.grid.revision, revision + 1)
+        self.assertIsNot(self.grid.walkable, walkable)
+        self.assertTrue(self.grid.walkable[0, 0])
+
+    def test_item_assignment_bumps_revision(self):
+        revision = self.grid.revision
+
+        self.grid[2, 0:3] = FLOOR
+
+        self.assertEqual(self.grid.revision, revision + 1)
+        self.assertTrue(self.grid.walkable[2].all())
+
+    def test_as_level_grid_keeps_existing_grid(self):
+        self.assertIs(as_level_grid(self.grid), self.grid)
+        self.assertEqual(as_level_grid(self.rows).tolist(), self.rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.ai.enemy_ai import can_enemy_notice_player
+from sv.ai.perception import PlayerPerception, max_notice_radius
+from sv.world.level_grid import LevelGrid
+
+
+class DummyActor:
+    def __init__(self, tile_x: int, tile_y: int, notice_radius: int = 8):
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.notice_radius = notice_radius
+
+
+class PlayerPerceptionTests(unittest.TestCase):
+    def setUp(self):
+        self.level = LevelGrid.from_rows([
+            [1, 1, 1, 1, 1],
+            [1, 1, 2, 1, 1],
+            [1, 1, 2, 1, 1],
+            [1, 1, 2, 1, 1],
+            [1, 1, 1, 1, 1],
+        ])
+
+    def test_wall_hides_player(self):
+        perception = PlayerPerception()
+        enemy = DummyActor(1, 2)
+        player = DummyActor(3, 2)
+
+        self.assertFalse(perception.can_see(enemy, player, self.level))
+        self.assertFalse(can_enemy_notice_player(enemy, player, self.level, perception))
+
+    def test_clear_line_of_sight_is_seen(self):
+        perception = PlayerPerception()
+        enemy = DummyActor(0, 0)
+        player = DummyActor(4, 0)
+
+        self.assertTrue(perception.can_see(enemy, player, self.level))
+
+    def test_field_is_computed_once_for_all_enemies(self):
+        level = LevelGrid.from_rows([[1 for _ in range(12)] for _ in range(12)])
+        perception = PlayerPerception()
+        player = DummyActor(6, 6)
+        enemies = [DummyActor(x, y) for x in range(0, 12, 3) for y in range(0, 12, 3)]
+
+        perception.update(level, player, max_notice_radius(enemies))
+        for enemy in enemies:
+            self.assertEqual(
+                perception.can_see(enemy, player, level),
+                can_enemy_notice_player(enemy, player, level),
+            )
+
+        self.assertEqual(perception.computed, 1)
+
+    def test_field_is_recomputed_after_player_moves(self):
+        perception = PlayerPerception()
+        enemy = DummyActor(0, 0)
+        player = DummyActor(4, 2)
+        self.assertFalse(perception.can_see(enemy, player, self.level))
+
+        player.tile_y = 0
+
+        self.assertTrue(perception.can_see(enemy, player, self.level))
+        self.assertEqual(perception.computed, 2)
+
+    def test_enemy_radius_limits_noticing(self):
+        level = LevelGrid.from_rows([[1 for _ in range(12)] for _ in range(12)])
+        perception = PlayerPerception()
+        player = DummyActor(0, 0)
+        near_sighted = DummyActor(5, 0, notice_radius=3)
+
+        perception.update(level, player, 8)
+
+        self.assertFalse(perception.can_see(near_sighted, player, level))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import pstats
+import tempfile
+import threading
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.core import profiling
+from sv.sim import runner
+from sv.sim.floors import prepare_floor
+
+
+def _inside_phase():
+    return sum(range(100))
+
+
+def _outside_phase():
+    return sum(range(100))
+
+
+def _leaf():
+    return sum(range(2000))
+
+
+def _parent():
+    return _leaf() + _leaf()
+
+
+def _names(path) -> set[str]:
+    return {name for _file, _line, name in pstats.Stats(str(path)).stats}
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "out.pstats"
+        self.output = io.StringIO()
+
+    def tearDown(self):
+        profiling.stop(io.StringIO())
+        self.tmp.cleanup()
+
+    def test_disabled_phase_is_shared_noop(self):
+        self.assertIsNone(profiling.active())
+        self.assertIs(profiling.phase(profiling.PHASE_ENEMY_TURNS), profiling.phase(profiling.PHASE_GENERATION))
+        profiling.step("frame")
+        self.assertIsNone(profiling.stop())
+
+    def test_rejects_unknown_phase(self):
+        with self.assertRaises(ValueError):
+            profiling.Profiler(self.path, phases=("rendering",))
+
+    def test_phase_filter_profiles_only_selected_phases(self):
+        profiling.start(self.path, phases=(profiling.PHASE_ENEMY_TURNS,), unit="turn")
+        with profiling.phase(profiling.PHASE_ENEMY_TURNS):
+            _inside_phase()
+        with profiling.phase(profiling.PHASE_GENERATION):
+            _outside_phase()
+        _outside_phase()
+
+        self.assertEqual(profiling.stop(self.output), self.path)
+        names = _names(self.path)
+        self.assertIn("_inside_phase", names)
+        self.assertNotIn("_outside_phase", names)
+        self.assertTrue(profiling.folded_stacks_path(self.path).exists())
+        self.assertIn("phases=enemy_turns", self.output.getvalue())
+
+    def test_stops_collecting_after_limit(self):
+        profiler = profiling.start(self.path, limit=2, phases=(profiling.PHASE_ENEMY_TURNS,), unit="turn")
+        for _ in range(2):
+            with profiling.phase(profiling.PHASE_ENEMY_TURNS):
+                _inside_phase()
+            profiling.step("frame")
+            profiling.step("turn")
+        self.assertTrue(profiler.done)
+        with profiling.phase(profiling.PHASE_ENEMY_TURNS):
+            _outside_phase()
+        profiling.stop(self.output)
+
+        self.assertEqual(profiler.steps, 2)
+        self.assertNotIn("_outside_phase", _names(self.path))
+
+    def test_merges_profiles_from_worker_threads(self):
+        profiling.start(self.path, phases=(profiling.PHASE_GENERATION,))
+        worker = threading.Thread(target=prepare_floor, args=(7, 40, 30), name="floor-prefetch")
+        worker.start()
+        worker.join()
+        profiling.stop(self.output)
+        self.assertIn("generate", _names(self.path))
+
+    def test_whole_process_mode_includes_worker_thread_phases(self):
+        profiling.start(self.path)
+        worker = threading.Thread(target=prepare_floor, args=(7, 40, 30), name="floor-prefetch")
+        worker.start()
+        worker.join()
+        profiling.stop(self.output)
+        self.assertIn("generate", _names(self.path))
+
+    def test_soak_runner_profiles_a_fixed_number_of_turns(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(self.output):
+            runner.main(
+                ["--turns", "40", "--width", "40", "--height", "30", "--enemies", "3"]
+                + ["--profile", str(self.path), "--profile-turns", "10"]
+            )
+        self.assertIsNone(profiling.active())
+        self.assertIn("profile: 10 turn(s)", self.output.getvalue())
+        self.assertIn("run_enemy_turns", _names(self.path))
+
+    def test_collapsed_stacks_follow_call_edges(self):
+        profiler = profiling.Profiler(self.path)
+        profiler.start()
+        _parent()
+        stats = profiler.stats()
+
+        lines = profiling.collapsed_stacks(stats)
+        self.assertTrue(lines)
+        for line in lines:
+            stack, value = line.rsplit(" ", 1)
+            self.assertGreater(int(value), 0)
+            self.assertNotIn("\n", stack)
+        self.assertTrue(any("_parent (" in line and ";_leaf (" in line for line in lines))
+
+    def test_command_line_arguments(self):
+        parser = argparse.ArgumentParser()
+        profiling.add_arguments(parser, "turn")
+        args = parser.parse_args(
+            ["--profile", str(self.path), "--profile-turns", "50", "--profile-phase", "generation", "--profile-top", "5"]
+        )
+        profiler = profiling.start_from_args(args, "turn")
+        self.assertEqual((profiler.limit, profiler.unit, profiler.top), (50, "turn", 5))
+        self.assertEqual(profiler.phases, {"generation"})
+        self.assertIsNone(profiling.start_from_args(parser.parse_args([]), "turn"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import sys
+from pathlib import Path
+import tempfile
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.core.movement_input import MovementInputState
+from sv.sim import replay
+from sv.sim.replay import InputRecorder, ReplaySession, read_log
+
+LEFT, RIGHT, DOWN, UP = 1, 2, 3, 4
+
+
+def _recorder(path) -> InputRecorder:
+    recorder = InputRecorder(path)
+    recorder.begin(
+        100.0,
+        run_seed=7,
+        width=40,
+        height=30,
+        enemies=2,
+        movement_input=MovementInputState({LEFT: -1, RIGHT: 1}, {DOWN: -1, UP: 1}, diagonal_window=0.02),
+        simultaneous=True,
+        fast_forward=True,
+        move_duration=0.18,
+        fast_move_duration=0.04,
+    )
+    return recorder
+
+
+def _hold(recorder: InputRecorder, key: int, start: float, frames: int) -> float:
+    """Удерживает клавишу frames кадров по 1/60 с; возвращает время после отпускания."""
+    recorder.record(start, replay.DIRECTION_PRESS, key)
+    now = start
+    for _ in range(frames):
+        now += 1 / 60
+        recorder.record_frame(now, 1 / 60)
+    recorder.record(now, replay.DIRECTION_RELEASE, key)
+    return now
+
+
+class InputLogTests(unittest.TestCase):
+    def test_round_trip_keeps_header_bindings_and_events(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = _recorder(Path(tmp) / "run.svr")
+            recorder.record(100.5, replay.TRAVEL, 3, 4)
+            recorder.record_frame(100.6, 0.0125)
+            path = recorder.finish(101.0, replay.ReplaySummary(2, 9, (3, 4), 6))
+
+            log = read_log(path)
+            self.assertEqual((log.run_seed, log.width, log.height, log.enemies), (7, 40, 30, 2))
+            self.assertTrue(log.simultaneous and log.fast_forward)
+            self.assertAlmostEqual(log.duration, 1.0)
+            self.assertEqual(log.summary, replay.ReplaySummary(2, 9, (3, 4), 6))
+            self.assertEqual(log.events["kind"].tolist(), [replay.TRAVEL, replay.FRAME])
+            self.assertEqual((log.events["a"][0], log.events["b"][0]), (3, 4))
+            self.assertAlmostEqual(float(log.events["time"][0]), 0.5)
+            self.assertEqual(float(log.events["dt"][1]), 0.0125)
+            movement = log.movement_input()
+            self.assertEqual(dict(movement.horizontal_bindings), {LEFT: -1, RIGHT: 1})
+            self.assertEqual(dict(movement.vertical_bindings), {DOWN: -1, UP: 1})
+
+    def test_rejects_foreign_and_truncated_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            foreign = Path(tmp) / "foreign.svr"
+            foreign.write_bytes(b"\0" * 200)
+            with self.assertRaises(ValueError):
+                read_log(foreign)
+            path = _recorder(Path(tmp) / "run.svr").finish(100.0, replay.ReplaySummary())
+            path.write_bytes(path.read_bytes()[:-2])
+            with self.assertRaises(ValueError):
+                read_log(path)
+
+
+class ReplaySessionTests(unittest.TestCase):
+    def _log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = _recorder(Path(tmp) / "run.svr")
+            now = 100.0
+            for key in (RIGHT, UP, LEFT, DOWN) * 3:
+                now = _hold(recorder, key, now + 0.1, 40)
+            recorder.record(now + 0.1, replay.EXPLORE)
+            for _ in range(600):
+                now += 1 / 60
+                recorder.record_frame(now, 1 / 60)
+            return read_log(recorder.finish(now, replay.ReplaySummary()))
+
+    def test_same_log_replays_identically(self):
+        log = self._log()
+        first = ReplaySession(log)
+        summary = first.run()
+        # Счётчик ходов сбрасывается на новом этаже
+        self.assertTrue(summary.turn > 0 or summary.floor_number > 1)
+        self.assertEqual(first.frames, int((log.events["kind"] == replay.FRAME).sum()))
+        self.assertEqual(ReplaySession(log).run(), summary)
+
+    def test_moves_wait_for_animation_frames(self):
+        log = self._log()
+        log.events = log.events[:42]  # одно удержание RIGHT: нажатие, 40 кадров, отпускание
+        session = ReplaySession(log)
+        start = (session.engine.player.tile_x, session.engine.player.tile_y)
+        session.run()
+        steps = session.engine.turn
+        # Ускоренный шаг 0.04 с занимает три кадра и ещё один — фаза врагов
+        self.assertGreaterEqual(steps, 1)
+        self.assertLessEqual(steps, 40 // 3)
+        self.assertNotEqual((session.engine.player.tile_x, session.engine.player.tile_y), start)
+
+    def test_pause_clears_input_and_stops_auto_travel(self):
+        session = ReplaySession(self._log())
+        session.apply(0.0, replay.EXPLORE)
+        session.apply(0.0, replay.DIRECTION_PRESS, RIGHT)
+        session.apply(0.1, replay.PAUSE)
+        self.assertFalse(session.auto_travel.active)
+        self.assertFalse(session.movement_input.has_pressed_keys)
+        turn = session.engine.turn
+        session.apply(0.2, replay.FRAME, dt=1 / 60)
+        self.assertEqual(session.engine.turn, turn)
+
+    def test_fast_forward_toggle_mid_run_changes_step_length(self):
+        def hold_right(toggle: bool):
+            with tempfile.TemporaryDirectory() as tmp:
+                recorder = _recorder(Path(tmp) / "run.svr")
+                if toggle:
+                    # Ускорение выключено в меню паузы после начала забега
+                    recorder.record(100.0, replay.PAUSE)
+                    recorder.record(100.0, replay.FAST_FORWARD, 0)
+                    recorder.record(100.0, replay.RESUME)
+                now = _hold(recorder, RIGHT, 100.1, 40)
+                return read_log(recorder.finish(now, replay.ReplaySummary()))
+
+        fast = ReplaySession(hold_right(False))
+        fast.run()
+        toggled_log = hold_right(True)
+        self.assertTrue(toggled_log.fast_forward)
+        self.assertIn(replay.FAST_FORWARD, toggled_log.events["kind"].tolist())
+        slow = ReplaySession(toggled_log)
+        slow.run()
+
+        self.assertFalse(slow.fast_forward)
+        # Обычный шаг 0.18 с занимает 11 кадров вместо трёх
+        self.assertLessEqual(slow.engine.turn, 40 // 11 + 1)
+        self.assertLess(slow.engine.turn, fast.engine.turn)
+
+
+if __name__ == "__main__":
+    unittest.main()
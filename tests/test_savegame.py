@@ -0,0 +1,169 @@
+import sys
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np
+
+from sv.sim.actors import EnemyActor, PlayerActor
+from sv.sim.engine import SimulationEngine
+from sv.sim.savegame import (
+    ENTITY_DTYPE,
+    HEADER_SIZE,
+    SaveWriter,
+    apply_entity_records,
+    enemy_tiles,
+    read_save,
+    snapshot,
+    write_save,
+)
+from sv.world.level_grid import LevelGrid
+from sv.world.tiles import FLOOR, STAIRS, WALL
+
+
+def _engine():
+    level = LevelGrid.filled(12, 8, FLOOR)
+    level.set_tile(5, 5, WALL)
+    level.set_tile(10, 6, STAIRS)
+    player = PlayerActor(1, 1)
+    player.hp = 7
+    player.light = 4
+    alerted = EnemyActor(6, 2)
+    alerted.is_alerted = True
+    alerted.last_seen_player_tile = (2, 1)
+    alerted.search_turns_left = 2
+    alerted.hp = 3
+    idle = EnemyActor(9, 6)
+    dead = EnemyActor(3, 6)
+    dead.hp = 0
+    engine = SimulationEngine(level, player, [alerted, idle, dead])
+    engine.turn = 41
+    return engine
+
+
+class SaveRoundTripTests(unittest.TestCase):
+    def test_round_trip_restores_level_entities_and_explored(self):
+        engine = _engine()
+        state = snapshot(engine, floor_number=3, floor_seed=123, next_floor_seed=456)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_save(Path(tmp) / "slot.svs", state)
+            self.assertEqual(
+                path.stat().st_size,
+                HEADER_SIZE + 2 * 12 * 8 + 3 * ENTITY_DTYPE.itemsize,
+            )
+            self.assertEqual(list(Path(tmp).iterdir()), [path])
+
+            loaded = read_save(path)
+            self.assertIsInstance(loaded.tiles, np.memmap)
+            np.testing.assert_array_equal(loaded.tiles, engine.level.tiles)
+            np.testing.assert_array_equal(loaded.explored, engine.explored)
+            self.assertEqual(
+                (loaded.floor_number, loaded.floor_seed, loaded.next_floor_seed, loaded.turn),
+                (3, 123, 456, 41),
+            )
+            # Мёртвые враги не сохраняются
+            self.assertEqual(enemy_tiles(loaded.entities), [(6, 2), (9, 6)])
+
+            player = PlayerActor(1, 1)
+            enemies = [EnemyActor(x, y) for x, y in enemy_tiles(loaded.entities)]
+            apply_entity_records(loaded.entities, player, enemies)
+            self.assertEqual((player.hp, player.light), (7, 4))
+            self.assertTrue(enemies[0].is_alerted)
+            self.assertEqual(enemies[0].last_seen_player_tile, (2, 1))
+            self.assertEqual((enemies[0].hp, enemies[0].search_turns_left), (3, 2))
+            self.assertFalse(enemies[1].is_alerted)
+            self.assertIsNone(enemies[1].last_seen_player_tile)
+
+            # Copy-on-write: изменения загруженной сетки не попадают в файл
+            grid = LevelGrid(loaded.tiles)
+            grid.set_tile(0, 0, WALL)
+            del grid, loaded
+            np.testing.assert_array_equal(read_save(path).tiles, engine.level.tiles)
+
+    def test_in_memory_read_leaves_file_replaceable(self):
+        engine = _engine()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_save(Path(tmp) / "slot.svs", snapshot(engine, 1, 10, 11))
+            loaded = read_save(path, mmap=False)
+            self.assertNotIsInstance(loaded.tiles, np.memmap)
+            self.assertNotIsInstance(loaded.explored, np.memmap)
+            np.testing.assert_array_equal(loaded.tiles, engine.level.tiles)
+            np.testing.assert_array_equal(loaded.explored, engine.explored)
+
+            engine.turn = 77
+            write_save(path, snapshot(engine, 2, 11, 12))
+            self.assertEqual(read_save(path, mmap=False).turn, 77)
+            np.testing.assert_array_equal(loaded.tiles, engine.level.tiles)
+
+    def test_restore_explored_merges_mask(self):
+        engine = _engine()
+        mask = np.zeros(engine.level.shape, dtype=bool)
+        mask[7, 11] = True
+        version = engine.explored_version
+        engine.restore_explored(mask)
+        self.assertTrue(engine.explored[7, 11])
+        self.assertGreater(engine.explored_version, version)
+        with self.assertRaises(ValueError):
+            engine.restore_explored(np.zeros((2, 2), dtype=bool))
+
+    def test_rejects_foreign_and_truncated_files(self):
+        state = snapshot(_engine(), 1, 1, 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            foreign = Path(tmp) / "foreign.svs"
+            foreign.write_bytes(b"not a save" * 10)
+            with self.assertRaises(ValueError):
+                read_save(foreign)
+            path = write_save(Path(tmp) / "slot.svs", state)
+            path.write_bytes(path.read_bytes()[:-1])
+            with self.assertRaises(ValueError):
+                read_save(path)
+
+
+class SaveWriterTests(unittest.TestCase):
+    def test_writes_in_background_thread_and_replaces_atomically(self):
+        threads = []
+
+        def write(path, state):
+            threads.append(threading.current_thread().name)
+            return write_save(path, state)
+
+        writer = SaveWriter(write=write)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "slot.svs"
+            engine = _engine()
+            writer.submit(path, snapshot(engine, 1, 10, 11))
+            engine.turn = 99
+            writer.submit(path, snapshot(engine, 2, 11, 12))
+            writer.wait()
+            writer.shutdown()
+
+            loaded = read_save(path)
+            self.assertEqual((loaded.floor_number, loaded.turn), (2, 99))
+            self.assertEqual(list(Path(tmp).iterdir()), [path])
+            del loaded
+        self.assertTrue(all(name.startswith("save-writer") for name in threads))
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    def test_reports_failed_writes(self):
+        errors = []
+
+        def write(path, state):
+            raise OSError("disk full")
+
+        writer = SaveWriter(write=write, on_error=errors.append)
+        writer.submit("unused.svs", snapshot(_engine(), 1, 10, 11))
+        with self.assertRaises(OSError):
+            writer.wait()
+        writer.shutdown()
+        self.assertEqual([str(exc) for exc in errors], ["disk full"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import sys
+from pathlib import Path
+import random
+import unittest
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.ai.enemy_ai import EnemyAction
+from sv.core.collision import MoveResult
+from sv.sim import engine as engine_module
+from sv.sim import AttackEvent, EnemyActor, MoveEvent, PlayerActor, SimulationEngine
+from sv.sim.runner import build_engine, run_turns
+
+
+def open_level(width: int, height: int):
+    return [[1 for _ in range(width)] for _ in range(height)]
+
+
+class SimulationEngineTests(unittest.TestCase):
+    def test_player_move_commits_tile_and_spends_light(self):
+        engine = SimulationEngine(open_level(5, 5), PlayerActor(1, 1))
+
+        result = engine.player_move(1, 0)
+
+        self.assertTrue(result.acted)
+        self.assertEqual((engine.player.tile_x, engine.player.tile_y), (2, 1))
+        self.assertEqual(result.player_events, [MoveEvent(engine.player, (1, 1), (2, 1))])
+        self.assertEqual(engine.player.light, 9)
+
+    def test_bumping_wall_does_not_end_turn(self):
+        level = open_level(3, 3)
+        level[1][2] = 2
+        engine = SimulationEngine(level, PlayerActor(1, 1))
+
+        result = engine.step_move(1, 0)
+
+        self.assertFalse(result.acted)
+        self.assertEqual(result.move_result, MoveResult.BLOCKED_WALL)
+        self.assertEqual(engine.turn, 0)
+
+    def test_diagonal_move_falls_back_to_free_axis(self):
+        level = open_level(3, 3)
+        level[0][2] = 2
+        engine = SimulationEngine(level, PlayerActor(1, 1))
+
+        engine.player_move(1, -1)
+
+        self.assertEqual((engine.player.tile_x, engine.player.tile_y), (2, 1))
+
+    def test_player_attacks_enemy_in_the_way(self):
+        enemy = EnemyActor(2, 1, hp=1)
+        engine = SimulationEngine(open_level(5, 5), PlayerActor(1, 1), [enemy])
+
+        result = engine.step_move(1, 0)
+
+        self.assertEqual(result.move_result, MoveResult.BLOCKED_ENTITY)
+        self.assertEqual(result.player_events, [AttackEvent(engine.player, enemy)])
+        self.assertTrue(enemy.removed)
+        self.assertEqual(engine.living_enemies(), [])
+        self.assertIsNone(engine.occupancy.get(2, 1))
+
+    def test_enemy_chases_then_attacks(self):
+        enemy = EnemyActor(4, 1)
+        engine = SimulationEngine(open_level(8, 3), PlayerActor(1, 1), [enemy])
+
+        first = engine.step_wait()
+        self.assertEqual(first.enemy_events, [MoveEvent(enemy, (4, 1), (3, 1))])
+        engine.step_wait()
+        third = engine.step_wait()
+
+        self.assertEqual(third.enemy_events, [AttackEvent(enemy, engine.player)])
+        self.assertEqual(engine.player.hp, 9)
+        self.assertEqual(engine.turn, 3)
+
+    def test_enemies_never_share_a_tile(self):
+        enemies = [EnemyActor(6, y) for y in range(5)]
+        engine = SimulationEngine(open_level(8, 5), PlayerActor(0, 2), enemies)
+
+        for _ in range(6):
+            engine.step_wait()
+            tiles = [(e.tile_x, e.tile_y) for e in engine.living_enemies()]
+            self.assertEqual(len(tiles), len(set(tiles)))
+
+    def test_headless_run_plays_requested_turns(self):
+        rng = random.Random(1)
+        engine = build_engine(32, 24, enemies=3, rng=rng)
+
+        played = run_turns(engine, 50, rng)
+
+        self.assertGreater(played, 0)
+        self.assertEqual(engine.turn, played)
+
+    def test_quiet_until_enemy_is_alerted_or_sees_player(self):
+        far = EnemyActor(9, 1)
+        engine = SimulationEngine(open_level(12, 3), PlayerActor(0, 1), [far])
+        self.assertTrue(engine.is_quiet())
+
+        far.is_alerted = True
+        self.assertFalse(engine.is_quiet())
+
+        far.is_alerted = False
+        engine.add_enemy(EnemyActor(3, 1))
+        self.assertFalse(engine.is_quiet())
+
+        level = open_level(12, 3)
+        for y in range(3):
+            level[y][2] = 2
+        walled = SimulationEngine(level, PlayerActor(0, 1), [EnemyActor(4, 1)])
+        self.assertTrue(walled.is_quiet())
+
+
+class SimultaneousResolutionTests(unittest.TestCase):
+    """Решения врагов подменяются сценарием, чтобы проверять только разрешение ходов."""
+
+    def _run(self, enemies, moves, player=(0, 4)):
+        engine = SimulationEngine(open_level(6, 5), PlayerActor(*player), enemies, simultaneous=True)
+        decided = []
+
+        def scripted(enemy, *args, **kwargs):
+            decided.append((enemy.tile_x, enemy.tile_y))
+            return EnemyAction("move", *moves[id(enemy)])
+
+        with mock.patch.object(engine_module, "decide_enemy_action", side_effect=scripted):
+            events = engine.run_enemy_turns()
+        return engine, events, decided
+
+    def test_chain_moves_together_regardless_of_order(self):
+        # Ведомый стоит в списке раньше ведущего
+        follower = EnemyActor(1, 1)
+        leader = EnemyActor(2, 1)
+        engine, events, decided = self._run([follower, leader], {id(follower): (1, 0), id(leader): (1, 0)})
+
+        # Решения приняты по расстановке на начало хода
+        self.assertEqual(decided, [(1, 1), (2, 1)])
+        self.assertEqual((leader.tile_x, follower.tile_x), (3, 2))
+        self.assertEqual(len([e for e in events if isinstance(e, MoveEvent)]), 2)
+
+    def test_two_enemies_cannot_claim_same_tile(self):
+        first = EnemyActor(1, 1)
+        second = EnemyActor(3, 1)
+        engine, events, _ = self._run([first, second], {id(first): (1, 0), id(second): (-1, 0)})
+
+        self.assertEqual((first.tile_x, first.tile_y), (2, 1))
+        self.assertEqual((second.tile_x, second.tile_y), (3, 1))
+        self.assertEqual(events, [MoveEvent(first, (1, 1), (2, 1))])
+        self.assertIs(engine.occupancy.get(2, 1), first)
+
+    def test_enemies_do_not_swap_places(self):
+        left = EnemyActor(1, 1)
+        right = EnemyActor(2, 1)
+        _, events, _ = self._run([left, right], {id(left): (1, 0), id(right): (-1, 0)})
+
+        self.assertEqual(events, [])
+        self.assertEqual((left.tile_x, right.tile_x), (1, 2))
+
+    def test_move_into_player_becomes_attack(self):
+        enemy = EnemyActor(1, 1)
+        engine, events, _ = self._run([enemy], {id(enemy): (-1, 0)}, player=(0, 1))
+
+        self.assertEqual(events, [AttackEvent(enemy, engine.player)])
+        self.assertEqual(engine.player.hp, 9)
+
+    def test_simultaneous_soak_keeps_occupancy_consistent(self):
+        rng = random.Random(11)
+        engine = build_engine(48, 36, enemies=25, rng=rng, simultaneous=True)
+
+        run_turns(engine, 100, rng)
+
+        tiles = [(e.tile_x, e.tile_y) for e in engine.living_enemies()]
+        self.assertEqual(len(tiles), len(set(tiles)))
+        for enemy in engine.living_enemies():
+            self.assertIs(engine.occupancy.get(enemy.tile_x, enemy.tile_y), enemy)
+
+
+class SimultaneousChaseTests(unittest.TestCase):
+    """Одновременные ходы с настоящим ИИ врагов."""
+
+    def _corridor_chase(self, order, simultaneous):
+        # Коридор шириной в один тайл: стены сверху и снизу
+        level = open_level(8, 3)
+        for x in range(8):
+            level[0][x] = 2
+            level[2][x] = 2
+        enemies = {x: EnemyActor(x, 1) for x in (3, 4, 5)}
+        engine = SimulationEngine(level, PlayerActor(0, 1), [enemies[x] for x in order], simultaneous=simultaneous)
+        events = engine.run_enemy_turns()
+        return [enemies[x].tile_x for x in (3, 4, 5)], events
+
+    def test_corridor_column_advances_together(self):
+        for order in ((3, 4, 5), (5, 4, 3)):
+            with self.subTest(order=order):
+                positions, events = self._corridor_chase(order, simultaneous=True)
+                self.assertEqual(positions, [2, 3, 4])
+                self.assertEqual(len([e for e in events if isinstance(e, MoveEvent)]), 3)
+
+    def test_corridor_matches_sequential_resolution(self):
+        sequential, _ = self._corridor_chase((3, 4, 5), simultaneous=False)
+        simultaneous, _ = self._corridor_chase((5, 4, 3), simultaneous=True)
+        self.assertEqual(simultaneous, sequential)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np
+
+from sv.world.level_grid import LevelGrid
+from sv.world.terrain import (
+    TERRAIN_TEXTURE_INDEX,
+    bake_terrain,
+    chunk_bounds,
+    chunks_in_rect,
+    load_tile_atlas,
+)
+from sv.world.tiles import FLOOR, STAIRS, VOID, WALL
+
+
+def _solid_atlas(size: int) -> np.ndarray:
+    """Тайл i залит значением 10*(i+1) во всех каналах."""
+    atlas = np.zeros((len(TERRAIN_TEXTURE_INDEX), size, size, 4), dtype=np.uint8)
+    for index in range(len(atlas)):
+        atlas[index] = 10 * (index + 1)
+    return atlas
+
+
+class BakeTerrainTests(unittest.TestCase):
+    def test_tiles_land_in_place_with_top_row_first(self):
+        size = 2
+        grid = LevelGrid.from_rows(
+            [
+                [WALL, FLOOR, VOID],  # y = 0, низ карты
+                [STAIRS, WALL, FLOOR],  # y = 1, верх карты
+            ]
+        )
+        image = bake_terrain(grid, _solid_atlas(size))
+
+        self.assertEqual(image.shape, (2 * size, 3 * size, 4))
+        self.assertEqual(image.dtype, np.uint8)
+
+        def pixel(tx, ty):
+            # Строка 0 изображения соответствует наибольшему y
+            row = (grid.height - 1 - ty) * size
+            return int(image[row, tx * size, 0])
+
+        self.assertEqual(pixel(0, 0), 10 * (TERRAIN_TEXTURE_INDEX[WALL] + 1))
+        self.assertEqual(pixel(1, 0), 10 * (TERRAIN_TEXTURE_INDEX[FLOOR] + 1))
+        self.assertEqual(pixel(0, 1), 10 * (TERRAIN_TEXTURE_INDEX[STAIRS] + 1))
+        self.assertEqual(pixel(2, 0), 0)
+        self.assertTrue((image[size:, 2 * size :] == 0).all())
+
+    def test_tile_pixels_keep_their_orientation(self):
+        size = 2
+        atlas = np.zeros((len(TERRAIN_TEXTURE_INDEX), size, size, 4), dtype=np.uint8)
+        atlas[TERRAIN_TEXTURE_INDEX[FLOOR]] = [[[1] * 4, [2] * 4], [[3] * 4, [4] * 4]]
+        image = bake_terrain(LevelGrid.filled(1, 1, FLOOR), atlas)
+        np.testing.assert_array_equal(image, atlas[TERRAIN_TEXTURE_INDEX[FLOOR]])
+
+    def test_loads_game_tileset(self):
+        atlas = load_tile_atlas(ROOT / "assets" / "sprites" / "tileset.png", 32)
+        self.assertEqual(atlas.shape, (3, 32, 32, 4))
+
+    def test_bounds_bake_matches_slice_of_full_image(self):
+        size = 2
+        rows = [[(x + y) % 4 for x in range(5)] for y in range(4)]
+        grid = LevelGrid.from_rows(rows)
+        atlas = _solid_atlas(size)
+        full = bake_terrain(grid, atlas)
+        part = bake_terrain(grid, atlas, (1, 2, 4, 4))
+        # Область y 2..3 — верхние две строки тайлов полного изображения
+        np.testing.assert_array_equal(part, full[0 : 2 * size, 1 * size : 4 * size])
+
+
+class TerrainChunkTests(unittest.TestCase):
+    def test_chunk_bounds_cover_map_and_clip_edges(self):
+        chunks = dict(chunk_bounds(40, 20, 16))
+        self.assertEqual(len(chunks), 3 * 2)
+        self.assertEqual(chunks[(0, 0)], (0, 0, 16, 16))
+        self.assertEqual(chunks[(2, 1)], (32, 16, 40, 20))
+        covered = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in chunks.values())
+        self.assertEqual(covered, 40 * 20)
+
+    def test_chunks_in_rect_selects_intersecting_range(self):
+        span = 32 * 16
+        self.assertEqual(chunks_in_rect((0, 0, span - 1, span - 1), 32, 16), (0, 0, 1, 1))
+        self.assertEqual(chunks_in_rect((span - 1, 10, span + 1, 20), 32, 16), (0, 0, 2, 1))
+        self.assertEqual(chunks_in_rect((-5, -5, 5, 5), 32, 16), (-1, -1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
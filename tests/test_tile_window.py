@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np
+
+from sv.ai.enemy_ai import build_path_to_target, can_enemy_notice_player
+from sv.ai.window import TileWindow
+from sv.world.level_grid import LevelGrid
+
+
+class DummyActor:
+    def __init__(self, tile_x: int, tile_y: int):
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.blocking = True
+        self.notice_radius = 8
+
+
+class DummyScene:
+    def __init__(self, entities):
+        self.sprite_lists = {"Entities": entities}
+
+
+class TileWindowTests(unittest.TestCase):
+    def test_window_is_clipped_to_map_bounds(self):
+        window = TileWindow.around((10, 20), (1, 8), 3)
+
+        self.assertEqual((window.x0, window.y0, window.x1, window.y1), (0, 5, 5, 10))
+        self.assertEqual((window.width, window.height), (5, 5))
+
+    def test_crop_is_a_view_with_translated_coordinates(self):
+        array = np.arange(100).reshape(10, 10)
+        window = TileWindow.covering(array.shape, ((4, 4), (6, 5)), 1)
+
+        cropped = window.crop(array)
+        lx, ly = window.to_local(6, 5)
+
+        self.assertTrue(np.shares_memory(cropped, array))
+        self.assertEqual(cropped[ly, lx], array[5, 6])
+        self.assertEqual(window.to_world(lx, ly), (6, 5))
+
+    def test_cropped_path_is_in_world_coordinates(self):
+        level = LevelGrid.from_rows([[1 for _ in range(80)] for _ in range(60)])
+        enemy = DummyActor(40, 30)
+        player = DummyActor(44, 30)
+
+        path = build_path_to_target(enemy, (44, 30), level, DummyScene([enemy, player]), margin=2)
+
+        self.assertEqual(path[-1], (44, 30))
+        self.assertEqual(path[0], (41, 30))
+
+    def test_cropped_fov_far_from_origin(self):
+        rows = [[1 for _ in range(80)] for _ in range(60)]
+        rows[30][42] = 2
+        level = LevelGrid.from_rows(rows)
+
+        self.assertFalse(can_enemy_notice_player(DummyActor(40, 30), DummyActor(44, 30), level))
+        self.assertTrue(can_enemy_notice_player(DummyActor(40, 35), DummyActor(44, 35), level))
+
+
+if __name__ == "__main__":
+    unittest.main()
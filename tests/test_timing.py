@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np
+
+from sv.core.timing import FrameTimings, PhaseStats, RingBuffer
+from sv.ui.debug_overlay import format_debug_lines
+
+
+class RingBufferTests(unittest.TestCase):
+    def test_keeps_last_values_in_order(self):
+        buffer = RingBuffer(3)
+        buffer.push(1.0)
+        buffer.push(2.0)
+        np.testing.assert_array_equal(buffer.values(), [1.0, 2.0])
+        for value in (3.0, 4.0, 5.0):
+            buffer.push(value)
+        self.assertEqual(len(buffer), 3)
+        np.testing.assert_array_equal(buffer.values(), [3.0, 4.0, 5.0])
+        buffer.clear()
+        self.assertEqual(len(buffer.values()), 0)
+
+    def test_rejects_empty_capacity(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+
+class FrameTimingsTests(unittest.TestCase):
+    def test_disabled_spans_record_nothing(self):
+        timings = FrameTimings()
+        with timings.span("update"):
+            pass
+        timings.record("frame", 0.016)
+        self.assertEqual(timings.phases, [])
+        self.assertIs(timings.span("a"), timings.span("b"))
+
+    def test_spans_feed_percentiles_in_milliseconds(self):
+        timings = FrameTimings(capacity=100, enabled=True)
+        for value in range(1, 101):
+            timings.record("draw", value / 1000.0)
+        with timings.span("update"):
+            pass
+
+        stats = timings.stats()
+        self.assertEqual(list(stats), ["draw", "update"])
+        draw = stats["draw"]
+        self.assertAlmostEqual(draw.p50, 50.5)
+        self.assertAlmostEqual(draw.p95, 95.05)
+        self.assertAlmostEqual(draw.max, 100.0)
+        self.assertEqual(draw.samples, 100)
+        self.assertEqual(stats["update"].samples, 1)
+        self.assertGreaterEqual(stats["update"].max, 0.0)
+
+    def test_capacity_bounds_samples(self):
+        timings = FrameTimings(capacity=4, enabled=True)
+        for value in (9.0, 9.0, 1.0, 1.0, 1.0, 1.0):
+            timings.record("frame", value)
+        self.assertEqual(timings.stats()["frame"].max, 1000.0)
+
+
+class DebugLinesTests(unittest.TestCase):
+    def test_formats_phase_table_and_counts(self):
+        lines = format_debug_lines({"draw": PhaseStats(1.0, 2.5, 4.0, 10)}, {"entities": 3, "sprites": 7})
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("draw"))
+        self.assertIn("2.50", lines[1])
+        self.assertEqual(lines[2], "entities=3  sprites=7")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+import json
+import tempfile
+import threading
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.core import trace
+from sv.core.timing import FrameTimings
+from sv.sim.actors import EnemyActor, PlayerActor
+from sv.sim.engine import SimulationEngine
+from sv.world.level_grid import LevelGrid
+from sv.world.tiles import FLOOR
+
+
+class TraceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "trace.json"
+
+    def tearDown(self):
+        trace.stop()
+        self.tmp.cleanup()
+
+    def _events(self) -> list[dict]:
+        return json.loads(self.path.read_text(encoding="utf-8"))["traceEvents"]
+
+    def test_disabled_span_is_shared_noop(self):
+        self.assertIsNone(trace.active())
+        with trace.span("anything") as span:
+            self.assertFalse(span)
+            span.annotate(ignored=1)
+        self.assertIs(trace.span("other"), span)
+        self.assertIsNone(trace.stop())
+
+    def test_writes_complete_events_with_args_and_thread_names(self):
+        trace.start(self.path)
+        with trace.span("outer", "turn") as span:
+            span.annotate(turn=3)
+            with trace.span("inner", "ai"):
+                pass
+
+        def background():
+            with trace.span("background"):
+                pass
+
+        worker = threading.Thread(target=background, name="floor-prefetch")
+        worker.start()
+        worker.join()
+
+        self.assertEqual(trace.stop(), self.path)
+        self.assertIsNone(trace.active())
+        events = self._events()
+        complete = {event["name"]: event for event in events if event["ph"] == "X"}
+        self.assertEqual(set(complete), {"outer", "inner", "background"})
+        self.assertEqual(complete["outer"]["cat"], "turn")
+        self.assertEqual(complete["outer"]["args"], {"turn": 3})
+        self.assertNotIn("args", complete["inner"])
+        self.assertLessEqual(complete["outer"]["ts"], complete["inner"]["ts"])
+        self.assertGreaterEqual(complete["outer"]["dur"], complete["inner"]["dur"])
+        self.assertNotEqual(complete["background"]["tid"], complete["outer"]["tid"])
+        thread_names = {event["args"]["name"] for event in events if event["ph"] == "M"}
+        self.assertIn("floor-prefetch", thread_names)
+
+    def test_counts_events_beyond_limit(self):
+        tracer = trace.start(self.path, max_events=2)
+        for _ in range(5):
+            with trace.span("step"):
+                pass
+        self.assertEqual(len(tracer), 2)
+        trace.stop()
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(data["otherData"]["dropped_events"], 3)
+
+    def test_frame_timings_trace_even_when_disabled(self):
+        trace.start(self.path)
+        timings = FrameTimings(enabled=False)
+        with timings.span("draw"):
+            pass
+        enabled = FrameTimings(enabled=True)
+        with enabled.span("update"):
+            pass
+        trace.stop()
+        names = [event["name"] for event in self._events() if event["ph"] == "X"]
+        self.assertEqual(names, ["draw", "update"])
+        self.assertEqual(len(enabled.buffer("update")), 1)
+        self.assertEqual(timings.phases, [])
+
+    def test_engine_turn_traces_enemy_decisions(self):
+        level = LevelGrid.filled(10, 6, FLOOR)
+        engine = SimulationEngine(level, PlayerActor(1, 1), [EnemyActor(6, 2), EnemyActor(8, 4)])
+        trace.start(self.path)
+        engine.player_move(1, 0)
+        engine.run_enemy_turns()
+        trace.stop()
+        events = [event for event in self._events() if event["ph"] == "X"]
+        names = [event["name"] for event in events]
+        self.assertIn("player_move", names)
+        self.assertIn("enemy_turns", names)
+        decisions = [event for event in events if event["name"] == "decide_enemy_action"]
+        self.assertEqual(len(decisions), 2)
+        self.assertEqual({event["cat"] for event in decisions}, {"ai"})
+        self.assertTrue(all("action" in event["args"] for event in decisions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+import random
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.sim import AutoTravel, EnemyActor, PlayerActor, SimulationEngine
+from sv.sim.runner import build_engine
+
+
+def corridor_level(width: int, height: int = 3):
+    """Коридор по средней строке, остальное — стены."""
+    return [[1 if y == 1 else 2 for _ in range(width)] for y in range(height)]
+
+
+def drive(engine, auto, limit: int = 500) -> int:
+    steps = 0
+    while steps < limit:
+        move = auto.next_move()
+        if move is None:
+            break
+        engine.step_move(*move)
+        steps += 1
+    return steps
+
+
+class AutoTravelTests(unittest.TestCase):
+    def test_travel_reaches_explored_goal_and_stops(self):
+        engine = SimulationEngine(corridor_level(8), PlayerActor(0, 1))
+        auto = AutoTravel(engine)
+
+        self.assertTrue(auto.start_travel((5, 1)))
+        steps = drive(engine, auto)
+
+        self.assertEqual(steps, 5)
+        self.assertEqual((engine.player.tile_x, engine.player.tile_y), (5, 1))
+        self.assertFalse(auto.active)
+
+    def test_travel_refuses_walls_and_unexplored_tiles(self):
+        engine = SimulationEngine(corridor_level(40), PlayerActor(0, 1))
+        auto = AutoTravel(engine)
+
+        self.assertFalse(auto.start_travel((3, 0)))
+        self.assertFalse(auto.start_travel((39, 1)))
+        self.assertFalse(auto.active)
+
+    def test_explore_opens_whole_level(self):
+        engine = build_engine(48, 36, enemies=0, rng=random.Random(3))
+        auto = AutoTravel(engine)
+        version = engine.explored_version
+
+        auto.start_explore()
+        drive(engine, auto, limit=5000)
+
+        walkable = engine.level.walkable
+        self.assertFalse(auto.active)
+        self.assertGreater(engine.explored_version, version)
+        self.assertTrue(engine.explored[walkable].all())
+
+    def test_enemy_sighting_interrupts(self):
+        enemy = EnemyActor(12, 1)
+        engine = SimulationEngine(corridor_level(30), PlayerActor(0, 1), [enemy])
+        auto = AutoTravel(engine)
+
+        auto.start_explore()
+        drive(engine, auto)
+
+        self.assertFalse(auto.active)
+        self.assertTrue(enemy.is_alerted)
+        # Остановились на первом же ходу, когда враг заметил игрока (и шагнул навстречу)
+        self.assertEqual(enemy.tile_x - engine.player.tile_x, enemy.notice_radius - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sv.core.tween import TweenManager
+
+
+class DummyMover:
+    """Контракт Entity для TweenManager: position, moving и finish_move."""
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self.position = (x, y)
+        self.moving = False
+        self.tweens = None
+        self.target = (x, y)
+        self.on_move_complete = None
+
+    def start_move(self, target, duration: float):
+        self.moving = True
+        self.target = target
+        self.tweens.start(self, self.position, target, duration)
+
+    def finish_move(self):
+        self.position = self.target
+        self.moving = False
+        if callable(self.on_move_complete):
+            self.on_move_complete()
+
+
+class TweenManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.tweens = TweenManager(capacity=1)
+
+    def _mover(self, x=0.0, y=0.0):
+        mover = DummyMover(x, y)
+        self.tweens.attach(mover)
+        return mover
+
+    def test_ease_out_and_exact_end(self):
+        mover = self._mover()
+        mover.start_move((32.0, -32.0), duration=1.0)
+
+        self.tweens.update(0.5)
+        self.assertEqual(mover.position, (24.0, -24.0))
+        self.assertTrue(mover.moving)
+
+        self.tweens.update(0.75)
+        self.assertEqual(mover.position, (32.0, -32.0))
+        self.assertFalse(mover.moving)
+        self.assertEqual(len(self.tweens), 0)
+
+    def test_positions_snap_to_pixel_grid_while_moving(self):
+        mover = self._mover()
+        mover.start_move((10.0, 0.0), duration=1.0)
+
+        self.tweens.update(0.1, zoom=2.0)
+
+        # ease(0.1) = 0.19 -> 1.9 -> привязка к шагу 0.5
+        self.assertEqual(mover.position, (2.0, 0.0))
+
+    def test_many_movers_grow_storage_and_finish_in_one_pass(self):
+        movers = [self._mover(float(i), 0.0) for i in range(5)]
+        finished = []
+        for index, mover in enumerate(movers):
+            mover.on_move_complete = lambda i=index: finished.append(i)
+            mover.start_move((float(index), 32.0), duration=0.1 * (index + 1))
+
+        self.tweens.update(0.25)
+
+        self.assertEqual(finished, [0, 1])
+        self.assertEqual(len(self.tweens), 3)
+        self.assertEqual(movers[1].position, (1.0, 32.0))
+        self.assertTrue(all(mover.moving for mover in movers[2:]))
+        # Оставшиеся твины продолжаются с правильными данными после уплотнения
+        self.tweens.update(1.0)
+        self.assertEqual(finished, [0, 1, 2, 3, 4])
+        self.assertEqual([m.position for m in movers], [(float(i), 32.0) for i in range(5)])
+
+    def test_hook_can_start_next_move_for_next_frame(self):
+        first = self._mover()
+        second = self._mover(100.0, 0.0)
+        first.on_move_complete = lambda: second.start_move((132.0, 0.0), duration=1.0)
+        first.start_move((32.0, 0.0), duration=0.1)
+
+        self.tweens.update(0.2)
+        self.assertIn(second, self.tweens)
+        self.assertEqual(second.position, (100.0, 0.0))
+
+    def test_discard_drops_tween_without_hook(self):
+        mover = self._mover()
+        calls = []
+        mover.on_move_complete = lambda: calls.append(1)
+        mover.start_move((32.0, 0.0), duration=1.0)
+
+        self.tweens.discard(mover)
+        self.tweens.update(2.0)
+
+        self.assertEqual(calls, [])
+        self.assertEqual(len(self.tweens), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()